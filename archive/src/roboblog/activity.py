@@ -0,0 +1,206 @@
+"""
+Activity Aggregates
+Summarizes a window of commits as compact tables for the blog post prompt.
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Iterable, List
+
+from roboblog.commit_table import MISSING_DATE, CommitTable
+
+# How much each conventional-commit type says about a commit's significance
+COMMIT_TYPE_WEIGHTS = {
+    "feat": 1.0,
+    "perf": 0.8,
+    "fix": 0.7,
+    "refactor": 0.5,
+    "test": 0.2,
+    "docs": 0.2,
+    "build": 0.2,
+    "ci": 0.1,
+    "chore": 0.1,
+    "style": 0.1,
+}
+
+# Weight of messages that do not follow conventional commits
+DEFAULT_TYPE_WEIGHT = 0.5
+
+# Width of the daily activity histogram bars
+HISTOGRAM_WIDTH = 20
+
+
+def message_significance(message: str, merge: bool = False) -> float:
+    """Score a commit message by its conventional-commit type and body.
+
+    Merges (by parent count or a "Merge ..." subject) are penalized, since
+    the commits they bring in are scored on their own.
+    """
+    subject, _, body = message.partition("\n")
+    commit_type = (
+        subject.split(":", 1)[0].split("(", 1)[0].strip().lower() if ":" in subject else ""
+    )
+
+    score = 2 * COMMIT_TYPE_WEIGHTS.get(commit_type, DEFAULT_TYPE_WEIGHT)
+    if body.strip():
+        score += 0.5
+    if merge or subject.lower().startswith("merge "):
+        score -= 2
+    return score
+
+
+def change_significance(churn: int, files: int, message: str) -> float:
+    """Score how much a commit is worth describing in a post.
+
+    Line churn counts with diminishing returns, so one vendored or generated
+    change cannot outrank everything else; the number of files touched, the
+    conventional-commit type and an explanatory message body add to it.
+    """
+    score = math.log1p(churn)
+    score += 0.5 * math.log1p(files)
+    score += message_significance(message)
+    return score
+
+
+def commit_significance(record: Dict[str, Any]) -> float:
+    """Score a commit record, see change_significance()."""
+    stats = record.get("stats") or {}
+    return change_significance(
+        stats.get("additions", 0) + stats.get("deletions", 0),
+        len(record.get("files") or []),
+        record.get("message", ""),
+    )
+
+
+def row_significance(table: CommitTable, row: int) -> float:
+    """Score a commit table row from its columns, see change_significance()."""
+    return change_significance(
+        table.additions[row] + table.deletions[row],
+        table.file_offsets[row + 1] - table.file_offsets[row],
+        table.messages[row],
+    )
+
+
+def listing_significance(commit: Dict[str, Any]) -> float:
+    """Score a commit from list-level data, before its details are fetched.
+
+    Accepts a commits API or search listing entry, a push event commit or a
+    commit record. Without stats, message length stands in for the size of
+    the change, again with diminishing returns.
+    """
+    message = commit.get("commit", {}).get("message") or commit.get("message", "")
+    merge = len(commit.get("parents") or []) > 1
+
+    return 0.5 * math.log1p(len(message)) + message_significance(message, merge=merge)
+
+
+class ActivityAggregator:
+    """Computes activity aggregates of a window once and renders them.
+
+    Aggregates cover churn per repository, directory and file extension, the
+    most touched files, a daily histogram and added/deleted ratios. Raw detail
+    is kept only for the `top_commits` most significant commits, so the
+    rendered summary grows with the number of repositories and days rather
+    than with the number of commits.
+    """
+
+    def __init__(self, top_commits: int = 20, top_groups: int = 10):
+        self.top_commits = max(0, top_commits)
+        self.top_groups = max(1, top_groups)
+
+    def aggregate(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compute the aggregates of a set of commit records."""
+        table = CommitTable.from_records(records)
+
+        # Scored from the columns; only the kept commits become records
+        ranked = heapq.nlargest(
+            self.top_commits, range(len(table)), key=lambda row: row_significance(table, row)
+        )
+        significant = sorted(ranked, key=lambda row: table.timestamps[row], reverse=True)
+
+        return {
+            "total_commits": len(table),
+            "additions": sum(table.additions),
+            "deletions": sum(table.deletions),
+            "repositories": table.churn_by_repo(),
+            "directories": table.churn_by_directory(),
+            "extensions": table.churn_by_extension(),
+            "top_files": table.top_files(limit=self.top_groups),
+            "daily": table.churn_by_day(),
+            "undated_commits": table.timestamps.count(MISSING_DATE),
+            "significant_commits": [table.record(row) for row in significant],
+        }
+
+    @staticmethod
+    def _ratio(additions: int, deletions: int) -> str:
+        """Format an added/deleted ratio."""
+        if not deletions:
+            return "n/a" if not additions else "all added"
+        return f"{additions / deletions:.1f}"
+
+    def _top(self, groups: Dict[str, Dict[str, int]], key: str) -> List[tuple]:
+        return sorted(groups.items(), key=lambda item: -item[1][key])[: self.top_groups]
+
+    def render(self, aggregates: Dict[str, Any]) -> List[str]:
+        """Render aggregates as markdown tables, without the commit details."""
+        lines = []
+        lines.append(
+            f"Lines: +{aggregates['additions']} -{aggregates['deletions']} "
+            f"(added/deleted ratio {self._ratio(aggregates['additions'], aggregates['deletions'])})"
+        )
+        lines.append("")
+
+        lines.append("## Activity by repository")
+        lines.append("| Repository | Commits | Added | Deleted | Ratio |")
+        lines.append("|---|---|---|---|---|")
+        repositories = aggregates["repositories"]
+        for name, totals in self._top(repositories, "commits"):
+            lines.append(
+                f"| {name} | {totals['commits']} | +{totals['additions']} "
+                f"| -{totals['deletions']} | {self._ratio(totals['additions'], totals['deletions'])} |"
+            )
+        if len(repositories) > self.top_groups:
+            lines.append(f"| ... {len(repositories) - self.top_groups} more repositories | | | | |")
+        lines.append("")
+
+        for title, key in (
+            ("Churn by directory", "directories"),
+            ("Churn by file type", "extensions"),
+        ):
+            lines.append(f"## {title}")
+            lines.append("| Path | Files changed | Added | Deleted |")
+            lines.append("|---|---|---|---|")
+            for name, totals in self._top(aggregates[key], "files"):
+                lines.append(
+                    f"| {name} | {totals['files']} | +{totals['additions']} | -{totals['deletions']} |"
+                )
+            lines.append("")
+
+        lines.append("## Most touched files")
+        lines.append("| File | Commits | Added | Deleted |")
+        lines.append("|---|---|---|---|")
+        for file_info in aggregates["top_files"]:
+            lines.append(
+                f"| {file_info['filename']} | {file_info['commits']} "
+                f"| +{file_info['additions']} | -{file_info['deletions']} |"
+            )
+        lines.append("")
+
+        daily = aggregates["daily"]
+        busiest = max((totals["commits"] for totals in daily.values()), default=0)
+        lines.append("## Daily activity")
+        lines.append("| Day | Commits | Added | Deleted | |")
+        lines.append("|---|---|---|---|---|")
+        for day, totals in daily.items():
+            bar = "#" * max(1, round(totals["commits"] / busiest * HISTOGRAM_WIDTH))
+            lines.append(
+                f"| {day} | {totals['commits']} | +{totals['additions']} "
+                f"| -{totals['deletions']} | {bar} |"
+            )
+        if aggregates.get("undated_commits"):
+            lines.append(
+                f"({aggregates['undated_commits']} commits without a valid date not shown)"
+            )
+        lines.append("")
+
+        return lines
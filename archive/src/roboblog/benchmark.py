@@ -0,0 +1,194 @@
+"""
+Fetch Benchmark
+Runs each fetch strategy against the local mock GitHub API and reports its cost.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from roboblog.fetch_commits import (
+    CommitProcessor,
+    GitHubAPIClient,
+    RateLimitScheduler,
+    RetryPolicy,
+)
+from roboblog.mock_github import MockDataset, MockGitHubServer
+
+# Strategies that only need the GitHub API (git mirrors need real clones)
+STRATEGIES = ["commits", "search", "events"]
+
+
+class FetchBenchmark:
+    """Times fetch strategies end to end against one mock server.
+
+    Every strategy gets a fresh client and processor, so nothing is shared
+    through connection pools, caches or rate-limit state, and the server's
+    counters are reset between runs.
+    """
+
+    def __init__(self, server: MockGitHubServer, lookback_days: int = 30, concurrency: int = 5):
+        self.server = server
+        self.lookback_days = lookback_days
+        self.concurrency = concurrency
+
+    def _client(self) -> GitHubAPIClient:
+        """Build a client pointed at the mock server."""
+        return GitHubAPIClient(
+            # Any token: the mock accepts it and it enables the 5000/h budget
+            token="mock-token",
+            pool_size=self.concurrency,
+            scheduler=RateLimitScheduler(reserve=0),
+            # Injected errors should cost retries, not wall-clock seconds
+            retry_policy=RetryPolicy(backoff_base=0.05, backoff_max=0.5),
+            base_url=self.server.url,
+        )
+
+    def run(self, strategy: str, verbose: bool = False) -> Dict[str, Any]:
+        """Run one strategy and measure it.
+
+        Returns:
+            Wall time, commit and request counts, and requests per second
+        """
+        owner = self.server.dataset.owner if self.server.dataset else "mock-user"
+        since = datetime.now(timezone.utc) - timedelta(days=self.lookback_days)
+        client = self._client()
+        processor = CommitProcessor(
+            since=since, repo_filters=[], exclude_repos=[], concurrency=self.concurrency
+        )
+        self.server.reset_counters()
+
+        # The fetcher reports progress on stdout; keep the report readable
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with output:
+            if strategy == "events":
+                commits = processor.extract_commits(client.get_user_events(owner), client)
+            elif strategy == "search":
+                commits = processor.fetch_commits_search(client, owner)
+            elif strategy == "commits":
+                commits = processor.fetch_commits_direct(client, owner)
+            else:
+                raise ValueError(f"Unsupported strategy: {strategy}")
+            commit_count = sum(1 for _ in commits)
+        elapsed = time.perf_counter() - start
+
+        return {
+            "strategy": strategy,
+            "wall_seconds": round(elapsed, 3),
+            "commits": commit_count,
+            "requests": self.server.request_count,
+            "not_modified": self.server.not_modified_count,
+            "injected_errors": self.server.error_count,
+            "requests_per_second": round(self.server.request_count / elapsed, 1)
+            if elapsed
+            else 0.0,
+        }
+
+    def run_all(
+        self, strategies: List[str], repeat: int = 1, verbose: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Run every strategy `repeat` times, keeping each strategy's fastest run."""
+        results = []
+        for strategy in strategies:
+            runs = [self.run(strategy, verbose=verbose) for _ in range(max(1, repeat))]
+            results.append(min(runs, key=lambda result: result["wall_seconds"]))
+        return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print benchmark results as a table."""
+    print(
+        f"  {'Strategy':<10} {'Wall (s)':>9} {'Commits':>8} {'Requests':>9} {'Errors':>7} {'Req/s':>8}"
+    )
+    for result in results:
+        print(
+            f"  {result['strategy']:<10} {result['wall_seconds']:>9.3f} {result['commits']:>8} "
+            f"{result['requests']:>9} {result['injected_errors']:>7} "
+            f"{result['requests_per_second']:>8.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark fetch strategies against a local mock GitHub API",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--strategies",
+        default=",".join(STRATEGIES),
+        help=f"Comma-separated strategies to run (default: {','.join(STRATEGIES)})",
+    )
+    parser.add_argument("--fixtures", help="Replay recorded responses from this directory")
+    parser.add_argument("--owner", default="mock-user", help="Dataset user (default: mock-user)")
+    parser.add_argument("--repos", type=int, default=10, help="Dataset repositories (default: 10)")
+    parser.add_argument(
+        "--commits-per-repo",
+        type=int,
+        default=20,
+        help="Dataset commits per repository (default: 20)",
+    )
+    parser.add_argument(
+        "--files-per-commit", type=int, default=3, help="Dataset files per commit (default: 3)"
+    )
+    parser.add_argument(
+        "--days", type=int, default=30, help="Lookback window in days (default: 30)"
+    )
+    parser.add_argument("--concurrency", type=int, default=5, help="Parallel requests (default: 5)")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Mean added latency per request"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Runs per strategy; the fastest is kept"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the fetcher's own output")
+
+    args = parser.parse_args(argv)
+
+    strategies = [name.strip() for name in args.strategies.split(",") if name.strip()]
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        print(f"✗ Unknown strategies: {', '.join(unknown)} (choose from {', '.join(STRATEGIES)})")
+        sys.exit(1)
+
+    server = MockGitHubServer(
+        dataset=MockDataset(
+            owner=args.owner,
+            repos=args.repos,
+            commits_per_repo=args.commits_per_repo,
+            files_per_commit=args.files_per_commit,
+            days=args.days,
+        ),
+        fixtures_dir=args.fixtures,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+    ).start()
+
+    try:
+        benchmark = FetchBenchmark(server, lookback_days=args.days, concurrency=args.concurrency)
+        results = benchmark.run_all(strategies, repeat=args.repeat, verbose=args.verbose)
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"Mock dataset: {args.repos} repos × {args.commits_per_repo} commits, "
+            f"latency {args.latency_ms:g} ms, error rate {args.error_rate:g}"
+        )
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
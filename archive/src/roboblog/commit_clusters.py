@@ -0,0 +1,114 @@
+"""
+Commit Clusters
+Groups near-duplicate commits ("fix typo", "wip", "update deps") so a prompt lists each run once.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+# Words of a subject line; numbers, versions and hashes are left out so
+# "bump foo from 1.2 to 1.3" and "bump foo from 1.3 to 1.4" look alike
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# How much message and file-set similarity count towards the combined score
+MESSAGE_WEIGHT = 0.7
+FILES_WEIGHT = 0.3
+
+
+class CommitClusterer:
+    """Finds runs of consecutive near-duplicate commits.
+
+    A commit's subject line becomes a set of words and word pairs and its
+    changed paths a second set. Each commit is compared with the first commit
+    of the current run: Jaccard of the subject features weighted with Jaccard
+    of the paths. Only neighbours are grouped, so "wip" commits on either side
+    of a real change stay apart and the prompt keeps the order of the work.
+
+    The leader comparison replaces a vectorized (TF-IDF or MinHash/LSH)
+    similarity search: with one comparison per commit clustering is already
+    linear, so there are no all-pairs comparisons left to vectorize.
+    """
+
+    def __init__(self, threshold: float = 0.6):
+        self.threshold = threshold
+
+    @staticmethod
+    def message_features(message: str) -> Set[str]:
+        """Get the words and word pairs of a commit's subject line."""
+        words = WORD_PATTERN.findall(message.partition("\n")[0].lower())
+        return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+    @staticmethod
+    def file_features(record: Dict[str, Any]) -> Set[str]:
+        """Get the paths a commit changed."""
+        return {file_info.get("filename", "") for file_info in record.get("files") or []}
+
+    @staticmethod
+    def _jaccard(first: Set[str], second: Set[str]) -> float:
+        if not first and not second:
+            return 1.0
+        return len(first & second) / len(first | second)
+
+    def similarity(
+        self,
+        first: Tuple[Set[str], Set[str]],
+        second: Tuple[Set[str], Set[str]],
+    ) -> float:
+        """Combined similarity of two (message features, file features) pairs."""
+        message = self._jaccard(first[0], second[0])
+        if not first[1] and not second[1]:
+            return message
+        return MESSAGE_WEIGHT * message + FILES_WEIGHT * self._jaccard(first[1], second[1])
+
+    def cluster(self, records: Iterable[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group consecutive near-duplicate records into runs.
+
+        Returns:
+            Runs in record order; unique records are runs of one
+        """
+        clusters: List[List[Dict[str, Any]]] = []
+        leader: Tuple[Set[str], Set[str]] = (set(), set())
+
+        for record in records:
+            features = (
+                self.message_features(record.get("message", "")),
+                self.file_features(record),
+            )
+            # Nothing to compare a subject without words by
+            if (
+                clusters
+                and features[0]
+                and leader[0]
+                and self.similarity(features, leader) >= self.threshold
+            ):
+                clusters[-1].append(record)
+                continue
+
+            clusters.append([record])
+            leader = features
+
+        return clusters
+
+    @staticmethod
+    def summarize(cluster: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine a cluster's records into one summary entry."""
+        subjects = Counter(record.get("message", "").partition("\n")[0] for record in cluster)
+        dates = sorted(record.get("date", "") for record in cluster if record.get("date"))
+        files: Dict[str, int] = {}
+        for record in cluster:
+            for filename in CommitClusterer.file_features(record):
+                files[filename] = files.get(filename, 0) + 1
+
+        return {
+            "count": len(cluster),
+            "subject": subjects.most_common(1)[0][0],
+            "subjects": [subject for subject, _ in subjects.most_common()],
+            "distinct_subjects": len(subjects),
+            "first_date": dates[0] if dates else "",
+            "last_date": dates[-1] if dates else "",
+            "shas": [record.get("sha", "") for record in cluster],
+            "additions": sum(record.get("stats", {}).get("additions", 0) for record in cluster),
+            "deletions": sum(record.get("stats", {}).get("deletions", 0) for record in cluster),
+            "files": sorted(files, key=lambda name: -files[name]),
+        }
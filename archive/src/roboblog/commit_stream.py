@@ -0,0 +1,567 @@
+"""
+Commit Stream
+Streams fetched commits to NDJSON (optionally gzipped) with a leading manifest.
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import os
+import re
+import shutil
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Marks the first line of the streaming format
+MANIFEST_TYPE = "manifest"
+STREAM_FORMAT = "roboblog-commits-ndjson"
+STREAM_VERSION = 1
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Output formats written by CommitStreamWriter
+OUTPUT_FORMATS = ["ndjson", "json"]
+
+# Directory the fetcher writes its output to by default
+DATA_DIR = "data"
+
+# The repository of a compact NDJSON record, found without parsing the line;
+# quotes inside string values are always escaped, so only a key can match
+REPOSITORY_FIELD = re.compile(r'"repository":"((?:[^"\\]|\\.)*)"')
+
+
+def default_output_path(
+    output_format: str = "ndjson", compress: bool = False, data_dir: str = DATA_DIR
+) -> str:
+    """Get the default fetch output path, named after its format."""
+    if output_format == "json":
+        return str(Path(data_dir) / "commits.json")
+    return str(Path(data_dir) / ("commits.ndjson.gz" if compress else "commits.ndjson"))
+
+
+def find_commits_file(data_dir: str = DATA_DIR) -> str:
+    """Get the newest fetch output among the default paths of every format.
+
+    Falls back to the NDJSON default when none exists yet.
+    """
+    candidates = [
+        Path(default_output_path(output_format, compress, data_dir))
+        for output_format, compress in (("ndjson", False), ("ndjson", True), ("json", False))
+    ]
+    existing = [path for path in candidates if path.exists()]
+    if not existing:
+        return str(candidates[0])
+    return str(max(existing, key=lambda path: path.stat().st_mtime))
+
+
+class CommitStreamWriter:
+    """Writes commit records one by one and finalizes the output atomically.
+
+    Records are appended to a `.part` file as they arrive, so memory stays flat
+    however many commits are fetched. Closing the writer prepends a manifest
+    line (total_commits, since, per-repository counts) and moves the result
+    into place with os.replace. With gzip enabled the manifest and the records
+    are separate gzip members; concatenated members form one valid gzip stream.
+    The legacy indented JSON document can still be written with format "json".
+    """
+
+    def __init__(
+        self,
+        path: str,
+        since: datetime,
+        output_format: str = "ndjson",
+        compress: bool = False,
+    ):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self.path = Path(path)
+        self.since = since
+        self.output_format = output_format
+        # The legacy document is plain JSON; only the stream is compressed
+        self.compress = compress and output_format == "ndjson"
+        self.total_commits = 0
+        self.repo_counts: Dict[str, int] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.part_path = self.path.with_name(self.path.name + ".part")
+        if self.compress:
+            self._part = gzip.open(self.part_path, "wt", encoding="utf-8")
+        else:
+            self._part = open(self.part_path, "w", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one commit record."""
+        self._part.write(json.dumps(record, separators=(",", ":")) + "\n")
+        repo_name = record.get("repository", "")
+        self.repo_counts[repo_name] = self.repo_counts.get(repo_name, 0) + 1
+        self.total_commits += 1
+
+    def manifest(self, fetched_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Build the manifest of the records written so far."""
+        if fetched_at is None:
+            fetched_at = datetime.now(timezone.utc)
+
+        return {
+            "type": MANIFEST_TYPE,
+            "format": STREAM_FORMAT,
+            "version": STREAM_VERSION,
+            "fetched_at": fetched_at.isoformat(),
+            "since": self.since.isoformat(),
+            "total_commits": self.total_commits,
+            "repositories": self.repo_counts,
+        }
+
+    def close(self, fetched_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Finalize the output file.
+
+        Returns:
+            The manifest written with (or derived from) the records
+        """
+        self._part.close()
+        manifest = self.manifest(fetched_at)
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        if self.output_format == "json":
+            self._write_legacy(tmp_path, manifest)
+        else:
+            header = (json.dumps(manifest, separators=(",", ":")) + "\n").encode("utf-8")
+            with open(tmp_path, "wb") as out, open(self.part_path, "rb") as part:
+                out.write(gzip.compress(header) if self.compress else header)
+                shutil.copyfileobj(part, out)
+
+        os.replace(tmp_path, self.path)
+        self.part_path.unlink(missing_ok=True)
+        return manifest
+
+    def abort(self) -> None:
+        """Discard the records written so far."""
+        self._part.close()
+        self.part_path.unlink(missing_ok=True)
+
+    def _write_legacy(self, tmp_path: Path, manifest: Dict[str, Any]) -> None:
+        """Write the legacy document, grouping the streamed records by repository."""
+        repositories: Dict[str, list] = {name: [] for name in self.repo_counts}
+        with open(self.part_path, "r", encoding="utf-8") as part:
+            for line in part:
+                record = json.loads(line)
+                repositories[record.get("repository", "")].append(record)
+
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "fetched_at": manifest["fetched_at"],
+                    "since": manifest["since"],
+                    "total_commits": manifest["total_commits"],
+                    "repositories": repositories,
+                },
+                f,
+                indent=2,
+            )
+
+
+class CommitCollector:
+    """Collects commit records in memory, grouped by repository.
+
+    Shares CommitStreamWriter's interface so previews (dry runs) can take the
+    writer's place at the end of the pipeline.
+    """
+
+    def __init__(self, since: datetime):
+        self.since = since
+        self.total_commits = 0
+        self.repositories: Dict[str, list] = {}
+
+    @property
+    def repo_counts(self) -> Dict[str, int]:
+        """Get the number of records per repository."""
+        return {name: len(commits) for name, commits in self.repositories.items()}
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Add one commit record."""
+        self.repositories.setdefault(record.get("repository", ""), []).append(record)
+        self.total_commits += 1
+
+    def close(self, fetched_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Get the collected records as a legacy output document."""
+        if fetched_at is None:
+            fetched_at = datetime.now(timezone.utc)
+
+        return {
+            "fetched_at": fetched_at.isoformat(),
+            "since": self.since.isoformat(),
+            "total_commits": self.total_commits,
+            "repositories": self.repositories,
+        }
+
+
+class JSONDocumentScanner:
+    """Incremental reader of one JSON document, a value at a time.
+
+    The file is read in chunks and only the value under the cursor is ever
+    decoded, so a legacy commits document can be walked repository by
+    repository, commit by commit, without holding its text or its commit
+    lists in memory. Values the caller does not need are skipped by scanning
+    for their closing bracket instead of decoding them.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    STRUCTURAL = re.compile(r'["\[\]{}]')
+    STRING_END = re.compile(r'["\\]')
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text; False at end of file."""
+        if self.eof:
+            return False
+
+        chunk = self.f.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+
+        if self.pos > len(self.buffer) // 2:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and get the next character, or "" at end of file."""
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        """Consume one structural character."""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r} in JSON document")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode the value under the cursor."""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """Move past the value under the cursor without decoding it."""
+        if self._peek() not in ('"', "[", "{"):
+            self.decode()
+            return
+
+        depth = 0
+        while True:
+            match = self.STRUCTURAL.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON document")
+                continue
+
+            self.pos = match.end()
+            token = match.group()
+            if token == '"':
+                self._skip_string()
+            elif token in "[{":
+                depth += 1
+            else:
+                depth -= 1
+            if depth == 0:
+                return
+
+    def _skip_string(self) -> None:
+        """Move past the rest of a string whose opening quote was consumed."""
+        while True:
+            match = self.STRING_END.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+            else:
+                self.pos = match.start()
+                if match.group() == '"':
+                    self.pos += 1
+                    return
+                # Backslash: skip it together with the escaped character
+                if self.pos + 1 < len(self.buffer):
+                    self.pos += 2
+                    continue
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def iter_members(self) -> Iterator[str]:
+        """Yield the keys of the object under the cursor.
+
+        The caller must consume each key's value (decode, skip or iter_items)
+        before asking for the next key.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.decode()
+            self._expect(":")
+            yield key
+            char = self._peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or '}}' but found {char!r} in JSON document")
+
+    def iter_items(self) -> Iterator[Any]:
+        """Yield the decoded items of the array under the cursor, one at a time."""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield self.decode()
+            char = self._peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' but found {char!r} in JSON document")
+
+
+class CommitStreamReader:
+    """Reads commit output in either the streaming or the legacy JSON format.
+
+    The format is sniffed from the file itself (gzip magic, then a leading
+    manifest line), so readers work whatever the fetcher was configured with.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _open(self):
+        """Open the file as text, decompressing gzip transparently."""
+        with open(self.path, "rb") as f:
+            magic = f.read(2)
+
+        if magic == GZIP_MAGIC:
+            return gzip.open(self.path, "rt", encoding="utf-8")
+        return open(self.path, "r", encoding="utf-8")
+
+    def _read_header(self, f) -> Optional[Dict[str, Any]]:
+        """Read the manifest line, or None if the file is legacy JSON."""
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            return None
+
+        if isinstance(header, dict) and header.get("type") == MANIFEST_TYPE:
+            return header
+        return None
+
+    def read_manifest(self) -> Dict[str, Any]:
+        """Get total_commits, since and per-repository counts.
+
+        Only the first line is parsed for the streaming format; legacy files
+        have no manifest and are scanned commit by commit to count them.
+        """
+        with self._open() as f:
+            manifest = self._read_header(f)
+            if manifest is not None:
+                return manifest
+
+            f.seek(0)
+            header: Dict[str, Any] = {}
+            counts = {
+                repo_name: sum(1 for _ in commits)
+                for repo_name, commits in self._scan_legacy(f, None, header)
+            }
+
+        return {
+            "type": MANIFEST_TYPE,
+            "fetched_at": header.get("fetched_at"),
+            "since": header.get("since"),
+            "total_commits": header.get("total_commits", 0),
+            "repositories": counts,
+        }
+
+    def _scan_legacy(
+        self,
+        f,
+        exclude: Optional[Callable[[str], bool]],
+        header: Dict[str, Any],
+    ) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+        """Walk a legacy document, filling `header` with its top-level fields."""
+        scanner = JSONDocumentScanner(f)
+        for key in scanner.iter_members():
+            if key != "repositories":
+                header[key] = scanner.decode()
+                continue
+
+            for repo_name in scanner.iter_members():
+                if exclude is not None and exclude(repo_name):
+                    scanner.skip()
+                    continue
+
+                commits = scanner.iter_items()
+                yield repo_name, commits
+                # Move past whatever the caller left unread
+                for _ in commits:
+                    pass
+
+    def _scan_stream(
+        self, f, exclude: Optional[Callable[[str], bool]]
+    ) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+        """Walk NDJSON records after the manifest, grouping consecutive runs."""
+
+        def records() -> Iterator[Dict[str, Any]]:
+            for line in f:
+                if not line.strip():
+                    continue
+                if exclude is not None:
+                    match = REPOSITORY_FIELD.search(line)
+                    if match and exclude(json.loads(f'"{match.group(1)}"')):
+                        continue
+                record = json.loads(line)
+                if exclude is not None and not match and exclude(record.get("repository", "")):
+                    continue
+                yield record
+
+        for repo_name, commits in itertools.groupby(
+            records(), key=lambda record: record.get("repository", "")
+        ):
+            yield repo_name, commits
+
+    def iter_repositories(
+        self, exclude: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+        """Yield (repository, commits) pairs lazily, in file order.
+
+        Each commits iterator must be consumed before the next pair is
+        requested. Repositories for which `exclude` returns True are skipped
+        before any of their commits are decoded. NDJSON output is grouped by
+        consecutive runs, so a repository whose commits were interleaved with
+        another's during the fetch can appear more than once.
+        """
+        with self._open() as f:
+            if self._read_header(f) is not None:
+                yield from self._scan_stream(f, exclude)
+                return
+
+            f.seek(0)
+            yield from self._scan_legacy(f, exclude, {})
+
+    def iter_records(
+        self, exclude: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield commit records one at a time, in output order."""
+        for _, commits in self.iter_repositories(exclude):
+            yield from commits
+
+    def load(self, exclude: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """Load the output in the legacy document shape.
+
+        Repositories for which `exclude` returns True are left out, and
+        total_commits then counts only the commits kept.
+        """
+        with self._open() as f:
+            header = self._read_header(f)
+            repositories: Dict[str, list] = {}
+            if header is None:
+                f.seek(0)
+                header = {}
+                groups = self._scan_legacy(f, exclude, header)
+            else:
+                repositories = {
+                    name: []
+                    for name in header.get("repositories", {})
+                    if exclude is None or not exclude(name)
+                }
+                groups = self._scan_stream(f, exclude)
+
+            for repo_name, commits in groups:
+                repositories.setdefault(repo_name, []).extend(commits)
+
+        total_commits = header.get("total_commits", 0)
+        if exclude is not None:
+            total_commits = sum(len(commits) for commits in repositories.values())
+
+        return {
+            "fetched_at": header.get("fetched_at"),
+            "since": header.get("since"),
+            "total_commits": total_commits,
+            "repositories": repositories,
+        }
+
+
+def export_json(input_path: str, output_path: str) -> int:
+    """Export commit output to the legacy indented JSON document.
+
+    Returns:
+        Number of commits exported
+    """
+    data = CommitStreamReader(input_path).load()
+
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, output)
+
+    return data.get("total_commits", 0)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Export fetched commits to the legacy JSON format",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--input",
+        help="Commit output to read, NDJSON/gzip or JSON (default: newest in data/)",
+    )
+    parser.add_argument(
+        "--output",
+        default="data/commits.export.json",
+        help="Legacy JSON file to write (default: data/commits.export.json)",
+    )
+
+    args = parser.parse_args()
+    input_path = args.input or find_commits_file()
+
+    try:
+        total = export_json(input_path, args.output)
+        print(f"✓ Exported {total} commits to {args.output}")
+    except (OSError, ValueError) as e:
+        print(f"✗ Export failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,503 @@
+"""
+Commit Table
+Compact columnar representation of commit records for filtering and aggregation.
+"""
+
+import argparse
+import re
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from roboblog.commit_stream import CommitStreamReader, find_commits_file
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Width of a binary commit SHA
+SHA_BYTES = 20
+
+FULL_SHA = re.compile(r"[0-9a-f]{40}")
+
+# Timestamp of rows whose date is missing or malformed; sorts before any date
+MISSING_DATE = -(2**63)
+
+
+class StringPool:
+    """Interns strings as small integer ids."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        """Get the id of a string, adding it on first use."""
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.values)
+            self.ids[value] = string_id
+            self.values.append(value)
+        return string_id
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.values[string_id]
+
+
+class CommitTable:
+    """Commits and their files stored column by column in typed arrays.
+
+    Each commit is a row: binary SHA, epoch timestamp, interned repository,
+    author and email ids, and addition/deletion totals. Files live in their
+    own columns (interned path and status, line counts), with each commit's
+    files found through an offsets column. Rows are grouped by repository,
+    so a repository's commits are one contiguous range and view() can hand
+    out zero-copy memoryview slices of every column.
+
+    Filters return arrays of row indices and aggregations walk only the
+    columns they need, instead of re-walking nested dicts. Records convert
+    back to the fetcher's JSON schema; per-file fields beyond filename,
+    status and line counts (such as patch text) are not kept, and dates are
+    normalized to UTC. Missing or malformed dates are kept as given and left
+    out of the per-day aggregates.
+    """
+
+    def __init__(self):
+        self.repos = StringPool()
+        self.authors = StringPool()
+        self.emails = StringPool()
+        self.paths = StringPool()
+        self.statuses = StringPool()
+
+        self.shas = bytearray()
+        self.timestamps = array("q")
+        self.repo_ids = array("I")
+        self.author_ids = array("I")
+        self.email_ids = array("I")
+        self.additions = array("I")
+        self.deletions = array("I")
+        self.messages: List[str] = []
+        # Row -> URL, only where it differs from the one derived from repo and SHA
+        self.urls: Dict[int, str] = {}
+        # Row -> SHA, for SHAs that are not 40 hex digits (e.g. hand-written data)
+        self.raw_shas: Dict[int, str] = {}
+        # Row -> date as given, for rows stored with MISSING_DATE
+        self.raw_dates: Dict[int, str] = {}
+
+        # Files of row i are file_offsets[i]:file_offsets[i + 1]
+        self.file_offsets = array("Q", [0])
+        self.file_path_ids = array("I")
+        self.file_status_ids = array("B")
+        self.file_additions = array("I")
+        self.file_deletions = array("I")
+
+        # Repository id -> (first row, end row)
+        self.repo_ranges: Dict[int, range] = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "CommitTable":
+        """Build a table from commit records, grouping rows by repository."""
+        by_repo: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_repo.setdefault(record.get("repository", ""), []).append(record)
+
+        table = cls()
+        for repo_name, repo_records in by_repo.items():
+            start = len(table)
+            for record in repo_records:
+                table._append(record)
+            table.repo_ranges[table.repos.intern(repo_name)] = range(start, len(table))
+        return table
+
+    @classmethod
+    def from_file(cls, path: str, exclude: Optional[Callable[[str], bool]] = None) -> "CommitTable":
+        """Build a table from fetch output or example data, in any format."""
+        reader = CommitStreamReader(path)
+        table = cls()
+        for repo_name, commits in reader.iter_repositories(exclude=exclude):
+            start = len(table)
+            for record in commits:
+                table._append(record)
+            repo_id = table.repos.intern(repo_name)
+            previous = table.repo_ranges.get(repo_id)
+            if previous is not None and previous.stop != start:
+                # An NDJSON repository split across runs; regroup everything
+                return cls.from_records(reader.iter_records(exclude=exclude))
+            table.repo_ranges[repo_id] = range(
+                previous.start if previous is not None else start, len(table)
+            )
+        return table
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one record as a row."""
+        row = len(self)
+        sha = record.get("sha", "")
+        repo_name = record.get("repository", "")
+        if FULL_SHA.fullmatch(sha):
+            self.shas += bytes.fromhex(sha)
+        else:
+            self.shas += bytes(SHA_BYTES)
+            self.raw_shas[row] = sha
+        date = record.get("date", "")
+        timestamp = self._parse_date(date)
+        if timestamp == MISSING_DATE:
+            self.raw_dates[row] = date
+        self.timestamps.append(timestamp)
+        self.repo_ids.append(self.repos.intern(repo_name))
+        self.author_ids.append(self.authors.intern(record.get("author") or ""))
+        self.email_ids.append(self.emails.intern(record.get("author_email") or ""))
+        stats = record.get("stats") or {}
+        self.additions.append(stats.get("additions", 0))
+        self.deletions.append(stats.get("deletions", 0))
+        self.messages.append(record.get("message", ""))
+
+        url = record.get("url", "")
+        if url != self._derived_url(repo_name, sha):
+            self.urls[row] = url
+
+        for file_info in record.get("files") or []:
+            self.file_path_ids.append(self.paths.intern(file_info.get("filename", "")))
+            self.file_status_ids.append(self.statuses.intern(file_info.get("status", "modified")))
+            self.file_additions.append(file_info.get("additions", 0))
+            self.file_deletions.append(file_info.get("deletions", 0))
+        self.file_offsets.append(len(self.file_path_ids))
+
+    @staticmethod
+    def _epoch(value: datetime) -> int:
+        """Convert a datetime to epoch seconds, reading naive ones as UTC."""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+
+    @classmethod
+    def _parse_date(cls, date: str) -> int:
+        """Convert an ISO 8601 date to epoch seconds (MISSING_DATE if missing or malformed)."""
+        if not date:
+            return MISSING_DATE
+        try:
+            return cls._epoch(datetime.fromisoformat(date.replace("Z", "+00:00")))
+        except ValueError:
+            return MISSING_DATE
+
+    @staticmethod
+    def _derived_url(repo_name: str, sha: str) -> str:
+        return f"https://github.com/{repo_name}/commit/{sha}"
+
+    @property
+    def repositories(self) -> List[str]:
+        """Get the repository names, in row order."""
+        return [self.repos[repo_id] for repo_id in self.repo_ranges]
+
+    def rows_for(self, repo_name: str) -> range:
+        """Get the rows of one repository (empty if unknown)."""
+        repo_id = self.repos.ids.get(repo_name)
+        if repo_id is None:
+            return range(0)
+        return self.repo_ranges.get(repo_id, range(0))
+
+    def view(self, repo_name: str) -> Dict[str, memoryview]:
+        """Get zero-copy slices of the commit columns for one repository."""
+        rows = self.rows_for(repo_name)
+        start, stop = rows.start, rows.stop
+        return {
+            "shas": memoryview(self.shas)[start * SHA_BYTES : stop * SHA_BYTES],
+            "timestamps": memoryview(self.timestamps)[start:stop],
+            "author_ids": memoryview(self.author_ids)[start:stop],
+            "additions": memoryview(self.additions)[start:stop],
+            "deletions": memoryview(self.deletions)[start:stop],
+            "file_offsets": memoryview(self.file_offsets)[start : stop + 1],
+        }
+
+    def sha(self, row: int) -> str:
+        """Get the hex SHA of a row."""
+        if row in self.raw_shas:
+            return self.raw_shas[row]
+        return self.shas[row * SHA_BYTES : (row + 1) * SHA_BYTES].hex()
+
+    def select(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        repos: Optional[Sequence[str]] = None,
+        authors: Optional[Sequence[str]] = None,
+        rows: Optional[Iterable[int]] = None,
+    ) -> array:
+        """Get the rows matching every given filter.
+
+        Repository filters narrow the scan to those repositories' row ranges;
+        author filters match names or emails, case-insensitively.
+        """
+        if rows is None:
+            if repos is not None:
+                rows = [row for name in repos for row in self.rows_for(name)]
+            else:
+                rows = range(len(self))
+        elif repos is not None:
+            repo_ids = {self.repos.ids[name] for name in repos if name in self.repos.ids}
+            rows = [row for row in rows if self.repo_ids[row] in repo_ids]
+
+        if since is not None or until is not None:
+            # Rows without a valid date match no date range
+            low = self._epoch(since) if since is not None else MISSING_DATE + 1
+            high = self._epoch(until) if until is not None else 2**63 - 1
+            timestamps = self.timestamps
+            rows = [row for row in rows if low <= timestamps[row] < high]
+
+        if authors is not None:
+            wanted = {author.lower() for author in authors}
+            author_ids = {i for i, name in enumerate(self.authors.values) if name.lower() in wanted}
+            email_ids = {i for i, email in enumerate(self.emails.values) if email.lower() in wanted}
+            rows = [
+                row
+                for row in rows
+                if self.author_ids[row] in author_ids or self.email_ids[row] in email_ids
+            ]
+
+        return array("I", rows)
+
+    def _rows(self, rows: Optional[Iterable[int]]) -> Iterable[int]:
+        return range(len(self)) if rows is None else rows
+
+    def churn_by_repo(self, rows: Optional[Iterable[int]] = None) -> Dict[str, Dict[str, int]]:
+        """Sum commits, additions and deletions per repository."""
+        totals: Dict[int, List[int]] = {}
+        additions, deletions, repo_ids = self.additions, self.deletions, self.repo_ids
+        for row in self._rows(rows):
+            entry = totals.setdefault(repo_ids[row], [0, 0, 0])
+            entry[0] += 1
+            entry[1] += additions[row]
+            entry[2] += deletions[row]
+        return {
+            self.repos[repo_id]: {"commits": c, "additions": a, "deletions": d}
+            for repo_id, (c, a, d) in totals.items()
+        }
+
+    def churn_by_extension(self, rows: Optional[Iterable[int]] = None) -> Dict[str, Dict[str, int]]:
+        """Sum changed files, additions and deletions per file extension."""
+        return self._churn_by_path(self._extension, rows)
+
+    def churn_by_directory(
+        self, rows: Optional[Iterable[int]] = None, depth: int = 2
+    ) -> Dict[str, Dict[str, int]]:
+        """Sum changed files, additions and deletions per directory, `depth` levels deep."""
+        return self._churn_by_path(lambda path: self._directory(path, depth), rows)
+
+    def _churn_by_path(
+        self, key: Callable[[str], str], rows: Optional[Iterable[int]]
+    ) -> Dict[str, Dict[str, int]]:
+        """Sum file churn grouped by a key computed once per distinct path."""
+        key_of = [key(path) for path in self.paths.values]
+        totals: Dict[str, List[int]] = {}
+        offsets = self.file_offsets
+        for row in self._rows(rows):
+            for i in range(offsets[row], offsets[row + 1]):
+                entry = totals.setdefault(key_of[self.file_path_ids[i]], [0, 0, 0])
+                entry[0] += 1
+                entry[1] += self.file_additions[i]
+                entry[2] += self.file_deletions[i]
+        return {
+            group: {"files": f, "additions": a, "deletions": d}
+            for group, (f, a, d) in totals.items()
+        }
+
+    def top_files(
+        self, rows: Optional[Iterable[int]] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get the files touched by the most commits, then by the most churn."""
+        totals: Dict[int, List[int]] = {}
+        offsets = self.file_offsets
+        for row in self._rows(rows):
+            for i in range(offsets[row], offsets[row + 1]):
+                entry = totals.setdefault(self.file_path_ids[i], [0, 0, 0])
+                entry[0] += 1
+                entry[1] += self.file_additions[i]
+                entry[2] += self.file_deletions[i]
+        ranked = sorted(totals.items(), key=lambda item: (-item[1][0], -(item[1][1] + item[1][2])))
+        return [
+            {"filename": self.paths[path_id], "commits": c, "additions": a, "deletions": d}
+            for path_id, (c, a, d) in ranked[:limit]
+        ]
+
+    def churn_by_day(self, rows: Optional[Iterable[int]] = None) -> Dict[str, Dict[str, int]]:
+        """Sum commits, additions and deletions per UTC day, in date order.
+
+        Rows without a valid date belong to no day and are left out.
+        """
+        totals: Dict[int, List[int]] = {}
+        timestamps, additions, deletions = self.timestamps, self.additions, self.deletions
+        for row in self._rows(rows):
+            if timestamps[row] == MISSING_DATE:
+                continue
+            entry = totals.setdefault(timestamps[row] // 86400, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += additions[row]
+            entry[2] += deletions[row]
+        return {
+            datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y-%m-%d"): {
+                "commits": c,
+                "additions": a,
+                "deletions": d,
+            }
+            for day, (c, a, d) in sorted(totals.items())
+        }
+
+    @staticmethod
+    def _extension(path: str) -> str:
+        """Get a file's extension, or its name for extensionless files."""
+        name = path.rsplit("/", 1)[-1]
+        stem, dot, extension = name.rpartition(".")
+        return f".{extension.lower()}" if dot and stem else name
+
+    @staticmethod
+    def _directory(path: str, depth: int) -> str:
+        """Get the first `depth` directories of a path, or "/" for top-level files."""
+        parts = path.split("/")[:-1]
+        return "/".join(parts[:depth]) + "/" if parts else "/"
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Convert a row back to a commit record."""
+        repo_name = self.repos[self.repo_ids[row]]
+        sha = self.sha(row)
+        files = []
+        for i in range(self.file_offsets[row], self.file_offsets[row + 1]):
+            additions, deletions = self.file_additions[i], self.file_deletions[i]
+            files.append(
+                {
+                    "filename": self.paths[self.file_path_ids[i]],
+                    "status": self.statuses[self.file_status_ids[i]],
+                    "additions": additions,
+                    "deletions": deletions,
+                    "changes": additions + deletions,
+                }
+            )
+
+        additions, deletions = self.additions[row], self.deletions[row]
+        if row in self.raw_dates:
+            date = self.raw_dates[row]
+        else:
+            date = datetime.fromtimestamp(self.timestamps[row], tz=timezone.utc).strftime(
+                DATE_FORMAT
+            )
+        return {
+            "sha": sha,
+            "message": self.messages[row],
+            "date": date,
+            "author": self.authors[self.author_ids[row]],
+            "author_email": self.emails[self.email_ids[row]],
+            "repository": repo_name,
+            "url": self.urls.get(row, self._derived_url(repo_name, sha)),
+            "files": files,
+            "stats": {
+                "additions": additions,
+                "deletions": deletions,
+                "total": additions + deletions,
+            },
+        }
+
+    def iter_records(self, rows: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield rows as commit records."""
+        for row in self._rows(rows):
+            yield self.record(row)
+
+    def to_document(
+        self, since: str, fetched_at: str, rows: Optional[Iterable[int]] = None
+    ) -> Dict[str, Any]:
+        """Convert rows to the legacy output document."""
+        repositories: Dict[str, list] = {}
+        for record in self.iter_records(rows):
+            repositories.setdefault(record["repository"], []).append(record)
+        return {
+            "fetched_at": fetched_at,
+            "since": since,
+            "total_commits": sum(len(commits) for commits in repositories.values()),
+            "repositories": repositories,
+        }
+
+    def memory_bytes(self) -> int:
+        """Estimate the memory held by the columns and string pools."""
+        columns = [
+            self.timestamps,
+            self.repo_ids,
+            self.author_ids,
+            self.email_ids,
+            self.additions,
+            self.deletions,
+            self.file_offsets,
+            self.file_path_ids,
+            self.file_status_ids,
+            self.file_additions,
+            self.file_deletions,
+        ]
+        total = len(self.shas) + sum(column.itemsize * len(column) for column in columns)
+        pools = [self.repos, self.authors, self.emails, self.paths, self.statuses]
+        total += sum(sys.getsizeof(value) for pool in pools for value in pool.values)
+        total += sum(sys.getsizeof(message) for message in self.messages)
+        return total
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Summarize fetched commits by repository, file extension and day",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--input",
+        help="Commit output to read, NDJSON/gzip or JSON (default: newest in data/)",
+    )
+    parser.add_argument("--repo", action="append", help="Only this repository (repeatable)")
+    parser.add_argument(
+        "--author", action="append", help="Only this author name or email (repeatable)"
+    )
+
+    args = parser.parse_args()
+    input_path = args.input or find_commits_file()
+
+    try:
+        start = time.perf_counter()
+        table = CommitTable.from_file(input_path)
+        loaded = time.perf_counter() - start
+    except (OSError, ValueError) as e:
+        print(f"✗ Failed to load {input_path}: {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    rows = table.select(repos=args.repo, authors=args.author)
+    by_repo = table.churn_by_repo(rows)
+    by_extension = table.churn_by_extension(rows)
+    by_day = table.churn_by_day(rows)
+    aggregated = time.perf_counter() - start
+
+    print(
+        f"✓ Loaded {len(table)} commits in {loaded:.2f}s "
+        f"({table.memory_bytes() / 1024:.0f} KB as columns)"
+    )
+    print(f"  Selected {len(rows)} commits, aggregated in {aggregated * 1000:.1f} ms")
+
+    print("\n  By repository:")
+    for name, totals in sorted(by_repo.items(), key=lambda item: -item[1]["commits"]):
+        print(
+            f"    - {name}: {totals['commits']} commits, +{totals['additions']} -{totals['deletions']}"
+        )
+
+    print("\n  By file extension:")
+    for extension, totals in sorted(by_extension.items(), key=lambda item: -item[1]["files"])[:10]:
+        print(
+            f"    - {extension}: {totals['files']} files, +{totals['additions']} -{totals['deletions']}"
+        )
+
+    print("\n  By day:")
+    for day, totals in by_day.items():
+        print(
+            f"    - {day}: {totals['commits']} commits, +{totals['additions']} -{totals['deletions']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
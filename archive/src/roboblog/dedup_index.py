@@ -0,0 +1,313 @@
+"""
+Commit Dedup Index
+Remembers commits already published across runs, by SHA and by content.
+"""
+
+import argparse
+import hashlib
+import math
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over string keys.
+
+    Answers "definitely not seen" without touching the database; a positive
+    answer may be a false positive and is confirmed against the exact store.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        """Get the bit positions of a key (double hashing of one digest)."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        """Add a key."""
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key)
+        )
+
+
+class DedupIndex:
+    """Persistent index of commits that already made it into an output file.
+
+    Commits are indexed by SHA and by a content key: a hash of the author
+    email, author date and message, which a cherry-pick or a fork keeps
+    while its SHA changes. It is the closest analogue of `git patch-id`
+    available before any detail request, since the diff itself is unknown
+    at that point. Keys live in SQLite; a bloom filter rebuilt on load
+    answers most lookups, which are for new commits, without a query.
+
+    New commits are staged during a run and only committed once the output
+    has been written, so an interrupted run never hides commits it did not
+    publish.
+    """
+
+    def __init__(self, path: str = ".cache/dedup.sqlite", error_rate: float = 0.01):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen (
+                key TEXT PRIMARY KEY,
+                repository TEXT NOT NULL,
+                sha TEXT NOT NULL,
+                commit_date REAL NOT NULL,
+                indexed_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_commit_date ON seen (commit_date)")
+        self.conn.commit()
+
+        self.pending: Dict[str, Tuple[str, str, float]] = {}
+        self.bloom_negatives = 0
+        self.false_positives = 0
+        self.bloom = self._build_bloom()
+
+    def _build_bloom(self) -> BloomFilter:
+        """Build a bloom filter sized for the stored keys plus room to grow."""
+        with self.lock:
+            count = self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+            bloom = BloomFilter(capacity=max(10_000, count * 2), error_rate=self.error_rate)
+            for (key,) in self.conn.execute("SELECT key FROM seen"):
+                bloom.add(key)
+        return bloom
+
+    @staticmethod
+    def sha_key(sha: str) -> str:
+        """Build the index key of a commit SHA."""
+        return f"sha:{sha}"
+
+    @staticmethod
+    def content_key(author_email: str, author_date: str, message: str) -> Optional[str]:
+        """Build the content key of a commit, or None without an author date.
+
+        Dates are compared as UTC instants and messages with normalized line
+        endings and trailing whitespace, so the same commit reported by
+        different endpoints gets the same key.
+
+        The diff is deliberately left out: keys are checked on list-level
+        commits to save their detail requests. An amend keeps the author date,
+        so amending only the diff of a published commit is a known false
+        positive.
+        """
+        if not author_date:
+            return None
+        try:
+            instant = datetime.fromisoformat(author_date.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+
+        normalized = "\n".join(line.rstrip() for line in message.strip().splitlines())
+        digest = hashlib.sha256(
+            f"{author_email.lower()}\0{int(instant)}\0{normalized}".encode("utf-8")
+        ).hexdigest()
+        return f"content:{digest}"
+
+    @classmethod
+    def keys_for(cls, commit: Dict[str, Any]) -> List[str]:
+        """Get the index keys of a list-level commit, search result or record."""
+        keys = []
+        if commit.get("sha"):
+            keys.append(cls.sha_key(commit["sha"]))
+
+        author = commit.get("commit", {}).get("author") or {}
+        if author:
+            email, date = author.get("email", ""), author.get("date", "")
+            message = commit.get("commit", {}).get("message", "")
+        else:
+            email, date = commit.get("author_email", ""), commit.get("date", "")
+            message = commit.get("message", "")
+
+        content_key = cls.content_key(email or "", date or "", message or "")
+        if content_key:
+            keys.append(content_key)
+        return keys
+
+    def contains(self, key: str) -> bool:
+        """Check whether a key was committed, consulting the bloom filter first."""
+        if key not in self.bloom:
+            self.bloom_negatives += 1
+            return False
+
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.false_positives += 1
+            return False
+        return True
+
+    def seen(self, commit: Dict[str, Any]) -> bool:
+        """Check whether a commit, or a copy of it, was published before."""
+        return any(self.contains(key) for key in self.keys_for(commit))
+
+    def stage(self, record: Dict[str, Any]) -> None:
+        """Remember a processed record, to be committed with commit()."""
+        try:
+            commit_date = datetime.fromisoformat(
+                record.get("date", "").replace("Z", "+00:00")
+            ).timestamp()
+        except ValueError:
+            commit_date = time.time()
+
+        entry = (record.get("repository", ""), record.get("sha", ""), commit_date)
+        for key in self.keys_for(record):
+            self.pending[key] = entry
+
+    def commit(self) -> int:
+        """Persist the staged records.
+
+        Returns:
+            Number of keys added
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, repository, sha, commit_date, now)
+                    for key, (repository, sha, commit_date) in self.pending.items()
+                ],
+            )
+            self.conn.commit()
+
+        for key in self.pending:
+            self.bloom.add(key)
+        added = len(self.pending)
+        self.pending = {}
+        return added
+
+    def stats(self) -> Dict[str, Any]:
+        """Get key counts, the date range and the bloom filter's size."""
+        with self.lock:
+            sha_keys, content_keys, oldest, newest = self.conn.execute(
+                """
+                SELECT
+                    SUM(key LIKE 'sha:%'),
+                    SUM(key LIKE 'content:%'),
+                    MIN(commit_date),
+                    MAX(commit_date)
+                FROM seen
+                """
+            ).fetchone()
+
+        return {
+            "sha_keys": sha_keys or 0,
+            "content_keys": content_keys or 0,
+            "oldest_commit": oldest,
+            "newest_commit": newest,
+            "bloom_bytes": len(self.bloom.bits),
+            "bloom_hashes": self.bloom.num_hashes,
+        }
+
+    def prune(self, older_than_days: Optional[int] = None) -> int:
+        """Remove keys of commits authored more than `older_than_days` ago.
+
+        Without a limit every key is removed. The bloom filter is rebuilt,
+        since bloom filters cannot forget keys.
+
+        Returns:
+            Number of keys removed
+        """
+        with self.lock:
+            if older_than_days is None:
+                cursor = self.conn.execute("DELETE FROM seen")
+            else:
+                cutoff = time.time() - older_than_days * 86400
+                cursor = self.conn.execute("DELETE FROM seen WHERE commit_date < ?", (cutoff,))
+            self.conn.commit()
+            self.conn.execute("VACUUM")
+
+        self.bloom = self._build_bloom()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self.lock:
+            self.conn.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Inspect and prune the cross-run commit dedup index",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--index",
+        default=".cache/dedup.sqlite",
+        help="Path to the dedup index (default: .cache/dedup.sqlite)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show key counts and the indexed date range")
+
+    check_parser = subparsers.add_parser("check", help="Check whether commit SHAs are indexed")
+    check_parser.add_argument("shas", nargs="+", help="Commit SHAs to look up")
+
+    prune_parser = subparsers.add_parser("prune", help="Remove old keys from the index")
+    prune_group = prune_parser.add_mutually_exclusive_group(required=True)
+    prune_group.add_argument(
+        "--older-than",
+        type=int,
+        metavar="DAYS",
+        help="Remove commits authored more than DAYS days ago",
+    )
+    prune_group.add_argument("--all", action="store_true", help="Remove every key")
+
+    args = parser.parse_args()
+
+    if not Path(args.index).exists():
+        print(f"✗ Dedup index not found: {args.index}")
+        sys.exit(1)
+
+    index = DedupIndex(path=args.index)
+    try:
+        if args.command == "stats":
+            stats = index.stats()
+            print(f"  SHA keys:     {stats['sha_keys']}")
+            print(f"  Content keys: {stats['content_keys']}")
+            if stats["oldest_commit"] is not None:
+                oldest = datetime.fromtimestamp(stats["oldest_commit"]).date()
+                newest = datetime.fromtimestamp(stats["newest_commit"]).date()
+                print(f"  Commits:      {oldest} to {newest}")
+            print(
+                f"  Bloom filter: {stats['bloom_bytes'] / 1024:.0f} KB, "
+                f"{stats['bloom_hashes']} hashes"
+            )
+        elif args.command == "check":
+            for sha in args.shas:
+                found = index.contains(DedupIndex.sha_key(sha))
+                print(f"  {'✓ indexed' if found else '✗ not indexed'}: {sha}")
+        elif args.command == "prune":
+            removed = index.prune(None if args.all else args.older_than)
+            print(f"✓ Removed {removed} keys from {args.index}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,65 @@ Fetches commits from GitHub API since last run with rate limiting and pagination
 """
 
 import argparse
+import hashlib
+import heapq
 import json
 import os
+import random
+import re
+import shutil
+import sqlite3
+import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
 
 import requests
 import yaml
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from roboblog.activity import listing_significance
+from roboblog.commit_stream import (
+    OUTPUT_FORMATS,
+    CommitCollector,
+    CommitStreamReader,
+    CommitStreamWriter,
+    default_output_path,
+)
+from roboblog.dedup_index import DedupIndex
+from roboblog.git_mirror import GitMirror
+
+# A commit found by discovery: (list-level commit, repository full name, commit date)
+Candidate = Tuple[Dict[str, Any], str, datetime]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Get the process's peak resident set size in MB, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class GitHubAPIError(Exception):
+    """Raised when a GitHub API request fails."""
+
+
+class ResourceUnavailableError(GitHubAPIError):
+    """Raised when a resource is gone or inaccessible, so retrying cannot help."""
 
 
 class ConfigReader:
@@ -66,6 +114,27 @@ class ConfigReader:
         """Get list of repositories to exclude."""
         return self.config.get("github", {}).get("exclude_repos", [])
 
+    def get_author_usernames(self) -> List[str]:
+        """Get GitHub logins whose commits are included (empty = everyone)."""
+        return self.config.get("github", {}).get("author_filters", {}).get("usernames", [])
+
+    def get_author_emails(self) -> List[str]:
+        """Get commit emails whose commits are included (empty = everyone)."""
+        return self.config.get("github", {}).get("author_filters", {}).get("emails", [])
+
+    def get_repo_weights(self) -> Dict[str, float]:
+        """Get significance bonus per repository (short or full name)."""
+        weights = self.config.get("github", {}).get("repo_weights") or {}
+        return {name: float(weight) for name, weight in weights.items()}
+
+    def get_min_commits(self) -> int:
+        """Get the minimum commits required to close the window and post."""
+        return int(self.config.get("automation", {}).get("min_commits", 0))
+
+    def get_max_commits(self) -> int:
+        """Get the maximum commits whose details are fetched (0 = no limit)."""
+        return int(self.config.get("fetch", {}).get("max_commits", 0))
+
     def get_example_mode(self) -> bool:
         """Check if example mode is enabled."""
         return self.config.get("automation", {}).get("example_mode", False)
@@ -74,6 +143,89 @@ class ConfigReader:
         """Get path to example commit data file."""
         return self.config.get("automation", {}).get("example_data_path", "data/example_commits.json")
 
+    def get_fetch_concurrency(self) -> int:
+        """Get maximum number of concurrent GitHub API requests."""
+        return max(1, int(self.config.get("fetch", {}).get("concurrency", 4)))
+
+    def get_rate_limit_reserve(self) -> int:
+        """Get number of requests to hold back until the rate limit resets."""
+        return int(self.config.get("fetch", {}).get("rate_limit_reserve", 50))
+
+    def get_cache_dir(self) -> str:
+        """Get directory for persistent fetch caches."""
+        return self.config.get("fetch", {}).get("cache_dir", ".cache")
+
+    def get_http_cache_enabled(self) -> bool:
+        """Check if the conditional-request HTTP cache is enabled."""
+        return self.config.get("fetch", {}).get("http_cache", True)
+
+    def get_http_cache_max_mb(self) -> int:
+        """Get size cap of the HTTP cache in megabytes."""
+        return int(self.config.get("fetch", {}).get("http_cache_max_mb", 50))
+
+    def get_commit_store_enabled(self) -> bool:
+        """Check if processed commits are kept in the local commit store."""
+        return self.config.get("fetch", {}).get("commit_store", True)
+
+    def get_retry_policy(self) -> Dict[str, Any]:
+        """Get retry and circuit breaker settings for transient failures."""
+        fetch_config = self.config.get("fetch", {})
+        return {
+            "max_retries": int(fetch_config.get("max_retries", 3)),
+            "backoff_base": float(fetch_config.get("retry_backoff_seconds", 1.0)),
+            "circuit_breaker_threshold": int(
+                fetch_config.get("circuit_breaker_threshold", 5)
+            ),
+        }
+
+    def get_failed_repo_retries(self) -> int:
+        """Get the runs in a row a failed repository is retried from its old cursor."""
+        return int(self.config.get("fetch", {}).get("failed_repo_retries", 3))
+
+    def get_commit_store_max_age_days(self) -> int:
+        """Get age in days after which stored commits are evicted."""
+        return int(self.config.get("fetch", {}).get("commit_store_max_age_days", 365))
+
+    def get_discovery_mode(self) -> str:
+        """Get how commits are discovered: "auto", "commits", "events", "search" or "git"."""
+        return self.config.get("fetch", {}).get("discovery", "commits")
+
+    def get_git_mirror_url(self) -> str:
+        """Get the clone URL template used for git mirrors."""
+        return self.config.get("fetch", {}).get(
+            "git_mirror_url", "https://github.com/{repo}.git"
+        )
+
+    def get_auto_strategies(self) -> List[str]:
+        """Get the discovery strategies "auto" may choose from."""
+        return self.config.get("fetch", {}).get(
+            "auto_strategies", ["commits", "search"]
+        )
+
+    def get_planner_commits_per_repo(self) -> int:
+        """Get the assumed number of new commits per active repository."""
+        return int(self.config.get("fetch", {}).get("planner_commits_per_repo", 10))
+
+    def get_detail_page_concurrency(self) -> int:
+        """Get the parallel requests for extra file pages of one large commit."""
+        return int(self.config.get("fetch", {}).get("detail_page_concurrency", 4))
+
+    def get_dedup_index_enabled(self) -> bool:
+        """Check whether commits published by earlier runs are skipped."""
+        return bool(self.config.get("fetch", {}).get("dedup_index", True))
+
+    def get_output_format(self) -> str:
+        """Get the output format: "ndjson" (streamed) or "json" (legacy document)."""
+        return self.config.get("fetch", {}).get("output_format", "ndjson")
+
+    def get_output_gzip(self) -> bool:
+        """Check whether NDJSON output is gzip-compressed."""
+        return bool(self.config.get("fetch", {}).get("output_gzip", False))
+
+    def get_api_base_url(self) -> str:
+        """Get the GitHub API base URL (a local mock server for offline runs)."""
+        return self.config.get("fetch", {}).get("api_base_url", GitHubAPIClient.BASE_URL)
+
 
 class TimestampTracker:
     """Manages the .last_build file for tracking last run timestamp."""
@@ -105,17 +257,963 @@ class TimestampTracker:
         print(f"✓ Updated {self.file_path} with timestamp: {timestamp.isoformat()}")
 
 
+class RepoCursorStore:
+    """Manages per-repository fetch cursors in the .repo_cursors.json file.
+
+    Each repository records when it was last fetched completely and the newest
+    commit seen. Repositories that failed are flagged and keep the start of
+    their missed window, so the next run retries exactly that window. A
+    repository that keeps failing is given up after `max_failures` runs.
+    """
+
+    def __init__(self, file_path: str = ".repo_cursors.json", max_failures: int = 3):
+        self.file_path = Path(file_path)
+        self.max_failures = max(1, max_failures)
+        self.cursors: Dict[str, Dict[str, Any]] = {}
+
+    def read(self) -> None:
+        """Load cursors from file."""
+        if not self.file_path.exists():
+            return
+
+        try:
+            with open(self.file_path, "r") as f:
+                self.cursors = json.load(f)
+        except (ValueError, OSError) as e:
+            print(f"⚠ Error reading {self.file_path}: {e}")
+            self.cursors = {}
+
+    def get_since(self, repo_name: str) -> Optional[datetime]:
+        """Get the time a repository was last fetched completely."""
+        cursor = self.cursors.get(repo_name)
+        if not cursor:
+            return None
+        return datetime.fromisoformat(cursor["synced_at"])
+
+    def get_oldest_failed(self) -> Optional[datetime]:
+        """Get the oldest cursor among repositories whose last fetch failed."""
+        failed = [
+            datetime.fromisoformat(cursor["synced_at"])
+            for cursor in self.cursors.values()
+            if cursor.get("failed")
+        ]
+        return min(failed) if failed else None
+
+    def mark_synced(
+        self,
+        repo_name: str,
+        synced_at: datetime,
+        newest_commit: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Advance a repository's cursor after a complete fetch."""
+        cursor = self.cursors.get(repo_name, {})
+        cursor["synced_at"] = synced_at.isoformat()
+        cursor.pop("failed", None)
+        cursor.pop("failures", None)
+        if newest_commit:
+            cursor["sha"] = newest_commit.get("sha", "")
+            cursor["date"] = newest_commit.get("date", "")
+        self.cursors[repo_name] = cursor
+
+    def mark_failed(self, repo_name: str, since: datetime, synced_at: datetime) -> bool:
+        """Flag a repository whose fetch failed so the next run retries from `since`.
+
+        Args:
+            since: Start of the window still missing; the previous cursor, or
+                a later commit date when every older commit was processed
+            synced_at: Where the cursor moves if the repository is given up
+
+        Returns:
+            True if the repository failed `max_failures` runs in a row and its
+            missed window was given up
+        """
+        cursor = self.cursors.get(repo_name, {})
+        failures = cursor.get("failures", 0) + 1
+        if failures >= self.max_failures:
+            self.mark_synced(repo_name, synced_at)
+            return True
+
+        cursor["synced_at"] = since.isoformat()
+        cursor["failed"] = True
+        cursor["failures"] = failures
+        self.cursors[repo_name] = cursor
+        return False
+
+    def write(self) -> None:
+        """Atomically write cursors to file."""
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.cursors, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.file_path)
+
+        print(f"✓ Updated {self.file_path} ({len(self.cursors)} repositories)")
+
+
+class FetchJournal:
+    """Append-only checkpoint journal of an in-progress fetch run.
+
+    Every processed commit and every completed repository is appended as one
+    JSON line and flushed immediately, so a run that is killed part way
+    loses at most the line being written. A restarted run loads the journal,
+    continues the interrupted run's window and skips the work already done;
+    the journal is removed once the output has been finalized. Only records
+    restored from an interrupted run are held in memory; new ones are
+    tracked by key.
+    """
+
+    def __init__(self, file_path: str = "data/commits.journal"):
+        self.file_path = Path(file_path)
+        self.since: Optional[datetime] = None
+        self.started_at: Optional[datetime] = None
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.completed_repos: set = set()
+        self._journaled: set = set()
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Load the journal of an interrupted run.
+
+        Returns:
+            True if a journal was found and the run can be resumed
+        """
+        if not self.file_path.exists():
+            return False
+
+        try:
+            with open(self.file_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by the crash; everything before it is intact
+                        continue
+
+                    entry_type = entry.get("type")
+                    if entry_type == "run":
+                        self.since = datetime.fromisoformat(entry["since"])
+                        self.started_at = datetime.fromisoformat(entry["started_at"])
+                    elif entry_type == "commit":
+                        record = entry["record"]
+                        self.records[self._key(record)] = record
+                        self._journaled.add(self._key(record))
+                    elif entry_type == "repo":
+                        self.completed_repos.add(entry["repo"])
+        except (ValueError, KeyError, OSError) as e:
+            print(f"⚠ Error reading {self.file_path}, starting a new run: {e}")
+            self.since = None
+
+        if self.since is None:
+            self.records = {}
+            self.completed_repos = set()
+            self._journaled = set()
+            return False
+
+        return True
+
+    def start(self, since: datetime, started_at: datetime) -> None:
+        """Open the journal for appending, recording the run's window if new."""
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        resumed = self.since is not None
+        self._file = open(self.file_path, "a" if resumed else "w")
+        if not resumed:
+            self.since = since
+            self.started_at = started_at
+            self._append(
+                {
+                    "type": "run",
+                    "since": since.isoformat(),
+                    "started_at": started_at.isoformat(),
+                }
+            )
+
+    def get_record(self, repo_name: str, sha: str) -> Optional[Dict[str, Any]]:
+        """Get a commit record processed before the interruption."""
+        return self.records.get(f"{repo_name}/{sha}")
+
+    def records_for(self, repo_name: str) -> List[Dict[str, Any]]:
+        """Get the journaled records of a repository, in processing order."""
+        return [
+            record for record in self.records.values() if record.get("repository") == repo_name
+        ]
+
+    def record_commit(self, record: Dict[str, Any]) -> None:
+        """Append a processed commit record unless it is already journaled."""
+        key = self._key(record)
+        if key in self._journaled:
+            return
+        self._journaled.add(key)
+        self._append({"type": "commit", "record": record})
+
+    def record_repo(self, repo_name: str) -> None:
+        """Append a repository whose commits have all been processed."""
+        if repo_name in self.completed_repos:
+            return
+        self.completed_repos.add(repo_name)
+        self._append({"type": "repo", "repo": repo_name})
+
+    def remove(self) -> None:
+        """Close and delete the journal after the output has been finalized."""
+        self.close()
+        self.file_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Close the journal file, keeping it for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Write one journal line and flush it to the OS."""
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    @staticmethod
+    def _key(record: Dict[str, Any]) -> str:
+        return f"{record.get('repository', '')}/{record.get('sha', '')}"
+
+
+class RateLimitScheduler:
+    """Token-bucket scheduler that paces requests from GitHub rate-limit headers.
+
+    Every request takes a token before it is sent. The bucket holds the spare
+    budget (remaining requests minus a reserve) and refills at the rate that
+    spreads that spare budget evenly until the reset time, so plentiful
+    budget is spent at full speed and a low one is stretched to the reset
+    instead of running dry. The reserve is never spent: once only the reserve
+    is left, requests pause until the reset, as they do after Retry-After.
+    Until a response reports the budget (or when none ever does, e.g. behind
+    a proxy), requests are not paced at all.
+    """
+
+    # GitHub asks clients to wait at least a minute after a secondary rate limit
+    SECONDARY_LIMIT_WAIT = 60
+
+    def __init__(self, reserve: int = 50, burst: int = 10, hourly_limit: int = 5000):
+        # A reserve sized for the 5000/h token budget would swallow most of
+        # the 60/h unauthenticated one, so it is capped at a tenth of the limit
+        self.reserve = min(max(0, reserve), hourly_limit // 10)
+        self.burst = max(1, burst)
+        self.capacity = float(self.burst)
+        self.tokens = float(self.burst)
+        self.hourly_rate = hourly_limit / 3600.0
+        self.rate = self.hourly_rate
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.paused_until = 0.0
+        self.updated_at = time.time()
+        self.requests_made = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens earned since the last update."""
+        if self.reset_at is not None and now >= self.reset_at:
+            # Budget has reset; run unpaced until the next response reports it
+            self.remaining = None
+            self.reset_at = None
+            self.rate = self.hourly_rate
+            self.capacity = float(self.burst)
+            self.tokens = max(self.tokens, self.capacity)
+
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                now = time.time()
+                self._refill(now)
+
+                wait = self.paused_until - now
+                if wait <= 0 and self.remaining is None:
+                    # Budget unknown: nothing to pace against yet
+                    self.requests_made += 1
+                    return
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.requests_made += 1
+                        if self.remaining is not None:
+                            self.remaining -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(min(wait, 60))
+
+    def refund(self) -> None:
+        """Return the token of a request GitHub did not charge for (e.g. a 304)."""
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+            self.requests_made -= 1
+            if self.remaining is not None:
+                self.remaining += 1
+
+    def seed(self, remaining: int, reset_at: float) -> None:
+        """Set the budget from a known remaining count and reset time."""
+        with self.lock:
+            self._set_budget(remaining, reset_at, time.time())
+
+    def _set_budget(self, remaining: int, reset_at: float, now: float) -> None:
+        """Resize the bucket to the budget left until reset."""
+        self.remaining = remaining
+        self.reset_at = reset_at
+        window = max(reset_at - now, 1.0)
+
+        spare = remaining - self.reserve
+        self.rate = max(spare, 1) / window
+
+        if spare > self.burst:
+            # Plenty of budget: the spare requests can be spent right away
+            self.capacity = float(spare)
+            self.tokens = float(spare)
+        else:
+            # Near the reserve: stretch what is left across the window
+            self.capacity = float(self.burst)
+            self.tokens = min(self.tokens, self.capacity, float(max(spare, 0)))
+
+        if spare <= 0:
+            # Only the reserve is left; hold it back until the budget resets
+            self.paused_until = max(self.paused_until, reset_at + 1)
+
+    def update(self, response: requests.Response) -> bool:
+        """Record rate-limit headers from a response.
+
+        Returns:
+            True if the response was rejected by a rate limit and the request
+            should be retried once the scheduler allows it
+        """
+        headers = response.headers
+        now = time.time()
+
+        with self.lock:
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining is not None and reset is not None:
+                try:
+                    self._set_budget(int(remaining), float(reset), now)
+                except ValueError:
+                    pass
+
+            if response.status_code not in (403, 429):
+                return False
+
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    wait = float(retry_after)
+                except ValueError:
+                    wait = self.SECONDARY_LIMIT_WAIT
+                self.paused_until = max(self.paused_until, now + wait)
+                return True
+
+            if remaining == "0":
+                # Primary limit exhausted; _set_budget paused until reset
+                return True
+
+            if "secondary rate limit" in response.text.lower():
+                self.paused_until = max(
+                    self.paused_until, now + self.SECONDARY_LIMIT_WAIT
+                )
+                return True
+
+        return False
+
+    def wait_seconds(self) -> float:
+        """Seconds until requests are allowed again."""
+        return max(0.0, self.paused_until - time.time())
+
+
+class ResponseCache:
+    """Persistent cache of GitHub responses for conditional requests.
+
+    Stores the ETag/Last-Modified validators and body of each cached request
+    in SQLite, so repeat requests are sent with If-None-Match/If-Modified-Since
+    and a 304 is answered from disk. Entries are evicted least-recently-used
+    once the cache grows past its size cap.
+    """
+
+    def __init__(self, path: str = ".cache/http_cache.sqlite", max_bytes: int = 50 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self.conn.commit()
+        row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self.total_bytes = row[0]
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]], token: Optional[str]) -> str:
+        """Build the cache key for a request.
+
+        The token is folded in as a fingerprint so responses that depend on
+        the caller (e.g. private repositories) are never shared.
+        """
+        key = url
+        if params:
+            key += "?" + urlencode(sorted((k, str(v)) for k, v in params.items()))
+        if token:
+            key = hashlib.sha256(token.encode()).hexdigest()[:12] + " " + key
+        return key
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Get If-None-Match/If-Modified-Since headers for a cached key."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def get_body(self, key: str) -> Optional[bytes]:
+        """Get the cached body for a 304 response and mark it recently used."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self.conn.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Cache a 200 response if it carries a validator."""
+        with self.lock:
+            self.misses += 1
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if not etag and not last_modified:
+                return
+
+            body = response.content
+            old = self.conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if old:
+                self.total_bytes -= old[0]
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, len(body), time.time()),
+            )
+            self.total_bytes += len(body)
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the cache fits its cap."""
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self.total_bytes -= row[1]
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self.lock:
+            self.conn.close()
+
+
+class CommitStore:
+    """Content-addressed store of processed commit records.
+
+    A commit never changes once it exists, so the records built by
+    CommitProcessor._process_commit are kept in SQLite keyed by
+    "owner/repo/sha" and reused instead of fetching the details again.
+    """
+
+    def __init__(self, path: str = ".cache/commits.sqlite"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS commits (
+                key TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                commit_date REAL NOT NULL,
+                stored_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS commits_commit_date ON commits (commit_date)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(repo_name: str, sha: str) -> str:
+        """Build the store key for a commit."""
+        return f"{repo_name}/{sha}"
+
+    def get(self, repo_name: str, sha: str) -> Optional[Dict[str, Any]]:
+        """Get a stored commit record, or None if it was never stored."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT record FROM commits WHERE key = ?",
+                (self.make_key(repo_name, sha),),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, record: Dict[str, Any]) -> None:
+        """Store a processed commit record."""
+        try:
+            commit_date = datetime.fromisoformat(
+                record.get("date", "").replace("Z", "+00:00")
+            ).timestamp()
+        except ValueError:
+            commit_date = time.time()
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?)",
+                (
+                    self.make_key(record.get("repository", ""), record.get("sha", "")),
+                    json.dumps(record),
+                    commit_date,
+                    time.time(),
+                ),
+            )
+            self.conn.commit()
+
+    def shas_since(self, repo_name: str, since: datetime) -> Set[str]:
+        """Get the SHAs of a repository's stored commits authored since `since`."""
+        prefix = self.make_key(repo_name, "")
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key FROM commits WHERE key >= ? AND key < ? AND commit_date >= ?",
+                # SHAs are hex, so "~" sorts after every key with this prefix
+                (prefix, prefix + "~", since.timestamp()),
+            ).fetchall()
+        return {key[len(prefix) :] for (key,) in rows}
+
+    def evict_older_than(self, days: int) -> int:
+        """Remove commits authored more than `days` days ago.
+
+        Returns:
+            Number of records removed
+        """
+        cutoff = time.time() - days * 86400
+        with self.lock:
+            cursor = self.conn.execute(
+                "DELETE FROM commits WHERE commit_date < ?", (cutoff,)
+            )
+            self.conn.commit()
+            return cursor.rowcount
+
+    def compact(self) -> None:
+        """Reclaim space left by evicted records."""
+        with self.lock:
+            self.conn.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self.lock:
+            self.conn.close()
+
+
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter for transient failures."""
+
+    def __init__(
+        self, max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0
+    ):
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the wait before retry number `attempt` (0-based)."""
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+        # Full jitter spreads concurrent workers' retries apart
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def wait(self, attempt: int, reason: str, retry_after: Optional[str] = None) -> None:
+        """Sleep before the next retry."""
+        delay = self.delay(attempt, retry_after)
+        print(
+            f"⚠ {reason}, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})"
+        )
+        time.sleep(delay)
+
+
+class CircuitBreaker:
+    """Stops requests for a key (e.g. a repository) that keeps failing.
+
+    After `threshold` consecutive failures the circuit opens and requests are
+    refused for `cooldown` seconds; the first request afterwards is let through
+    as a probe and closes the circuit again if it succeeds.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 300.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures: Dict[str, int] = {}
+        self.opened_at: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """Check whether a request for the key may be sent."""
+        with self.lock:
+            opened_at = self.opened_at.get(key)
+            if opened_at is None:
+                return True
+            if time.time() - opened_at >= self.cooldown:
+                # Half-open: let one probe through
+                del self.opened_at[key]
+                self.failures[key] = self.threshold - 1
+                return True
+            return False
+
+    def record_success(self, key: Optional[str]) -> None:
+        """Reset the failure count for a key."""
+        if key is None:
+            return
+        with self.lock:
+            self.failures.pop(key, None)
+
+    def record_failure(self, key: Optional[str]) -> None:
+        """Count a failed request and open the circuit at the threshold."""
+        if key is None:
+            return
+        with self.lock:
+            self.failures[key] = self.failures.get(key, 0) + 1
+            if self.failures[key] >= self.threshold and key not in self.opened_at:
+                self.opened_at[key] = time.time()
+                print(f"⚠ Circuit opened for {key} after {self.failures[key]} failures")
+
+
+class PatchStripper:
+    """Incrementally copies a commit detail body, dropping `patch` strings.
+
+    A minimal JSON lexer follows string boundaries across chunks. When the key
+    "patch" is followed by a string, the string is replaced with null and its
+    bytes are skipped as they arrive instead of being buffered, so diff text
+    never accumulates in memory. Everything else is copied unchanged and the
+    result is still valid JSON.
+    """
+
+    # Bytes that end a run of ordinary string content
+    STRING_SPECIAL = re.compile(rb'["\\]')
+
+    def __init__(self, key: bytes = b"patch"):
+        self.key = key
+        self.kept = bytearray()
+        self.bytes_received = 0
+        # "out" (between tokens), "string", "after_key" or "skip" (dropped value)
+        self._state = "out"
+        self._escape = False
+        self._seen_colon = False
+        # Start of the current string, long enough to compare against the key
+        self._token = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume the next chunk of the response body."""
+        self.bytes_received += len(chunk)
+        pos = 0
+        end = len(chunk)
+
+        while pos < end:
+            if self._state == "out":
+                quote = chunk.find(b'"', pos)
+                if quote == -1:
+                    self.kept += chunk[pos:]
+                    return
+                self.kept += chunk[pos : quote + 1]
+                pos = quote + 1
+                self._state = "string"
+                self._token.clear()
+
+            elif self._state in ("string", "skip"):
+                keep = self._state == "string"
+                if self._escape:
+                    # The escaped byte may start a new chunk
+                    if keep:
+                        self.kept += chunk[pos : pos + 1]
+                        self._token += chunk[pos : pos + 1]
+                    self._escape = False
+                    pos += 1
+                    continue
+
+                match = self.STRING_SPECIAL.search(chunk, pos)
+                stop = match.start() if match else end
+                if keep:
+                    self.kept += chunk[pos:stop]
+                    if len(self._token) <= len(self.key):
+                        self._token += chunk[pos : min(stop, pos + len(self.key) + 1)]
+                if match is None:
+                    return
+
+                if chunk[stop] == ord("\\"):
+                    if keep:
+                        self.kept += b"\\"
+                        self._token += b"\\"
+                    self._escape = True
+                elif keep:
+                    self.kept += b'"'
+                    self._state = "after_key" if self._token == self.key else "out"
+                    self._seen_colon = False
+                else:
+                    self._state = "out"
+                pos = stop + 1
+
+            else:  # after_key
+                byte = chunk[pos]
+                if byte in b" \t\r\n":
+                    self.kept.append(byte)
+                    pos += 1
+                elif byte == ord(":"):
+                    self.kept.append(byte)
+                    self._seen_colon = True
+                    pos += 1
+                elif byte == ord('"') and self._seen_colon:
+                    self.kept += b"null"
+                    self._state = "skip"
+                    pos += 1
+                else:
+                    self._state = "out"
+
+    def result(self) -> bytes:
+        """Get the body without patch text."""
+        return bytes(self.kept)
+
+
 class GitHubAPIClient:
     """GitHub API client with rate limiting and pagination support."""
 
     BASE_URL = "https://api.github.com"
 
-    def __init__(self, token: Optional[str] = None):
+    # How many times a rate-limited request is retried after waiting
+    MAX_RATE_LIMIT_RETRIES = 3
+
+    # The search API never returns more than this many results per query
+    SEARCH_RESULT_LIMIT = 1000
+
+    # Statuses a retry cannot change: no access, not found, empty repository,
+    # gone, unknown commit and blocked for legal reasons
+    UNAVAILABLE_STATUSES = (403, 404, 409, 410, 422, 451)
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        pool_size: int = 10,
+        scheduler: Optional[RateLimitScheduler] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        detail_page_concurrency: int = 4,
+        base_url: Optional[str] = None,
+    ):
         self.token = token
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        # Parallel requests for the extra file pages of one large commit
+        self.detail_page_concurrency = max(1, detail_page_concurrency)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.scheduler = scheduler or RateLimitScheduler(
+            hourly_limit=5000 if token else 60
+        )
+        self.cache = cache
+        # The search API has its own, much smaller, per-minute budget
+        self.search_scheduler = RateLimitScheduler(
+            reserve=0, burst=1, hourly_limit=(30 if token else 10) * 60
+        )
         self.session = requests.Session()
+        # Share one connection pool across worker threads
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         if self.token:
             self.session.headers.update({"Authorization": f"token {self.token}"})
         self.session.headers.update({"Accept": "application/vnd.github.v3+json"})
+        # Commit detail body sizes before and after dropping patch text
+        self.detail_bytes = {"received": 0, "kept": 0, "largest_received": 0, "largest_kept": 0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def _is_unavailable(cls, response: requests.Response) -> bool:
+        """Check whether a response says the resource cannot be fetched at all.
+
+        Not found, gone, blocked, inaccessible or (for a commit) no longer
+        existing; a retry would get the same answer. Rate-limit 403s are
+        transient and do not count.
+        """
+        if response.status_code not in cls.UNAVAILABLE_STATUSES:
+            return False
+        if response.status_code == 403 and (
+            "Retry-After" in response.headers
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in response.text.lower()
+        ):
+            return False
+        return True
+
+    def _request(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: int = 10,
+        cacheable: bool = False,
+        scheduler: Optional[RateLimitScheduler] = None,
+        circuit_key: Optional[str] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Send a GET request through a rate-limit scheduler and retry policy.
+
+        Requests rejected by a primary or secondary rate limit are retried once
+        the scheduler's pause has elapsed. Connection errors, timeouts and 5xx
+        responses are retried with exponential backoff and jitter. Cacheable
+        requests are sent as conditional requests and 304 responses are served
+        from the cache. Requests use the core scheduler unless another one is
+        given.
+
+        Args:
+            circuit_key: Groups requests (e.g. by repository) for the circuit
+                breaker, which refuses them after repeated failures
+            stream: Leave the body unread so the caller can consume it in
+                chunks; the caller must close the response
+
+        Raises:
+            GitHubAPIError: If the circuit is open or the request still fails
+                with a connection error after all retries
+        """
+        scheduler = scheduler or self.scheduler
+        if circuit_key and not self.circuit_breaker.allow(circuit_key):
+            raise GitHubAPIError(
+                f"Skipping {circuit_key}: too many consecutive failures"
+            )
+
+        cache_key = None
+        if self.cache is not None and cacheable:
+            cache_key = self.cache.make_key(url, params, self.token)
+
+        attempt = 0
+        rate_limit_retries = 0
+        while True:
+            headers = self.cache.conditional_headers(cache_key) if cache_key else {}
+
+            scheduler.acquire()
+            try:
+                response = self.session.get(
+                    url, params=params, timeout=timeout, headers=headers, stream=stream
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if attempt >= self.retry_policy.max_retries:
+                    self.circuit_breaker.record_failure(circuit_key)
+                    raise GitHubAPIError(f"Request to {url} failed: {e}") from e
+                self.retry_policy.wait(attempt, type(e).__name__)
+                attempt += 1
+                continue
+
+            if cache_key and response.status_code == 304:
+                # Not modified: GitHub does not charge 304s against the limit
+                scheduler.refund()
+                scheduler.update(response)
+                body = self.cache.get_body(cache_key)
+                if body is not None:
+                    self.circuit_breaker.record_success(circuit_key)
+                    return self._cached_response(response, body)
+                # Entry was evicted meanwhile; ask again unconditionally
+                cache_key = None
+                continue
+
+            if scheduler.update(response):
+                if rate_limit_retries >= self.MAX_RATE_LIMIT_RETRIES:
+                    return response
+                response.close()
+                rate_limit_retries += 1
+                print(
+                    f"⚠ Rate limit exceeded. Waiting {scheduler.wait_seconds():.0f} seconds..."
+                )
+                continue
+
+            if response.status_code >= 500:
+                if attempt < self.retry_policy.max_retries:
+                    response.close()
+                    self.retry_policy.wait(
+                        attempt,
+                        f"HTTP {response.status_code}",
+                        retry_after=response.headers.get("Retry-After"),
+                    )
+                    attempt += 1
+                    continue
+                self.circuit_breaker.record_failure(circuit_key)
+                return response
+
+            self.circuit_breaker.record_success(circuit_key)
+            if cache_key and response.status_code == 200:
+                self.cache.store(cache_key, response)
+            return response
+
+    @staticmethod
+    def _cached_response(
+        not_modified: requests.Response, body: bytes
+    ) -> requests.Response:
+        """Build a 200 response from a 304 and the cached body."""
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = not_modified.headers
+        response.url = not_modified.url
+        response.encoding = "utf-8"
+        response._content = body
+        return response
 
     def validate_token(self) -> bool:
         """Validate GitHub token by testing authentication."""
@@ -123,7 +1221,7 @@ class GitHubAPIClient:
             return True  # No token is fine, just limited rate
 
         try:
-            response = self.session.get(f"{self.BASE_URL}/user", timeout=10)
+            response = self._request(f"{self.BASE_URL}/user")
 
             if response.status_code == 401:
                 print("\n" + "=" * 60)
@@ -168,16 +1266,33 @@ class GitHubAPIClient:
             print(f"✓ GitHub token validated for user: {username}")
             return True
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, GitHubAPIError) as e:
             print(f"⚠ Warning: Could not validate GitHub token: {e}")
             return True  # Continue anyway
 
+    def get_rate_limits(self) -> Dict[str, Dict[str, int]]:
+        """Fetch rate-limit budgets per resource and seed the schedulers.
+
+        Returns:
+            Mapping like {"core": {"remaining": ..., "reset": ...}, "search": ...},
+            empty if the budget could not be read
+        """
+        response = self._request(f"{self.BASE_URL}/rate_limit")
+        if response.status_code != 200:
+            return {}
+
+        resources = response.json().get("resources", {})
+        for name, scheduler in (("core", self.scheduler), ("search", self.search_scheduler)):
+            budget = resources.get(name)
+            if budget:
+                scheduler.seed(budget.get("remaining", 0), budget.get("reset", 0))
+        return resources
+
     def _check_rate_limit(self) -> None:
         """Check and display current rate limit status."""
-        response = self.session.get(f"{self.BASE_URL}/rate_limit")
-        if response.status_code == 200:
-            data = response.json()
-            core = data.get("resources", {}).get("core", {})
+        resources = self.get_rate_limits()
+        if resources:
+            core = resources.get("core", {})
             remaining = core.get("remaining", 0)
             reset_time = core.get("reset", 0)
 
@@ -203,26 +1318,10 @@ class GitHubAPIClient:
             url = f"{self.BASE_URL}/users/{username}/events"
             params = {"per_page": per_page, "page": page}
 
-            response = self.session.get(url, params=params)
-
-            if response.status_code == 403:
-                # Rate limit exceeded
-                reset_time = int(response.headers.get("X-RateLimit-Reset", 0))
-                if reset_time:
-                    reset_dt = datetime.fromtimestamp(reset_time, tz=timezone.utc)
-                    wait_seconds = (
-                        reset_dt - datetime.now(timezone.utc)
-                    ).total_seconds()
-                    print(
-                        f"⚠ Rate limit exceeded. Waiting {wait_seconds:.0f} seconds..."
-                    )
-                    time.sleep(max(wait_seconds + 1, 0))
-                    continue
-                else:
-                    raise Exception("Rate limit exceeded and no reset time provided")
+            response = self._request(url, params=params, cacheable=True)
 
             if response.status_code != 200:
-                raise Exception(
+                raise GitHubAPIError(
                     f"GitHub API error: {response.status_code} - {response.text}"
                 )
 
@@ -238,13 +1337,23 @@ class GitHubAPIClient:
                 break
 
             page += 1
-            time.sleep(0.5)  # Be nice to the API
 
         return events
 
     def get_user_repos(self, username: str) -> List[Dict[str, Any]]:
         """Fetch all repositories for a user with pagination."""
-        repos = []
+        return list(self.iter_user_repos(username))
+
+    def iter_user_repos(
+        self, username: str, since: Optional[datetime] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield a user's repositories, most recently pushed first.
+
+        Args:
+            username: GitHub username (used when no token is available)
+            since: If given, stop paginating at the first repository not
+                pushed since this time; every later one is older still
+        """
         page = 1
         per_page = 100
 
@@ -269,95 +1378,282 @@ class GitHubAPIClient:
                 }
 
             try:
-                response = self.session.get(url, params=params, timeout=10)
+                response = self._request(url, params=params, cacheable=True)
 
                 if response.status_code != 200:
                     print(f"⚠ Failed to fetch repositories: {response.status_code}")
-                    break
+                    return
 
                 page_repos = response.json()
-                if not page_repos:
-                    break
+            except Exception as e:
+                print(f"⚠ Error fetching repositories: {e}")
+                return
 
-                repos.extend(page_repos)
-                print(f"  Fetched {len(page_repos)} repositories (page {page})")
+            if not page_repos:
+                return
 
-                if len(page_repos) < per_page:
-                    break
+            print(f"  Fetched {len(page_repos)} repositories (page {page})")
 
-                page += 1
-                time.sleep(0.5)  # Rate limiting
+            for repo in page_repos:
+                if since is not None:
+                    pushed_at_str = repo.get("pushed_at")
+                    if not pushed_at_str:
+                        # Never pushed (empty repository), nothing to fetch
+                        continue
 
-            except Exception as e:
-                print(f"⚠ Error fetching repositories: {e}")
-                break
+                    pushed_at = datetime.fromisoformat(
+                        pushed_at_str.replace("Z", "+00:00")
+                    )
+                    if pushed_at < since:
+                        print(
+                            f"  Stopped at {repo.get('name', '')}: not pushed since {since.date()}"
+                        )
+                        return
 
-        return repos
+                yield repo
+
+            if len(page_repos) < per_page:
+                return
+
+            page += 1
 
     def get_repo_commits(
-        self, repo_full_name: str, since: datetime, per_page: int = 100
+        self,
+        repo_full_name: str,
+        since: datetime,
+        per_page: int = 100,
+        author: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Fetch commits for a repository since a given date."""
+        """Fetch commits for a repository since a given date.
+
+        Args:
+            author: Only list commits by this GitHub login or email
+
+        Raises:
+            GitHubAPIError: If any page could not be fetched, so callers never
+                mistake a partial list for a complete one
+        """
         commits = []
         page = 1
 
+        # Ask from the start of the day so the request (and its cache key) stays
+        # stable across runs within a day; callers filter by exact date
+        since_day = since.astimezone(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
         while True:
             url = f"{self.BASE_URL}/repos/{repo_full_name}/commits"
             params = {
-                "since": since.isoformat(),
+                "since": since_day.isoformat(),
                 "per_page": per_page,
                 "page": page,
             }
+            if author:
+                params["author"] = author
 
-            try:
-                response = self.session.get(url, params=params, timeout=10)
+            response = self._request(
+                url, params=params, cacheable=True, circuit_key=repo_full_name
+            )
 
-                if response.status_code == 404:
-                    # Repository not found or no access
-                    return commits
+            if self._is_unavailable(response):
+                # Repository not found, no access, blocked or empty
+                return commits
 
-                if response.status_code != 200:
-                    print(
-                        f"⚠ Failed to fetch commits for {repo_full_name}: {response.status_code}"
-                    )
-                    break
+            if response.status_code != 200:
+                raise GitHubAPIError(
+                    f"Failed to fetch commits for {repo_full_name}: {response.status_code}"
+                )
 
-                page_commits = response.json()
-                if not page_commits:
-                    break
+            page_commits = response.json()
+            if not page_commits:
+                break
 
-                commits.extend(page_commits)
+            commits.extend(page_commits)
 
-                # Stop if we got fewer results than requested (last page)
-                if len(page_commits) < per_page:
-                    break
+            # Stop if we got fewer results than requested (last page)
+            if len(page_commits) < per_page:
+                break
 
-                page += 1
-                time.sleep(0.3)  # Rate limiting
+            page += 1
 
-            except Exception as e:
-                print(f"⚠ Error fetching commits for {repo_full_name}: {e}")
+        return commits
+
+    def search_commits(
+        self, username: str, since: datetime, per_page: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Find a user's commits across all repositories with the search API.
+
+        Results are sorted newest first. GitHub returns at most 1000 results
+        per query, so a larger window is truncated with a warning.
+        """
+        items = []
+        page = 1
+        since_day = since.astimezone(timezone.utc).strftime("%Y-%m-%d")
+
+        while True:
+            url = f"{self.BASE_URL}/search/commits"
+            params = {
+                "q": f"author:{username} committer-date:>={since_day}",
+                "sort": "committer-date",
+                "order": "desc",
+                "per_page": per_page,
+                "page": page,
+            }
+
+            response = self._request(
+                url, params=params, scheduler=self.search_scheduler
+            )
+
+            if response.status_code != 200:
+                raise GitHubAPIError(
+                    f"GitHub API error: {response.status_code} - {response.text}"
+                )
+
+            data = response.json()
+            page_items = data.get("items", [])
+            items.extend(page_items)
+            print(f"  Fetched search page {page} ({len(page_items)} commits)")
+
+            if len(page_items) < per_page or len(items) >= self.SEARCH_RESULT_LIMIT:
+                total_count = data.get("total_count", len(items))
+                if total_count > len(items):
+                    print(
+                        f"⚠ Search matched {total_count} commits, only the newest {len(items)} are available"
+                    )
                 break
 
-        return commits
+            page += 1
+
+        return items
 
     def get_commit_details(
         self, repo_full_name: str, commit_sha: str
     ) -> Optional[Dict[str, Any]]:
-        """Fetch detailed commit information including files changed."""
+        """Fetch detailed commit information including files changed.
+
+        The body is streamed through a PatchStripper, so per-file diff text is
+        discarded as it arrives rather than parsed and thrown away later.
+        GitHub caps the files of one response; when a Link header points to
+        more pages they are fetched with bounded concurrency and only slim
+        file entries are kept, so large commits get their full file list and
+        stats without holding every page in memory.
+
+        Returns:
+            The commit with slim file entries, or None if any page failed
+
+        Raises:
+            ResourceUnavailableError: If the commit is gone or inaccessible
+        """
         url = f"{self.BASE_URL}/repos/{repo_full_name}/commits/{commit_sha}"
 
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"⚠ Failed to fetch commit {commit_sha}: {response.status_code}")
+            detailed_commit, links = self._get_detail_page(url, repo_full_name)
+            if detailed_commit is None:
                 return None
+
+            files = self._slim_files(detailed_commit.get("files", []))
+            last_page = self._last_page(links)
+            if last_page > 1:
+                print(
+                    f"  {repo_full_name}@{commit_sha[:7]}: "
+                    f"fetching {last_page - 1} more pages of files"
+                )
+                with ThreadPoolExecutor(max_workers=self.detail_page_concurrency) as executor:
+                    pages = executor.map(
+                        lambda page: self._get_detail_files(url, repo_full_name, page),
+                        range(2, last_page + 1),
+                    )
+                    for page_files in pages:
+                        if page_files is None:
+                            return None
+                        files.extend(page_files)
+
+                # Stats of a paginated commit are recomputed from every page
+                additions = sum(f["additions"] for f in files)
+                deletions = sum(f["deletions"] for f in files)
+                detailed_commit["stats"] = {
+                    "additions": additions,
+                    "deletions": deletions,
+                    "total": additions + deletions,
+                }
+
+            detailed_commit["files"] = files
+            return detailed_commit
+        except ResourceUnavailableError:
+            raise
         except Exception as e:
             print(f"⚠ Error fetching commit {commit_sha}: {e}")
             return None
 
+    def _get_detail_page(
+        self, url: str, repo_full_name: str, page: int = 1
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Fetch one page of a commit's details without its patch text.
+
+        Returns:
+            The parsed page (None on failure) and the response's Link relations
+        """
+        params = {"page": page} if page > 1 else None
+        response = self._request(url, params=params, circuit_key=repo_full_name, stream=True)
+        with response:
+            # Only the first page speaks for the commit; a later page failing
+            # means the file list is incomplete, which a retry may fix
+            if page == 1 and self._is_unavailable(response):
+                raise ResourceUnavailableError(
+                    f"Skipping {url}: unavailable ({response.status_code})"
+                )
+            if response.status_code != 200:
+                print(f"⚠ Failed to fetch {url} (page {page}): {response.status_code}")
+                return None, {}
+
+            stripper = PatchStripper()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                stripper.feed(chunk)
+            links = response.links
+
+        body = stripper.result()
+        with self._stats_lock:
+            stats = self.detail_bytes
+            stats["received"] += stripper.bytes_received
+            stats["kept"] += len(body)
+            if stripper.bytes_received > stats["largest_received"]:
+                stats["largest_received"] = stripper.bytes_received
+                stats["largest_kept"] = len(body)
+        return json.loads(body), links
+
+    def _get_detail_files(
+        self, url: str, repo_full_name: str, page: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one further page of a commit's files as slim entries."""
+        detail_page, _ = self._get_detail_page(url, repo_full_name, page)
+        if detail_page is None:
+            return None
+        return self._slim_files(detail_page.get("files", []))
+
+    @staticmethod
+    def _last_page(links: Dict[str, Any]) -> int:
+        """Get the last page number from Link relations (1 if not paginated)."""
+        if "next" not in links:
+            return 1
+        last_url = links.get("last", links["next"]).get("url", "")
+        page = parse_qs(urlparse(last_url).query).get("page", ["1"])[0]
+        return int(page) if page.isdigit() else 1
+
+    @staticmethod
+    def _slim_files(files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep only the file fields a commit record needs."""
+        return [
+            {
+                "filename": file_info.get("filename", ""),
+                "status": file_info.get("status", ""),
+                "additions": file_info.get("additions", 0),
+                "deletions": file_info.get("deletions", 0),
+                "changes": file_info.get("changes", 0),
+            }
+            for file_info in files
+        ]
+
 
 class CommitProcessor:
     """Processes and filters commits from GitHub events."""
@@ -367,17 +1663,65 @@ class CommitProcessor:
         since: datetime,
         repo_filters: List[str],
         exclude_repos: List[str],
+        concurrency: int = 1,
+        commit_store: Optional[CommitStore] = None,
+        repo_cursors: Optional[RepoCursorStore] = None,
+        author_usernames: Optional[List[str]] = None,
+        author_emails: Optional[List[str]] = None,
+        journal: Optional[FetchJournal] = None,
+        dedup_index: Optional[DedupIndex] = None,
+        max_commits: int = 0,
+        repo_weights: Optional[Dict[str, float]] = None,
     ):
         self.since = since
         self.repo_filters = repo_filters
         self.exclude_repos = exclude_repos
+        self.author_usernames = {name.lower() for name in author_usernames or []}
+        self.author_emails = {email.lower() for email in author_emails or []}
+        # Commits dropped by the author filters before any detail request
+        self.skipped_foreign = 0
+        self.concurrency = max(1, concurrency)
+        self.commit_store = commit_store
+        self.repo_cursors = repo_cursors
+        self.journal = journal
+        self.dedup_index = dedup_index
+        # Commits dropped because an earlier run (or a copy) already published them
+        self.skipped_published = 0
+        # Only the most significant commits are kept (0 = all)
+        self.max_commits = max(0, max_commits)
+        self.repo_weights = repo_weights or {}
+        # Commits dropped by the significance ranking before any detail request
+        self.skipped_ranked = 0
+        # A resumed run keeps the interrupted run's start so cursors cover its window
+        self.started_at = (
+            journal.started_at
+            if journal is not None and journal.started_at is not None
+            else datetime.now(timezone.utc)
+        )
+        # Outcome per repository, used to advance cursors after the run
+        self.synced_repos: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.failed_repos: set = set()
+        # Date of each failed repository's oldest commit whose details failed;
+        # every older commit was processed, so its retry can start there
+        self.failed_since: Dict[str, datetime] = {}
+        # Commits skipped because their details are gone or inaccessible
+        self.skipped_unavailable = 0
+        # Where each commit's record came from in the detail stage
+        self.detail_counts = {"fetched": 0, "store": 0, "journal": 0}
 
     def extract_commits(
         self, events: List[Dict[str, Any]], api_client: GitHubAPIClient
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """Extract and process commits from events."""
-        commits = []
-        seen_commits = set()
+        candidates = self._discover_events(events)
+        candidates = self._filter_candidates(candidates)
+        candidates = self._dedupe_candidates(candidates)
+        candidates = self._rank_candidates(candidates)
+        details = self._fetch_details(api_client, candidates)
+        return self._normalize(details)
+
+    def _discover_events(self, events: List[Dict[str, Any]]) -> Iterator[Candidate]:
+        """Yield candidate commits from push events inside the window."""
         push_events_count = 0
         empty_payloads_count = 0
 
@@ -415,21 +1759,7 @@ class CommitProcessor:
                 empty_payloads_count += 1
 
             for commit in push_commits:
-                commit_sha = commit.get("sha", "")
-                if commit_sha in seen_commits:
-                    continue
-
-                seen_commits.add(commit_sha)
-
-                # Get detailed commit info (including files)
-                detailed_commit = api_client.get_commit_details(repo_name, commit_sha)
-
-                if detailed_commit:
-                    processed = self._process_commit(
-                        commit, detailed_commit, repo_name, event_time
-                    )
-                    commits.append(processed)
-                    time.sleep(0.3)  # Rate limiting
+                yield commit, repo_name, event_time
 
         # Warn if all push events had empty commit payloads
         if push_events_count > 0 and empty_payloads_count == push_events_count:
@@ -450,8 +1780,6 @@ class CommitProcessor:
             print("4. Update .env and remove .last_build file")
             print("=" * 60 + "\n")
 
-        return commits
-
     def _should_exclude_repo(self, repo_name: str) -> bool:
         """Check if repository should be excluded."""
         # Check exclude list
@@ -509,151 +1837,795 @@ class CommitProcessor:
             },
         }
 
-    def fetch_commits_direct(
+    def list_repos(
         self, api_client: GitHubAPIClient, username: str
     ) -> List[Dict[str, Any]]:
-        """Fetch commits directly from Commits API instead of Events API."""
-        commits = []
-        seen_commits = set()
+        """List repositories pushed inside the fetch window.
+
+        Repositories come newest-push first, so enumeration stops at the first
+        one not pushed since the window started (or since the oldest cursor of
+        a repository that failed last run).
+        """
+        enumerate_since = self._enumerate_since()
 
         print(f"  Fetching repositories for user: {username}")
-        repos = api_client.get_user_repos(username)
-        print(f"  Found {len(repos)} repositories")
+        repos = list(api_client.iter_user_repos(username, since=enumerate_since))
+        print(f"  Found {len(repos)} repositories pushed since {enumerate_since.date()}")
+        return repos
+
+    def _is_up_to_date(self, repo: Dict[str, Any]) -> bool:
+        """Check if nothing was pushed to a repository since its window started."""
+        pushed_at_str = repo.get("pushed_at") or ""
+        return bool(pushed_at_str) and datetime.fromisoformat(
+            pushed_at_str.replace("Z", "+00:00")
+        ) < self._repo_since(repo.get("full_name", ""))
+
+    def active_repo_names(self, repos: List[Dict[str, Any]]) -> List[str]:
+        """Get the listed repositories that pass the filters and have new pushes."""
+        return [
+            repo.get("full_name", "")
+            for repo in repos
+            if not self._should_exclude_repo(repo.get("full_name", ""))
+            and not self._is_up_to_date(repo)
+        ]
+
+    def count_covered_details(self, repo_names: List[str]) -> int:
+        """Count commits inside the window whose details need no request.
+
+        Those are the commits already in the commit store. Detail responses
+        are streamed through a PatchStripper and never enter the HTTP cache,
+        so the cache covers none of them.
+        """
+        if self.commit_store is None:
+            return 0
+        return sum(
+            len(self.commit_store.shas_since(repo_name, self._repo_since(repo_name)))
+            for repo_name in repo_names
+        )
+
+    def _enumerate_since(self) -> datetime:
+        """Get the earliest window start of any repository.
+
+        That is the run's window, or the cursor of a repository that failed
+        last run if it is older.
+        """
+        if self.repo_cursors is not None:
+            oldest_failed = self.repo_cursors.get_oldest_failed()
+            if oldest_failed and oldest_failed < self.since:
+                return oldest_failed
+        return self.since
 
+    def fetch_commits_direct(
+        self,
+        api_client: GitHubAPIClient,
+        username: str,
+        repos: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Fetch commits directly from Commits API instead of Events API."""
+        if repos is None:
+            repos = self.list_repos(api_client, username)
+
+        candidates = self._discover_repos(api_client, repos)
+        candidates = self._filter_candidates(candidates, per_repo_window=True)
+        candidates = self._dedupe_candidates(candidates)
+        candidates = self._rank_candidates(candidates)
+        details = self._fetch_details(api_client, candidates)
+        return self._track_repos(self._normalize(details))
+
+    def _discover_repos(
+        self, api_client: GitHubAPIClient, repos: List[Dict[str, Any]]
+    ) -> Iterator[Candidate]:
+        """Yield candidate commits from each active repository's commit list."""
         # Filter repositories
-        filtered_repos = []
+        up_to_date = 0
+        resumed = 0
+        entries = []
         for repo in repos:
             repo_full_name = repo.get("full_name", "")
-            if not self._should_exclude_repo(repo_full_name):
-                filtered_repos.append(repo)
+            if self._should_exclude_repo(repo_full_name):
+                continue
 
-        print(f"  Processing {len(filtered_repos)} repositories (after filters)")
+            journaled = self._replay_journaled(repo_full_name)
+            if journaled is not None:
+                entries.append((repo_full_name, journaled))
+                resumed += 1
+                continue
 
-        # Fetch commits from each repository
-        for repo in filtered_repos:
-            repo_full_name = repo.get("full_name", "")
-            repo_name = repo.get("name", "")
+            if self._is_up_to_date(repo):
+                # Nothing pushed since this repository's last complete fetch
+                self.synced_repos[repo_full_name] = None
+                up_to_date += 1
+                continue
 
-            print(f"    Fetching commits from {repo_name}...")
+            entries.append((repo_full_name, None))
 
-            repo_commits = api_client.get_repo_commits(repo_full_name, self.since)
+        if up_to_date:
+            print(f"  {up_to_date} repositories already up to date")
+        if resumed:
+            print(f"  {resumed} repositories restored from checkpoint journal")
 
-            if not repo_commits:
-                continue
+        print(f"  Processing {len(entries)} repositories (after filters)")
 
-            print(f"      Found {len(repo_commits)} commits")
+        def list_commits(entry):
+            repo_full_name, journaled = entry
+            if journaled is not None:
+                return journaled
+            return self._fetch_repo_commits(
+                api_client, repo_full_name, self._repo_since(repo_full_name)
+            )
+
+        # Fetch commit lists concurrently, a bounded number of repositories ahead
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for (repo_full_name, _), repo_commits in self._bounded_map(
+                executor, list_commits, entries
+            ):
+                if repo_commits is None:
+                    self.failed_repos.add(repo_full_name)
+                    continue
 
-            # Process each commit
-            for commit_data in repo_commits:
-                commit_sha = commit_data.get("sha", "")
+                self.synced_repos.setdefault(repo_full_name, None)
 
-                if commit_sha in seen_commits:
+                if not repo_commits:
+                    if self.journal is not None:
+                        self.journal.record_repo(repo_full_name)
                     continue
 
-                seen_commits.add(commit_sha)
+                print(f"    {repo_full_name}: found {len(repo_commits)} commits")
 
-                # Extract commit details
-                commit_info = commit_data.get("commit", {})
-                author_info = commit_info.get("author", {})
+                for commit_data in repo_commits:
+                    yield commit_data, repo_full_name, self._commit_date(commit_data)
 
-                # Parse commit date
-                commit_date_str = author_info.get("date", "")
-                try:
-                    commit_date = datetime.fromisoformat(
-                        commit_date_str.replace("Z", "+00:00")
-                    )
-                except ValueError:
-                    commit_date = datetime.now(timezone.utc)
+    def _track_repos(self, records: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Follow per-repository progress of a repository-ordered record stream.
+
+        Records arrive grouped by repository, so a repository is complete once
+        the next one starts. Completion is checkpointed, and the newest commit
+        of every repository fetched completely is kept for its cursor.
+        """
+        current = None
+        for record in records:
+            repo_full_name = record.get("repository", "")
+            if repo_full_name != current:
+                self._complete_repo(current)
+                current = repo_full_name
+
+            newest = self.synced_repos.get(repo_full_name)
+            if newest is None or record.get("date", "") > newest.get("date", ""):
+                self.synced_repos[repo_full_name] = record
+
+            yield record
+
+        self._complete_repo(current)
+
+        for repo_full_name in self.failed_repos:
+            self.synced_repos.pop(repo_full_name, None)
+
+        if self.failed_repos:
+            print(
+                f"  ⚠ {len(self.failed_repos)} repositories failed and will be retried next run"
+            )
+
+    def _complete_repo(self, repo_name: Optional[str]) -> None:
+        """Checkpoint a repository whose records have all been processed."""
+        if (
+            repo_name is not None
+            and self.journal is not None
+            and repo_name not in self.failed_repos
+        ):
+            self.journal.record_repo(repo_name)
 
-                # Check if commit is within date range
-                if commit_date < self.since:
+    def fetch_commits_search(
+        self,
+        api_client: GitHubAPIClient,
+        username: str,
+        repos: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Discover commits with the search API, then fetch their details.
+
+        One paginated query finds the user's commits across every repository,
+        replacing the per-repository commit requests. Repositories keep their
+        cursors, failed-repository retries and journal checkpoints as in the
+        commits mode; a repository listing, when given (e.g. the one made for
+        planning), limits results to its repositories and marks them synced.
+        """
+        candidates = self._discover_search(api_client, username, repos)
+        candidates = self._filter_candidates(candidates, per_repo_window=True)
+        candidates = self._dedupe_candidates(candidates)
+        candidates = self._rank_candidates(candidates)
+        details = self._fetch_details(api_client, candidates)
+        return self._track_repos(self._normalize(details))
+
+    def _discover_search(
+        self,
+        api_client: GitHubAPIClient,
+        username: str,
+        repos: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[Candidate]:
+        """Yield candidate commits from a commit search, grouped by repository."""
+        search_since = self._enumerate_since()
+        print(f"  Searching commits by {username} since {search_since.date()}")
+        items = api_client.search_commits(username, search_since)
+        truncated = len(items) >= GitHubAPIClient.SEARCH_RESULT_LIMIT
+
+        # Group by repository (keeping search order within each) so the output
+        # order matches the other discovery modes; search is capped at 1000
+        # results, so this buffer stays small
+        by_repo: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            repo_name = item.get("repository", {}).get("full_name", "")
+            by_repo.setdefault(repo_name, []).append(item)
+
+        if repos is not None:
+            listed = [repo.get("full_name", "") for repo in repos]
+            by_repo = {name: by_repo[name] for name in by_repo if name in listed}
+            if not truncated:
+                # Listed repositories without results are complete as well
+                for repo_name in listed:
+                    if not self._should_exclude_repo(repo_name):
+                        self.synced_repos.setdefault(repo_name, None)
+
+        if self.journal is not None:
+            for repo_name in self.journal.completed_repos:
+                by_repo[repo_name] = self._replay_journaled(repo_name)
+
+        for repo_name in sorted(by_repo):
+            print(f"    {repo_name}: found {len(by_repo[repo_name])} commits")
+            for item in by_repo.pop(repo_name):
+                yield item, repo_name, self._commit_date(item)
+
+    def fetch_commits_git(
+        self,
+        api_client: GitHubAPIClient,
+        username: str,
+        mirror: GitMirror,
+        repos: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Read commits from local git mirrors instead of the commits API.
+
+        Only the repository listing goes through the API; files and stats come
+        from one `git log` per mirror, so no per-commit requests are made.
+        """
+        if repos is None:
+            repos = self.list_repos(api_client, username)
+
+        filtered_repos = [
+            repo.get("full_name", "")
+            for repo in repos
+            if not self._should_exclude_repo(repo.get("full_name", ""))
+        ]
+        print(f"  Processing {len(filtered_repos)} repositories (after filters)")
+
+        return self._track_repos(self._stage_mirror_records(mirror, filtered_repos))
+
+    def _stage_mirror_records(
+        self, mirror: GitMirror, repo_names: List[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Rank mirror records, then checkpoint and stage the ones kept."""
+        for commit, _, _ in self._rank_candidates(self._discover_mirrors(mirror, repo_names)):
+            if self.journal is not None:
+                self.journal.record_commit(commit)
+            if self.dedup_index is not None:
+                self.dedup_index.stage(commit)
+            yield commit
+
+    def _discover_mirrors(self, mirror: GitMirror, repo_names: List[str]) -> Iterator[Candidate]:
+        """Yield new commit records of each repository's mirror as candidates."""
+        seen_commits = set()
+
+        def read_commits(repo_name: str) -> Optional[List[Dict[str, Any]]]:
+            journaled = self._replay_journaled(repo_name)
+            if journaled is not None:
+                return journaled
+            return self._read_mirror(mirror, repo_name)
+
+        # Update mirrors concurrently, a bounded number of repositories ahead
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for repo_name, repo_commits in self._bounded_map(executor, read_commits, repo_names):
+                if repo_commits is None:
+                    # Retry the repository's window next run
+                    self.failed_repos.add(repo_name)
                     continue
 
-                # Get detailed commit info to include files
-                detailed_commit = api_client.get_commit_details(
-                    repo_full_name, commit_sha
+                self.synced_repos.setdefault(repo_name, None)
+
+                if not repo_commits:
+                    if self.journal is not None:
+                        self.journal.record_repo(repo_name)
+                    continue
+
+                print(f"    {repo_name}: found {len(repo_commits)} commits")
+
+                for commit in repo_commits:
+                    if commit["sha"] in seen_commits:
+                        continue
+
+                    seen_commits.add(commit["sha"])
+
+                    if not self._matches_author(commit):
+                        continue
+
+                    if self._already_published(commit, seen_commits):
+                        continue
+
+                    yield commit, repo_name, self._commit_date(commit)
+
+    def _read_mirror(self, mirror: GitMirror, repo_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Update a repository's mirror and read its commits in the window.
+
+        Returns:
+            The commits, or None if git failed or is not installed
+        """
+        try:
+            mirror.update(repo_name)
+            return mirror.read_commits(repo_name, self._repo_since(repo_name))
+        except subprocess.CalledProcessError as e:
+            print(f"⚠ Failed to read git mirror of {repo_name}: {(e.stderr or '').strip()}")
+            return None
+        except OSError as e:
+            print(f"⚠ Failed to run git for {repo_name}: {e}")
+            return None
+
+    def api_author_filter(self) -> Optional[str]:
+        """Get the identity to send as the API's `author` parameter.
+
+        The commits API accepts a single login or email, so the filter is only
+        pushed down when exactly one identity is configured; otherwise commits
+        are filtered locally before their details are fetched.
+        """
+        identities = self.author_usernames | self.author_emails
+        if len(identities) == 1:
+            return next(iter(identities))
+        return None
+
+    def _matches_author(self, commit: Dict[str, Any]) -> bool:
+        """Check a commit against the author filters, counting foreign ones.
+
+        Accepts list-level API commits, search results, event payload commits
+        and processed records. Commits whose payload carries no login (events,
+        git mirrors) pass when only usernames are configured, since there is
+        nothing to compare them against.
+        """
+        if not self.author_usernames and not self.author_emails:
+            return True
+
+        commit_info = commit.get("commit", {})
+        logins = {
+            (user or {}).get("login", "").lower()
+            for user in (commit.get("author"), commit.get("committer"))
+            if isinstance(user, dict) and user.get("login")
+        }
+        emails = {
+            (person or {}).get("email", "").lower()
+            for person in (
+                commit_info.get("author"),
+                commit_info.get("committer"),
+                commit.get("author"),
+            )
+            if isinstance(person, dict) and person.get("email")
+        }
+        if commit.get("author_email"):
+            emails.add(commit["author_email"].lower())
+
+        if logins & self.author_usernames or emails & self.author_emails:
+            return True
+
+        if not logins and not self.author_emails:
+            return True
+
+        self.skipped_foreign += 1
+        return False
+
+    def _replay_journaled(self, repo_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the records of a repository completed before the interruption.
+
+        A resumed run replays them from the checkpoint journal instead of
+        discovering the repository again.
+
+        Returns:
+            The journaled records, or None if the repository was not completed
+        """
+        if self.journal is None or repo_name not in self.journal.completed_repos:
+            return None
+        return self.journal.records_for(repo_name)
+
+    def _repo_since(self, repo_name: str) -> datetime:
+        """Get the start of the fetch window for a repository."""
+        if self.repo_cursors is not None:
+            cursor_since = self.repo_cursors.get_since(repo_name)
+            if cursor_since is not None:
+                return cursor_since
+        return self.since
+
+    def _fetch_repo_commits(
+        self, api_client: GitHubAPIClient, repo_name: str, since: datetime
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch a repository's commit list, or None if the fetch failed."""
+        try:
+            return api_client.get_repo_commits(
+                repo_name, since, author=self.api_author_filter()
+            )
+        except GitHubAPIError as e:
+            print(f"⚠ {e}")
+            return None
+
+    def update_cursors(self, repo_cursors: RepoCursorStore) -> None:
+        """Advance cursors of completed repositories and flag failed ones.
+
+        A failed repository whose commit list was read resumes at its oldest
+        commit that failed, so commits processed before it are not fetched
+        (or written) again; one whose list could not be read keeps its window.
+        """
+        for repo_name, newest_commit in self.synced_repos.items():
+            repo_cursors.mark_synced(repo_name, self.started_at, newest_commit)
+
+        given_up = []
+        for repo_name in self.failed_repos:
+            since = self._repo_since(repo_name)
+            if repo_name in self.failed_since:
+                since = max(since, self.failed_since[repo_name])
+            if repo_cursors.mark_failed(repo_name, since, self.started_at):
+                given_up.append(repo_name)
+
+        if given_up:
+            print(
+                f"  ⚠ Gave up the missed window of {len(given_up)} repositories after "
+                f"{repo_cursors.max_failures} failed runs: {', '.join(sorted(given_up))}"
+            )
+
+    def _bounded_map(
+        self,
+        executor: ThreadPoolExecutor,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+    ) -> Iterator[Tuple[Any, Any]]:
+        """Like executor.map, but pulls items lazily and yields (item, result).
+
+        At most twice the concurrency is in flight, so a long input stream
+        never has all of its results held in memory at once.
+        """
+        window: deque = deque()
+        for item in items:
+            window.append((item, executor.submit(fn, item)))
+            if len(window) >= self.concurrency * 2:
+                item, future = window.popleft()
+                yield item, future.result()
+
+        while window:
+            item, future = window.popleft()
+            yield item, future.result()
+
+    @staticmethod
+    def _commit_date(commit: Dict[str, Any]) -> datetime:
+        """Parse the author date of a list-level commit, search result or record."""
+        commit_date_str = commit.get("commit", {}).get("author", {}).get("date", "")
+        if not commit_date_str:
+            commit_date_str = commit.get("date", "")
+        try:
+            return datetime.fromisoformat(commit_date_str.replace("Z", "+00:00"))
+        except ValueError:
+            return datetime.now(timezone.utc)
+
+    def _filter_candidates(
+        self, candidates: Iterable[Candidate], per_repo_window: bool = False
+    ) -> Iterator[Candidate]:
+        """Drop candidates from excluded repositories, outside the window or by other authors.
+
+        Args:
+            candidates: Candidate stream from a discovery stage
+            per_repo_window: Start each repository's window at its cursor
+        """
+        for commit, repo_name, commit_date in candidates:
+            if self._should_exclude_repo(repo_name):
+                continue
+
+            since = self._repo_since(repo_name) if per_repo_window else self.since
+            if commit_date < since:
+                continue
+
+            if not self._matches_author(commit):
+                continue
+
+            yield commit, repo_name, commit_date
+
+    def _dedupe_candidates(self, candidates: Iterable[Candidate]) -> Iterator[Candidate]:
+        """Drop commits already seen, e.g. in a fork or a second push event.
+
+        With a dedup index, commits published by an earlier run and copies
+        of a commit (same content key, different SHA) are dropped as well,
+        before any detail request is made for them.
+        """
+        seen_commits = set()
+        for candidate in candidates:
+            commit = candidate[0]
+            commit_sha = commit.get("sha", "")
+            if commit_sha in seen_commits:
+                continue
+
+            seen_commits.add(commit_sha)
+            if self._already_published(commit, seen_commits):
+                continue
+
+            yield candidate
+
+    def _rank_candidates(self, candidates: Iterable[Candidate]) -> Iterator[Candidate]:
+        """Keep only the `max_commits` most significant candidates.
+
+        Scores come from list-level data alone (conventional-commit type,
+        message length, merges and the repository's weight), so dropped
+        commits never cost a detail request. Ranking needs the whole window,
+        so candidates are buffered; they are small list-level entries. The
+        kept ones are yielded in discovery order, grouped by repository.
+        """
+        if not self.max_commits:
+            yield from candidates
+            return
+
+        candidates = list(candidates)
+        if len(candidates) > self.max_commits:
+            keep = set(
+                heapq.nlargest(
+                    self.max_commits,
+                    range(len(candidates)),
+                    # Ties go to the newer commit
+                    key=lambda index: (
+                        self._candidate_score(candidates[index]),
+                        candidates[index][2],
+                    ),
                 )
+            )
+            self.skipped_ranked += len(candidates) - len(keep)
+            print(
+                f"  Ranked {len(candidates)} commits, keeping the {len(keep)} most significant"
+            )
+            candidates = [
+                candidate for index, candidate in enumerate(candidates) if index in keep
+            ]
+
+        yield from candidates
+
+    def _candidate_score(self, candidate: Candidate) -> float:
+        """Score a candidate by its list-level data and its repository's weight."""
+        commit, repo_name, _ = candidate
+        weight = self.repo_weights.get(
+            repo_name, self.repo_weights.get(repo_name.split("/")[-1], 0.0)
+        )
+        return listing_significance(commit) + weight
+
+    def _already_published(self, commit: Dict[str, Any], seen_keys: set) -> bool:
+        """Check a commit against the dedup index and this run's content keys."""
+        if self.dedup_index is None:
+            return False
+
+        keys = DedupIndex.keys_for(commit)
+        content_keys = [key for key in keys if key.startswith("content:")]
+        if any(key in seen_keys for key in content_keys) or any(
+            self.dedup_index.contains(key) for key in keys
+        ):
+            self.skipped_published += 1
+            return True
+
+        seen_keys.update(content_keys)
+        return False
+
+    def _fetch_details(
+        self, api_client: GitHubAPIClient, candidates: Iterable[Candidate]
+    ) -> Iterator[Tuple[Candidate, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """Fetch commit details concurrently, yielding them in candidate order.
+
+        Records in the checkpoint journal or the commit store need no detail
+        request and pass through as already-processed records.
+
+        Args:
+            api_client: Client used for the detail requests
+            candidates: (list-level commit, repository full name, commit date) tuples
+
+        Yields:
+            (candidate, detailed commit, stored record) tuples; exactly one of
+            the last two is set unless the detail request failed
+        """
+
+        def lookup(candidate: Candidate) -> Tuple[Optional[Dict], Optional[Dict], str]:
+            commit, repo_name, _ = candidate
+            commit_sha = commit.get("sha", "")
+
+            if self.journal is not None:
+                record = self.journal.get_record(repo_name, commit_sha)
+                if record is not None:
+                    return None, record, "journal"
 
+            if self.commit_store is not None:
+                record = self.commit_store.get(repo_name, commit_sha)
+                if record is not None:
+                    return None, record, "store"
+
+            try:
+                return api_client.get_commit_details(repo_name, commit_sha), None, "fetched"
+            except ResourceUnavailableError as e:
+                print(f"⚠ {e}")
+                return None, None, "unavailable"
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for candidate, (detailed_commit, record, source) in self._bounded_map(
+                executor, lookup, candidates
+            ):
+                if source == "unavailable":
+                    # A retry would fail the same way, so the commit is done
+                    self.skipped_unavailable += 1
+                    continue
+                self.detail_counts[source] += 1
+                yield candidate, detailed_commit, record
+
+    def _normalize(
+        self,
+        details: Iterable[Tuple[Candidate, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+    ) -> Iterator[Dict[str, Any]]:
+        """Turn fetched details into commit records, storing and checkpointing them."""
+        for (commit, repo_name, commit_date), detailed_commit, record in details:
+            if record is None:
                 if not detailed_commit:
-                    # If we can't get details, skip this commit
+                    # If we can't get details, skip this commit and retry the
+                    # repository next run, from this commit if it is the oldest
+                    self.failed_repos.add(repo_name)
+                    failed_since = self.failed_since.get(repo_name)
+                    if failed_since is None or commit_date < failed_since:
+                        self.failed_since[repo_name] = commit_date
                     continue
 
-                # Extract files changed from detailed commit
-                files = []
-                for file_info in detailed_commit.get("files", []):
-                    files.append(
-                        {
-                            "filename": file_info.get("filename", ""),
-                            "status": file_info.get("status", ""),
-                            "additions": file_info.get("additions", 0),
-                            "deletions": file_info.get("deletions", 0),
-                            "changes": file_info.get("changes", 0),
-                        }
-                    )
+                record = self._process_commit(commit, detailed_commit, repo_name, commit_date)
+                if self.commit_store is not None:
+                    self.commit_store.put(record)
 
-                # Create commit record
-                processed_commit = {
-                    "sha": commit_sha,
-                    "message": commit_info.get("message", ""),
-                    "date": commit_date_str,
-                    "author": author_info.get("name", "Unknown"),
-                    "author_email": author_info.get("email", ""),
-                    "repository": repo_full_name,
-                    "url": commit_data.get("html_url", ""),
-                    "files": files,
-                    "stats": {
-                        "additions": detailed_commit.get("stats", {}).get(
-                            "additions", 0
-                        ),
-                        "deletions": detailed_commit.get("stats", {}).get(
-                            "deletions", 0
-                        ),
-                        "total": detailed_commit.get("stats", {}).get("total", 0),
-                    },
-                }
+            if self.journal is not None:
+                self.journal.record_commit(record)
+            if self.dedup_index is not None:
+                self.dedup_index.stage(record)
 
-                commits.append(processed_commit)
-                time.sleep(0.3)  # Rate limiting for detail fetches
+            yield record
 
-        print(f"  Total commits collected: {len(commits)}")
-        return commits
+    def load_example_commits(self, example_data_path: str) -> Iterator[Dict[str, Any]]:
+        """Stream commits from example data file instead of fetching from GitHub.
 
-    def load_example_commits(self, example_data_path: str) -> List[Dict[str, Any]]:
-        """Load commits from example data file instead of fetching from GitHub."""
+        The file may be the example document or any fetch output; excluded
+        repositories are skipped before their commits are decoded.
+        """
         print(f"  Loading example commits from {example_data_path}...")
 
         example_path = Path(example_data_path)
         if not example_path.exists():
             raise FileNotFoundError(f"Example data file not found: {example_data_path}")
 
-        with open(example_path, "r") as f:
-            example_data = json.load(f)
+        # Apply filters just like we do with real commits
+        reader = CommitStreamReader(str(example_path))
+        count = 0
+        repositories = set()
+        for repo_name, commits in reader.iter_repositories(exclude=self._should_exclude_repo):
+            repositories.add(repo_name)
+            for commit in commits:
+                count += 1
+                yield commit
 
-        # Flatten commits from all repositories
-        commits = []
-        repositories = example_data.get("repositories", {})
+        print(f"  Loaded {count} example commits from {len(repositories)} repositories")
 
-        for repo_name, repo_commits in repositories.items():
-            for commit in repo_commits:
-                # Apply filters just like we do with real commits
-                if not self._should_exclude_repo(repo_name):
-                    commits.append(commit)
 
-        print(f"  Loaded {len(commits)} example commits from {len(repositories)} repositories")
-        return commits
+class FetchPlanner:
+    """Estimates the request cost of each discovery strategy and picks one.
+
+    Estimates use only cheap metadata gathered before fetching: how many
+    repositories were pushed since their window started, the window length,
+    the commits the commit store already holds and the remaining rate-limit
+    budget. Commit counts are unknown up front, so they are estimated from a
+    configurable number of commits per active repository; stored commits
+    need no detail request whichever strategy runs.
+    """
+
+    # The events API serves at most 10 pages of events from the last 90 days
+    EVENTS_MAX_PAGES = 10
+    EVENTS_MAX_AGE_DAYS = 90
+
+    # Strategies considered by "auto" discovery, cheapest first on ties
+    STRATEGIES = ["git", "search", "events", "commits"]
+
+    def __init__(self, since: datetime, commits_per_repo: int = 10):
+        self.since = since
+        self.commits_per_repo = max(1, commits_per_repo)
+
+    def estimate(self, active_repos: int, covered_details: int = 0) -> Dict[str, Dict[str, Any]]:
+        """Estimate core and search API requests for every strategy.
+
+        Args:
+            active_repos: Repositories pushed inside their window (after filters)
+            covered_details: Commits in the window whose details are already stored
+
+        Returns:
+            Mapping of strategy name to its estimate and availability
+        """
+        commits = max(active_repos * self.commits_per_repo, covered_details)
+        details = commits - covered_details
+        pages_per_repo = -(-self.commits_per_repo // 100)
+        window_days = (datetime.now(timezone.utc) - self.since).days
 
-    def group_by_repository(
-        self, commits: List[Dict[str, Any]]
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """Group commits by repository."""
-        grouped = {}
-        for commit in commits:
-            repo = commit.get("repository", "")
-            if repo not in grouped:
-                grouped[repo] = []
-            grouped[repo].append(commit)
+        return {
+            "commits": {
+                "requests": active_repos * pages_per_repo + details,
+                "search_requests": 0,
+                "available": True,
+                "note": "per-repo commit lists + details",
+            },
+            "events": {
+                "requests": min(self.EVENTS_MAX_PAGES, max(1, -(-commits // 100))) + details,
+                "search_requests": 0,
+                "available": window_days <= self.EVENTS_MAX_AGE_DAYS,
+                "note": f"events cover only the last {self.EVENTS_MAX_AGE_DAYS} days",
+            },
+            "search": {
+                "requests": details,
+                "search_requests": max(1, -(-commits // 100)),
+                "available": commits <= GitHubAPIClient.SEARCH_RESULT_LIMIT,
+                "note": f"search returns at most {GitHubAPIClient.SEARCH_RESULT_LIMIT} commits",
+            },
+            "git": {
+                "requests": 0,
+                "search_requests": 0,
+                "available": shutil.which("git") is not None,
+                "note": "clones/fetches mirrors, needs git",
+            },
+        }
 
-        return grouped
+    def choose(
+        self,
+        estimates: Dict[str, Dict[str, Any]],
+        remaining: Optional[int],
+        allowed: List[str],
+    ) -> str:
+        """Pick the cheapest allowed strategy that fits the remaining budget.
+
+        Falls back to the cheapest allowed strategy (which will then wait for
+        the rate limit to reset) when none fits.
+        """
+        candidates = [
+            name
+            for name in self.STRATEGIES
+            if name in allowed and estimates[name]["available"]
+        ]
+        if not candidates:
+            return "commits"
+
+        candidates.sort(
+            key=lambda name: (estimates[name]["requests"], estimates[name]["search_requests"])
+        )
+        for name in candidates:
+            if remaining is None or estimates[name]["requests"] <= remaining:
+                return name
+
+        print("⚠ No strategy fits the remaining budget; requests will wait for reset")
+        return candidates[0]
+
+    def print_plan(
+        self,
+        estimates: Dict[str, Dict[str, Any]],
+        remaining: Optional[int],
+        chosen: str,
+        allowed: List[str],
+    ) -> None:
+        """Print the estimate of every strategy and the chosen plan."""
+        budget = "unknown" if remaining is None else str(remaining)
+        print(f"  Fetch plan (remaining budget: {budget} requests)")
+        for name in self.STRATEGIES:
+            estimate = estimates[name]
+            marker = "→" if name == chosen else " "
+            status = ""
+            if not estimate["available"]:
+                status = " (unavailable)"
+            elif name not in allowed:
+                status = " (not enabled)"
+            search = (
+                f" + {estimate['search_requests']} search"
+                if estimate["search_requests"]
+                else ""
+            )
+            print(
+                f"   {marker} {name:<8} ~{estimate['requests']} requests{search}{status} - {estimate['note']}"
+            )
 
 
 def main():
@@ -674,14 +2646,26 @@ def main():
     )
     parser.add_argument(
         "--output",
-        default="data/commits.json",
-        help="Output file path (default: data/commits.json)",
+        help=(
+            "Output file path, NDJSON or JSON per --format "
+            "(default: data/commits.ndjson, .ndjson.gz or data/commits.json)"
+        ),
     )
     parser.add_argument(
         "--example",
         action="store_true",
         help="Use example commit data instead of fetching from GitHub",
     )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help="Output format, overriding fetch.output_format (default: from config)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Close the fetch window even below automation.min_commits",
+    )
 
     args = parser.parse_args()
 
@@ -689,6 +2673,7 @@ def main():
     print("GitHub Commits Fetcher")
     print("=" * 60)
 
+    sink = None
     try:
         # Load configuration
         print("\n[1/5] Loading configuration...")
@@ -702,12 +2687,34 @@ def main():
 
         print(f"  GitHub user: {username}")
 
+        # The default output is named after the format it is written in
+        output_format = args.format or config.get_output_format()
+        output_path = args.output or default_output_path(output_format, config.get_output_gzip())
+
         # Determine time range
         print("\n[2/5] Determining time range...")
         tracker = TimestampTracker()
         last_run = tracker.read()
+        repo_cursors = RepoCursorStore(max_failures=config.get_failed_repo_retries())
+        repo_cursors.read()
+
+        # Check if example mode is enabled (CLI flag overrides config)
+        example_mode = args.example or config.get_example_mode()
 
-        if last_run:
+        # Checkpoint real fetches so a killed run can resume where it stopped
+        journal = None
+        resumed = False
+        if not example_mode and not args.dry_run:
+            journal = FetchJournal(str(Path(output_path).with_suffix(".journal")))
+            resumed = journal.load()
+
+        if resumed:
+            since = journal.since
+            print(
+                f"  Resuming interrupted run from {journal.file_path} "
+                f"({len(journal.records)} commits, {len(journal.completed_repos)} repositories done)"
+            )
+        elif last_run:
             since = last_run
             print(f"  Last run: {last_run.isoformat()}")
         else:
@@ -717,9 +2724,19 @@ def main():
 
         print(f"  Fetching commits since: {since.isoformat()}")
 
-        # Check if example mode is enabled (CLI flag overrides config)
-        example_mode = args.example or config.get_example_mode()
+        # Records stream from the processor straight into the sink, which
+        # groups them by repository: the output file, or memory for a preview
+        if args.dry_run:
+            sink = CommitCollector(since=since)
+        else:
+            sink = CommitStreamWriter(
+                path=output_path,
+                since=since,
+                output_format=output_format,
+                compress=config.get_output_gzip(),
+            )
 
+        dedup_index = None
         if example_mode:
             print("\n⚡ EXAMPLE MODE ENABLED - Using mock data instead of GitHub API")
             print("\n[3/5] Loading example commits...")
@@ -731,61 +2748,234 @@ def main():
                 repo_filters=config.get_repo_filters(),
                 exclude_repos=config.get_exclude_repos(),
             )
-            commits = processor.load_example_commits(config.get_example_data_path())
-            print(f"  Found {len(commits)} commits")
+            for commit in processor.load_example_commits(config.get_example_data_path()):
+                sink.write(commit)
+            print(f"  Found {sink.total_commits} commits")
         else:
             # Fetch commits from GitHub
             print("\n[3/5] Fetching commits from GitHub...")
-            api_client = GitHubAPIClient(token=config.github_token)
+            concurrency = config.get_fetch_concurrency()
+            cache = None
+            if config.get_http_cache_enabled():
+                cache = ResponseCache(
+                    path=str(Path(config.get_cache_dir()) / "http_cache.sqlite"),
+                    max_bytes=config.get_http_cache_max_mb() * 1024 * 1024,
+                )
+            retry_config = config.get_retry_policy()
+            api_client = GitHubAPIClient(
+                token=config.github_token,
+                pool_size=concurrency,
+                scheduler=RateLimitScheduler(
+                    reserve=config.get_rate_limit_reserve(),
+                    hourly_limit=5000 if config.github_token else 60,
+                ),
+                cache=cache,
+                retry_policy=RetryPolicy(
+                    max_retries=retry_config["max_retries"],
+                    backoff_base=retry_config["backoff_base"],
+                ),
+                circuit_breaker=CircuitBreaker(
+                    threshold=retry_config["circuit_breaker_threshold"]
+                ),
+                detail_page_concurrency=config.get_detail_page_concurrency(),
+                base_url=config.get_api_base_url(),
+            )
 
             # Validate token before proceeding
             if not api_client.validate_token():
                 print("✗ Cannot proceed with invalid GitHub token")
                 sys.exit(1)
 
-            # Process commits using Commits API (more reliable than Events API)
+            commit_store = None
+            if config.get_commit_store_enabled():
+                commit_store = CommitStore(
+                    path=str(Path(config.get_cache_dir()) / "commits.sqlite")
+                )
+
+            if config.get_dedup_index_enabled():
+                dedup_index = DedupIndex(path=str(Path(config.get_cache_dir()) / "dedup.sqlite"))
+
             print("\n[4/5] Processing commits...")
             processor = CommitProcessor(
                 since=since,
                 repo_filters=config.get_repo_filters(),
                 exclude_repos=config.get_exclude_repos(),
+                concurrency=concurrency,
+                commit_store=commit_store,
+                # Per-repository cursors only continue incremental runs; a fresh
+                # lookback (no .last_build) covers the whole window
+                repo_cursors=repo_cursors if last_run else None,
+                author_usernames=config.get_author_usernames(),
+                author_emails=config.get_author_emails(),
+                journal=journal,
+                dedup_index=dedup_index,
+                max_commits=config.get_max_commits(),
+                repo_weights=config.get_repo_weights(),
             )
-            commits = processor.fetch_commits_direct(api_client, username)
-            print(f"  Found {len(commits)} commits")
+            if journal is not None:
+                journal.start(since, processor.started_at)
+            print(f"  Concurrency: {concurrency} parallel requests")
+
+            discovery = config.get_discovery_mode()
+            repos = None
+            estimate = None
+            if discovery == "auto":
+                # Plan from cheap metadata: the window's active repos and the budget
+                repos = processor.list_repos(api_client, username)
+                active_repos = processor.active_repo_names(repos)
+                covered = processor.count_covered_details(active_repos)
+                if covered:
+                    print(f"  {covered} commits in the window are already in the commit store")
+                remaining = (
+                    api_client.get_rate_limits().get("core", {}).get("remaining")
+                )
+                planner = FetchPlanner(
+                    since=since, commits_per_repo=config.get_planner_commits_per_repo()
+                )
+                estimates = planner.estimate(len(active_repos), covered_details=covered)
+                allowed = config.get_auto_strategies()
+                discovery = planner.choose(estimates, remaining, allowed)
+                planner.print_plan(estimates, remaining, discovery, allowed)
+                estimate = estimates[discovery]
+                requests_before = (
+                    api_client.scheduler.requests_made,
+                    api_client.search_scheduler.requests_made,
+                )
 
-        # Group by repository
-        grouped_commits = processor.group_by_repository(commits)
-        print(f"  Commits across {len(grouped_commits)} repositories")
+            print(f"  Discovery: {discovery}")
+            if discovery == "events":
+                events = api_client.get_user_events(username)
+                commits = processor.extract_commits(events, api_client)
+            elif discovery == "search":
+                # The listing made for planning is reused, not thrown away
+                commits = processor.fetch_commits_search(api_client, username, repos=repos)
+            elif discovery == "git":
+                mirror = GitMirror(
+                    cache_dir=str(Path(config.get_cache_dir()) / "mirrors"),
+                    url_template=config.get_git_mirror_url(),
+                    token=config.github_token,
+                )
+                commits = processor.fetch_commits_git(
+                    api_client, username, mirror, repos=repos
+                )
+            elif discovery == "commits":
+                # Commits API (more reliable than Events API)
+                commits = processor.fetch_commits_direct(api_client, username, repos=repos)
+            else:
+                raise ValueError(f"Unsupported discovery mode: {discovery}")
+            for commit in commits:
+                sink.write(commit)
+            print(f"  Found {sink.total_commits} commits")
+            details = processor.detail_counts
+            print(
+                f"  Details: {details['fetched']} fetched, {details['store']} from commit store, "
+                f"{details['journal']} from checkpoint journal"
+            )
+            detail_bytes = api_client.detail_bytes
+            if detail_bytes["received"]:
+                print(
+                    f"  Detail payloads: {detail_bytes['received'] / 1024:.0f} KB received, "
+                    f"{detail_bytes['kept'] / 1024:.0f} KB kept without patch text "
+                    f"(largest {detail_bytes['largest_received'] / 1024:.0f} KB "
+                    f"→ {detail_bytes['largest_kept'] / 1024:.0f} KB)"
+                )
+            peak_rss = peak_rss_mb()
+            if peak_rss is not None:
+                print(f"  Peak RSS: {peak_rss:.1f} MB")
+            if processor.api_author_filter() and discovery == "commits":
+                print(f"  Author filter sent to API: {processor.api_author_filter()}")
+            if processor.skipped_published:
+                print(
+                    f"  Skipped {processor.skipped_published} commits already published "
+                    f"(dedup index)"
+                )
+            if processor.skipped_unavailable:
+                print(
+                    f"  Skipped {processor.skipped_unavailable} commits whose details "
+                    f"are gone or inaccessible"
+                )
+            if processor.skipped_foreign:
+                print(
+                    f"  Skipped {processor.skipped_foreign} commits by other authors "
+                    f"({processor.skipped_foreign} detail requests saved)"
+                )
+            if processor.skipped_ranked:
+                print(
+                    f"  Skipped {processor.skipped_ranked} less significant commits "
+                    f"beyond fetch.max_commits"
+                )
+            print(f"  API requests made: {api_client.scheduler.requests_made}")
+            if estimate is not None:
+                actual = api_client.scheduler.requests_made - requests_before[0]
+                actual_search = (
+                    api_client.search_scheduler.requests_made - requests_before[1]
+                )
+                print(
+                    f"  Plan: {actual} requests (estimated {estimate['requests']}), "
+                    f"{actual_search} search (estimated {estimate['search_requests']})"
+                )
+            if cache is not None:
+                print(f"  HTTP cache: {cache.hits} hits, {cache.misses} misses")
+                cache.close()
+            if commit_store is not None:
+                print(
+                    f"  Commit store: {commit_store.hits} hits, {commit_store.misses} misses"
+                )
+                evicted = commit_store.evict_older_than(
+                    config.get_commit_store_max_age_days()
+                )
+                if evicted:
+                    commit_store.compact()
+                    print(f"  Evicted {evicted} old commits from commit store")
+                commit_store.close()
 
-        for repo, repo_commits in grouped_commits.items():
-            print(f"    - {repo}: {len(repo_commits)} commits")
+        print(f"  Commits across {len(sink.repo_counts)} repositories")
+
+        for repo, count in sink.repo_counts.items():
+            print(f"    - {repo}: {count} commits")
 
         # Output results
         print("\n[5/5] Writing output...")
-        output_data = {
-            "fetched_at": datetime.now(timezone.utc).isoformat(),
-            "since": since.isoformat(),
-            "total_commits": len(commits),
-            "repositories": grouped_commits,
-        }
-
         if args.dry_run:
             print("\n⚠ DRY RUN MODE - No files will be written")
             print("\nPreview of output:")
-            print(json.dumps(output_data, indent=2))
+            print(json.dumps(sink.close(fetched_at=processor.started_at), indent=2))
         else:
-            # Create output directory if needed
-            output_path = Path(args.output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # The streamed file is moved into place only now that it is complete;
+            # the window ends when the run started, like .last_build and the cursors
+            sink.close(fetched_at=processor.started_at)
+
+            encoding = f"{output_format}, gzip" if sink.compress else output_format
+            print(f"✓ Written to {sink.path} ({encoding})")
+
+            # Too few commits for a post: leave the window open so they are
+            # fetched again, together with newer ones, on the next run
+            min_commits = config.get_min_commits()
+            window_open = 0 < sink.total_commits < min_commits and not args.force
+            if window_open:
+                print(
+                    f"⚠ {sink.total_commits} commits is below automation.min_commits "
+                    f"({min_commits}); keeping the window open for the next run"
+                )
+            else:
+                # Update timestamp and per-repository cursors to the same instant:
+                # the start of the run (or of the interrupted run it resumed), so
+                # commits pushed while it ran fall into the next window
+                tracker.write(processor.started_at)
+                if not example_mode:
+                    processor.update_cursors(repo_cursors)
+                    repo_cursors.write()
 
-            # Write JSON output
-            with open(output_path, "w") as f:
-                json.dump(output_data, f, indent=2)
+            if journal is not None:
+                journal.remove()
 
-            print(f"✓ Written to {output_path}")
+            # Only published commits are indexed, so a failed run hides nothing
+            if dedup_index is not None and not window_open:
+                added = dedup_index.commit()
+                print(f"✓ Added {added} keys to the dedup index")
 
-            # Update timestamp
-            tracker.write()
+        if dedup_index is not None:
+            dedup_index.close()
 
         print("\n" + "=" * 60)
         print("✓ Complete!")
@@ -796,6 +2986,9 @@ def main():
         import traceback
 
         traceback.print_exc()
+        # Drop the partial output; the journal keeps what a rerun needs
+        if isinstance(sink, CommitStreamWriter):
+            sink.abort()
         sys.exit(1)
 
 
@@ -5,39 +5,83 @@ Generates Jekyll blog posts from commit data using LLM API.
 """
 
 import argparse
-import json
 import os
 import re
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 from dotenv import load_dotenv
 import dspy
 
+from roboblog.activity import ActivityAggregator
+from roboblog.commit_clusters import CommitClusterer
+from roboblog.commit_stream import CommitStreamReader, find_commits_file
+from roboblog.token_budget import estimate_cost, estimate_tokens
+
+# How commits are presented to the LLM
+PROMPT_MODES = ["aggregate", "commits"]
+
+# Longest subject listed for a run of similar commits
+SUBJECT_CHARS = 80
+
 
 class CommitDataLoader:
-    """Loads and processes commit data from JSON file."""
+    """Loads and processes commit data from the fetcher's output file."""
 
-    def __init__(self, data_path: str = "data/commits.json"):
-        self.data_path = Path(data_path)
+    def __init__(self, data_path: Optional[str] = None):
+        self.data_path = Path(data_path or find_commits_file())
 
     def load(self) -> Dict[str, Any]:
-        """Load commit data from JSON file."""
+        """Load commit data from NDJSON (optionally gzipped) or legacy JSON."""
         if not self.data_path.exists():
             raise FileNotFoundError(f"Commit data not found: {self.data_path}")
 
-        with open(self.data_path, "r") as f:
-            data = json.load(f)
-            print(f"✓ Loaded commit data from {self.data_path}")
-            return data
+        data = CommitStreamReader(str(self.data_path)).load()
+        print(f"✓ Loaded commit data from {self.data_path}")
+        return data
+
+    def format_for_prompt(
+        self,
+        data: Dict[str, Any],
+        mode: str = "commits",
+        detail_commits: int = 20,
+        body_chars: Optional[int] = None,
+        collapse_files: bool = False,
+        summarized_repos: Optional[Set[str]] = None,
+        similarity_threshold: float = 0.0,
+        aggregates: Optional[Dict[str, Any]] = None,
+        clusters: Optional[Dict[str, List[List[Dict[str, Any]]]]] = None,
+    ) -> str:
+        """Format commit data for LLM prompt.
+
+        Args:
+            data: Commit data in the legacy document shape
+            mode: "commits" lists every commit; "aggregate" renders activity
+                tables plus the `detail_commits` most significant commits, and
+                lists every commit when they all fit within `detail_commits`
+            detail_commits: Commits kept with full detail in aggregate mode
+            body_chars: Truncate message bodies to this many characters
+                (0 keeps only the subject line)
+            collapse_files: List changed directories instead of files
+            summarized_repos: Repositories reduced to one summary line
+            similarity_threshold: List runs of near-duplicate commits as one
+                entry when they are at least this similar (0 lists every commit);
+                in aggregate mode a significant commit from such a run is listed
+                as the whole run
+            aggregates: Activity aggregates of `data` computed by aggregate(),
+                so repeated renders do not recompute them
+            clusters: Runs of near-duplicate commits per repository computed by
+                cluster(), likewise
+        """
+        if mode not in PROMPT_MODES:
+            raise ValueError(f"Unsupported prompt mode: {mode}")
 
-    def format_for_prompt(self, data: Dict[str, Any]) -> str:
-        """Format commit data for LLM prompt."""
         repositories = data.get("repositories", {})
         total_commits = data.get("total_commits", 0)
+        summarized_repos = summarized_repos or set()
 
         if total_commits == 0:
             return "No commits found in the specified time period."
@@ -49,39 +93,286 @@ class CommitDataLoader:
         )
         lines.append("")
 
+        if self.uses_aggregates(data, mode, detail_commits):
+            aggregator = ActivityAggregator(top_commits=detail_commits)
+            if aggregates is None:
+                aggregates = self.aggregate(data, detail_commits)
+            lines.extend(aggregator.render(aggregates))
+
+            significant = [
+                commit
+                for commit in aggregates["significant_commits"]
+                if commit.get("repository") not in summarized_repos
+            ]
+            lines.append(
+                f"## Most significant commits ({len(significant)} of {total_commits})"
+            )
+            lines.append("")
+
+            # Runs are found over each repository's full history, so a
+            # significant commit is listed with the near-duplicates around it
+            runs: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+            if similarity_threshold > 0:
+                if clusters is None:
+                    clusters = self.cluster(data, similarity_threshold)
+                for repo_name, groups in clusters.items():
+                    for group in groups:
+                        if len(group) > 1:
+                            for commit in group:
+                                runs[(repo_name, commit.get("sha", ""))] = group
+
+            listed_runs = set()
+            for commit in significant:
+                repo_name = commit.get("repository", "")
+                run = runs.get((repo_name, commit.get("sha", "")))
+                if run is None:
+                    lines.extend(
+                        self._format_commit(
+                            commit,
+                            show_repository=True,
+                            body_chars=body_chars,
+                            collapse_files=collapse_files,
+                        )
+                    )
+                    continue
+
+                # Several significant commits may share a run; list it once
+                run_key = (repo_name, run[0].get("sha", ""))
+                if run_key not in listed_runs:
+                    listed_runs.add(run_key)
+                    lines.extend(self._format_cluster(run, show_repository=True))
+            return "\n".join(lines)
+
         for repo_name, commits in repositories.items():
             lines.append(f"## Repository: {repo_name}")
             lines.append(f"Commits: {len(commits)}")
-            lines.append("")
 
-            for commit in commits:
-                lines.append(f"### Commit: {commit.get('sha', '')[:7]}")
-                lines.append(f"Author: {commit.get('author', 'Unknown')}")
-                lines.append(f"Date: {commit.get('date', 'Unknown')}")
-                lines.append(f"Message: {commit.get('message', '')}")
-
-                # File changes
-                files = commit.get("files", [])
-                if files:
-                    lines.append(f"Files changed ({len(files)}):")
-                    for file_info in files[:10]:  # Limit to 10 files
-                        status = file_info.get("status", "modified")
-                        filename = file_info.get("filename", "")
-                        lines.append(f"  - {status}: {filename}")
-
-                    if len(files) > 10:
-                        lines.append(f"  ... and {len(files) - 10} more files")
-
-                # Stats
-                stats = commit.get("stats", {})
-                lines.append(
-                    f"Stats: +{stats.get('additions', 0)} -{stats.get('deletions', 0)}"
-                )
-                lines.append(f"URL: {commit.get('url', '')}")
+            if repo_name in summarized_repos:
+                additions = sum(commit.get("stats", {}).get("additions", 0) for commit in commits)
+                deletions = sum(commit.get("stats", {}).get("deletions", 0) for commit in commits)
+                subjects = [commit.get("message", "").split("\n", 1)[0] for commit in commits[:3]]
+                lines.append(f"Stats: +{additions} -{deletions} (summarized)")
+                lines.append(f"Including: {'; '.join(subjects)}")
                 lines.append("")
+                continue
+
+            lines.append("")
+            if similarity_threshold > 0:
+                if clusters is None:
+                    clusters = self.cluster(data, similarity_threshold)
+                groups = clusters[repo_name]
+            else:
+                groups = [[commit] for commit in commits]
+            for group in groups:
+                if len(group) > 1:
+                    lines.extend(self._format_cluster(group))
+                    continue
+                lines.extend(
+                    self._format_commit(
+                        group[0], body_chars=body_chars, collapse_files=collapse_files
+                    )
+                )
 
         return "\n".join(lines)
 
+    @staticmethod
+    def cluster(data: Dict[str, Any], threshold: float) -> Dict[str, List[List[Dict[str, Any]]]]:
+        """Group each repository's consecutive near-duplicate commits."""
+        clusterer = CommitClusterer(threshold=threshold)
+        return {
+            repo_name: clusterer.cluster(commits)
+            for repo_name, commits in data.get("repositories", {}).items()
+        }
+
+    @staticmethod
+    def uses_aggregates(data: Dict[str, Any], mode: str, detail_commits: int) -> bool:
+        """Check whether a prompt mode renders activity aggregates for this data."""
+        return mode == "aggregate" and data.get("total_commits", 0) > detail_commits
+
+    @staticmethod
+    def aggregate(data: Dict[str, Any], detail_commits: int) -> Dict[str, Any]:
+        """Compute the activity aggregates of commit data."""
+        return ActivityAggregator(top_commits=detail_commits).aggregate(
+            commit for commits in data.get("repositories", {}).values() for commit in commits
+        )
+
+    def format_within_budget(
+        self,
+        data: Dict[str, Any],
+        token_budget: int,
+        mode: str = "commits",
+        detail_commits: int = 20,
+        similarity_threshold: float = 0.0,
+    ) -> Tuple[str, int, List[str]]:
+        """Format commit data, compacting it until it fits an input token budget.
+
+        Compaction goes from least to most lossy: message bodies are cut to
+        200 characters, then to their subject line; file lists collapse to
+        directories; then repositories are summarized, lowest churn first.
+        If even that does not fit, the text is truncated.
+
+        Returns:
+            The prompt text, its estimated tokens and the compaction steps taken
+        """
+        options: Dict[str, Any] = {
+            "body_chars": None,
+            "collapse_files": False,
+            "summarized_repos": set(),
+        }
+        # Compaction only changes the rendering, so aggregate and cluster once
+        # for every render
+        if self.uses_aggregates(data, mode, detail_commits):
+            options["aggregates"] = self.aggregate(data, detail_commits)
+        if similarity_threshold > 0:
+            options["clusters"] = self.cluster(data, similarity_threshold)
+
+        def render() -> Tuple[str, int]:
+            text = self.format_for_prompt(
+                data,
+                mode=mode,
+                detail_commits=detail_commits,
+                similarity_threshold=similarity_threshold,
+                **options,
+            )
+            return text, estimate_tokens(text)
+
+        summary, tokens = render()
+        steps: List[str] = []
+        if token_budget <= 0 or tokens <= token_budget:
+            return summary, tokens, steps
+
+        for option, value, step in (
+            ("body_chars", 200, "truncated long message bodies"),
+            ("body_chars", 0, "kept message subjects only"),
+            ("collapse_files", True, "collapsed file lists to directories"),
+        ):
+            options[option] = value
+            summary, tokens = render()
+            steps.append(step)
+            if tokens <= token_budget:
+                return summary, tokens, steps
+
+        def churn(commits: List[Dict[str, Any]]) -> int:
+            return sum(commit.get("stats", {}).get("total", 0) for commit in commits)
+
+        repositories = data.get("repositories", {})
+        by_churn = sorted(repositories, key=lambda name: churn(repositories[name]))
+        renders: Dict[int, Tuple[str, int]] = {}
+
+        def summarize(count: int) -> Tuple[str, int]:
+            if count not in renders:
+                options["summarized_repos"] = set(by_churn[:count])
+                renders[count] = render()
+            return renders[count]
+
+        # Fewest repositories to summarize: double until it fits, then bisect
+        low, high = 0, min(1, len(by_churn))
+        while high < len(by_churn) and summarize(high)[1] > token_budget:
+            low, high = high, min(len(by_churn), high * 2)
+        if summarize(high)[1] <= token_budget:
+            while high - low > 1:
+                middle = (low + high) // 2
+                if summarize(middle)[1] <= token_budget:
+                    high = middle
+                else:
+                    low = middle
+        summary, tokens = summarize(high)
+        steps.append(f"summarized {high} low-churn repositories")
+
+        if tokens > token_budget:
+            marker = "\n[... truncated to fit the input token budget]"
+            while tokens > token_budget and summary:
+                summary = summary[: int(len(summary) * token_budget / tokens * 0.95)]
+                tokens = estimate_tokens(summary + marker)
+            summary += marker
+            steps.append("truncated the remaining text")
+
+        return summary, tokens, steps
+
+    def _format_commit(
+        self,
+        commit: Dict[str, Any],
+        show_repository: bool = False,
+        body_chars: Optional[int] = None,
+        collapse_files: bool = False,
+    ) -> List[str]:
+        """Format one commit's details."""
+        message = commit.get("message", "")
+        if body_chars is not None:
+            subject, _, body = message.partition("\n")
+            body = body.strip()
+            if body_chars and body:
+                body = body[:body_chars] + ("..." if len(body) > body_chars else "")
+                message = f"{subject}\n\n{body}"
+            else:
+                message = subject
+
+        lines = []
+        lines.append(f"### Commit: {commit.get('sha', '')[:7]}")
+        if show_repository:
+            lines.append(f"Repository: {commit.get('repository', '')}")
+        lines.append(f"Author: {commit.get('author', 'Unknown')}")
+        lines.append(f"Date: {commit.get('date', 'Unknown')}")
+        lines.append(f"Message: {message}")
+
+        # File changes
+        files = commit.get("files", [])
+        if files and collapse_files:
+            directories: Dict[str, int] = {}
+            for file_info in files:
+                directory = file_info.get("filename", "").rpartition("/")[0] or "/"
+                directories[directory] = directories.get(directory, 0) + 1
+            listed = ", ".join(f"{name} ({count})" for name, count in list(directories.items())[:5])
+            more = f", +{len(directories) - 5} more" if len(directories) > 5 else ""
+            lines.append(f"Files changed ({len(files)}): {listed}{more}")
+        elif files:
+            lines.append(f"Files changed ({len(files)}):")
+            for file_info in files[:10]:  # Limit to 10 files
+                status = file_info.get("status", "modified")
+                filename = file_info.get("filename", "")
+                lines.append(f"  - {status}: {filename}")
+
+            if len(files) > 10:
+                lines.append(f"  ... and {len(files) - 10} more files")
+
+        # Stats
+        stats = commit.get("stats", {})
+        lines.append(
+            f"Stats: +{stats.get('additions', 0)} -{stats.get('deletions', 0)}"
+        )
+        lines.append(f"URL: {commit.get('url', '')}")
+        lines.append("")
+        return lines
+
+    def _format_cluster(
+        self, cluster: List[Dict[str, Any]], show_repository: bool = False
+    ) -> List[str]:
+        """Format a run of near-duplicate commits as one entry."""
+        summary = CommitClusterer.summarize(cluster)
+        shas = ", ".join(sha[:7] for sha in summary["shas"][:5])
+        more_shas = f", +{summary['count'] - 5} more" if summary["count"] > 5 else ""
+        files = summary["files"]
+
+        lines = []
+        lines.append(f"### Similar commits ({summary['count']}): {summary['subject']}")
+        if show_repository:
+            lines.append(f"Repository: {cluster[0].get('repository', '')}")
+        if summary["distinct_subjects"] > 1:
+            # Every wording is kept, most common first, so no change goes unmentioned
+            lines.append("Subjects:")
+            for subject in summary["subjects"]:
+                if len(subject) > SUBJECT_CHARS:
+                    subject = subject[: SUBJECT_CHARS - 3] + "..."
+                lines.append(f"  - {subject}")
+        lines.append(f"Commits: {shas}{more_shas}")
+        lines.append(f"Dates: {summary['first_date']} to {summary['last_date']}")
+        if files:
+            more_files = f", +{len(files) - 5} more" if len(files) > 5 else ""
+            lines.append(f"Files changed ({len(files)}): {', '.join(files[:5])}{more_files}")
+        lines.append(f"Stats: +{summary['additions']} -{summary['deletions']}")
+        lines.append("")
+        return lines
+
 
 class BlogPostSignature(dspy.Signature):
     """Generate a structured blog post from development activity data.
@@ -152,6 +443,30 @@ class LLMConfig:
         """Get temperature for creativity."""
         return self.config.get("llm", {}).get("temperature", 0.7)
 
+    def get_prompt_mode(self) -> str:
+        """Get how commits are presented: "aggregate" tables or every "commits" entry."""
+        return self.config.get("llm", {}).get("prompt_mode", "aggregate")
+
+    def get_similarity_threshold(self) -> float:
+        """Get the similarity at which near-duplicate commits are collapsed (0 = never)."""
+        return float(self.config.get("llm", {}).get("collapse_similar_commits", 0.0))
+
+    def get_input_token_budget(self) -> int:
+        """Get the input token budget for the commit summary (0 for no limit)."""
+        return int(self.config.get("llm", {}).get("input_token_budget", 0))
+
+    def get_input_cost_per_million(self) -> float:
+        """Get the price of a million input tokens in USD, for cost estimates."""
+        return float(self.config.get("llm", {}).get("input_cost_per_million", 0.0))
+
+    def get_min_commits(self) -> int:
+        """Get the minimum commits required to generate a post."""
+        return int(self.config.get("automation", {}).get("min_commits", 0))
+
+    def get_detail_commits(self) -> int:
+        """Get the number of commits described in full detail in aggregate mode."""
+        return int(self.config.get("llm", {}).get("detail_commits", 20))
+
     def get_blog_config(self) -> Dict[str, Any]:
         """Get blog configuration."""
         return self.config.get("blog", {})
@@ -360,14 +675,23 @@ class TimestampUpdater:
     def __init__(self, file_path: str = ".last_build"):
         self.file_path = Path(file_path)
 
-    def update(self) -> None:
-        """Update timestamp to now."""
-        timestamp = datetime.now(timezone.utc)
+    def update(self, timestamp: Optional[datetime] = None) -> None:
+        """Update timestamp, to the end of the fetched window if known (defaults to now)."""
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
         with open(self.file_path, "w") as f:
             f.write(timestamp.isoformat())
         print(f"✓ Updated {self.file_path} with timestamp: {timestamp.isoformat()}")
 
 
+def window_end(commit_data: Dict[str, Any]) -> Optional[datetime]:
+    """Get the end of the window the commit data was fetched for."""
+    try:
+        return datetime.fromisoformat(commit_data.get("fetched_at", ""))
+    except ValueError:
+        return None
+
+
 def generate_no_update_post(blog_config: Dict[str, Any], author: str = "") -> str:
     """Generate a post indicating no updates for the previous day.
 
@@ -426,8 +750,12 @@ def main():
     )
     parser.add_argument(
         "--input",
-        default="data/commits.json",
-        help="Input commits JSON file (default: data/commits.json)",
+        help="Input commits file, NDJSON or JSON (default: newest in data/)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Generate a post even below automation.min_commits",
     )
 
     args = parser.parse_args()
@@ -441,11 +769,18 @@ def main():
         print("\n[1/6] Loading commit data...")
         loader = CommitDataLoader(data_path=args.input)
         commit_data = loader.load()
-        commit_summary = loader.format_for_prompt(commit_data)
 
         # Load LLM configuration first to check if no-update posts are enabled
         llm_config = LLMConfig(config_path=args.config)
         llm_config.load()
+        token_budget = llm_config.get_input_token_budget()
+        commit_summary, summary_tokens, compactions = loader.format_within_budget(
+            commit_data,
+            token_budget=token_budget,
+            mode=llm_config.get_prompt_mode(),
+            detail_commits=llm_config.get_detail_commits(),
+            similarity_threshold=llm_config.get_similarity_threshold(),
+        )
 
         if commit_data.get("total_commits", 0) == 0:
             if llm_config.get_enable_no_update_posts():
@@ -477,7 +812,7 @@ def main():
 
                     # Update timestamp
                     updater = TimestampUpdater()
-                    updater.update()
+                    updater.update(window_end(commit_data))
 
                 print("\n" + "=" * 60)
                 print("✓ Complete! Generated no-update post.")
@@ -489,6 +824,14 @@ def main():
 
         print(f"  Found {commit_data.get('total_commits')} commits")
 
+        min_commits = llm_config.get_min_commits()
+        if commit_data.get("total_commits", 0) < min_commits and not args.force:
+            print(
+                f"⚠ Fewer than automation.min_commits ({min_commits}) commits, "
+                f"skipping post generation (use --force to generate anyway)"
+            )
+            return
+
         # LLM configuration already loaded above
         print("\n[2/6] Using loaded LLM configuration...")
 
@@ -513,6 +856,16 @@ def main():
 
         # Generate structured content
         print("\n[5/6] Generating structured blog post with DSPy...")
+        prompt_tokens = summary_tokens + estimate_tokens(prompt_builder.build_style_instruction())
+        budget_note = f" (budget {token_budget})" if token_budget else ""
+        print(f"  Prompt: ~{prompt_tokens} input tokens{budget_note}")
+        for step in compactions:
+            print(f"  ⚠ Compacted to fit the budget: {step}")
+        cost_per_million = llm_config.get_input_cost_per_million()
+        if cost_per_million:
+            print(
+                f"  Estimated input cost: ${estimate_cost(prompt_tokens, cost_per_million):.4f}"
+            )
         print("  (This may take a moment...)")
         structured_content = prompt_builder.generate(commit_summary)
         print("  ✓ Content generated")
@@ -542,7 +895,7 @@ def main():
 
             # Update timestamp
             updater = TimestampUpdater()
-            updater.update()
+            updater.update(window_end(commit_data))
 
         print("\n" + "=" * 60)
         print("✓ Complete!")
@@ -0,0 +1,555 @@
+"""
+Mock GitHub API Server
+Local stand-in for the GitHub REST API, replaying recorded fixtures or a
+generated dataset, with injectable latency, errors and rate limits.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+
+# Query parameters that never change a GitHub response
+IGNORED_PARAMS = {"access_token"}
+
+
+class MockDataset:
+    """Deterministic set of repositories and commits served by the mock server.
+
+    Commits are spread evenly over the last `days` days, newest first, and
+    every commit detail carries `files_per_commit` files with patch text, so
+    the client's pagination, filtering and patch stripping all get exercised.
+    """
+
+    def __init__(
+        self,
+        owner: str = "mock-user",
+        repos: int = 5,
+        commits_per_repo: int = 20,
+        files_per_commit: int = 3,
+        days: int = 30,
+        seed: int = 0,
+    ):
+        self.owner = owner
+        self.files_per_commit = files_per_commit
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        span = timedelta(days=days)
+
+        self.repos: List[Dict[str, Any]] = []
+        self.commits: Dict[str, List[Dict[str, Any]]] = {}
+        for r in range(repos):
+            full_name = f"{owner}/repo-{r:03d}"
+            commits = []
+            for c in range(commits_per_repo):
+                date = now - span * (c * repos + r) / max(1, repos * commits_per_repo)
+                sha = hashlib.sha1(f"{seed}/{full_name}/{c}".encode()).hexdigest()
+                message = (
+                    f"{rng.choice(['feat', 'fix', 'docs', 'refactor'])}: change {c} in repo-{r:03d}"
+                )
+                commits.append(self._list_commit(full_name, sha, message, date))
+            self.commits[full_name] = commits
+            pushed_at = commits[0]["commit"]["author"]["date"] if commits else now.isoformat()
+            self.repos.append(
+                {
+                    "full_name": full_name,
+                    "name": f"repo-{r:03d}",
+                    "private": False,
+                    "fork": False,
+                    "pushed_at": pushed_at,
+                }
+            )
+
+        self.repos.sort(key=lambda repo: repo["pushed_at"], reverse=True)
+        self._by_sha = {
+            (repo_name, commit["sha"]): commit
+            for repo_name, commits in self.commits.items()
+            for commit in commits
+        }
+
+    def _list_commit(
+        self, full_name: str, sha: str, message: str, date: datetime
+    ) -> Dict[str, Any]:
+        """Build a commit as the commits list endpoint returns it."""
+        person = {
+            "name": "Mock User",
+            "email": f"{self.owner}@users.noreply.github.com",
+            "date": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        return {
+            "sha": sha,
+            "html_url": f"https://github.com/{full_name}/commit/{sha}",
+            "author": {"login": self.owner},
+            "committer": {"login": self.owner},
+            "parents": [{"sha": "0" * 40}],
+            "commit": {"message": message, "author": person, "committer": dict(person)},
+        }
+
+    def detail(self, full_name: str, sha: str) -> Optional[Dict[str, Any]]:
+        """Build the commit detail response, with files and stats."""
+        commit = self._by_sha.get((full_name, sha))
+        if commit is None:
+            return None
+
+        files = []
+        for i in range(self.files_per_commit):
+            additions, deletions = 3 + i, 1 + i % 2
+            files.append(
+                {
+                    "filename": f"src/module_{i}.py",
+                    "status": "modified",
+                    "additions": additions,
+                    "deletions": deletions,
+                    "changes": additions + deletions,
+                    "patch": "@@ -1,3 +1,4 @@\n-old line\n+new line\n" * 20,
+                }
+            )
+        additions = sum(f["additions"] for f in files)
+        deletions = sum(f["deletions"] for f in files)
+        return dict(
+            commit,
+            files=files,
+            stats={"additions": additions, "deletions": deletions, "total": additions + deletions},
+        )
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Build push events, one per commit, newest first."""
+        events = []
+        for repo_name, commits in self.commits.items():
+            for commit in commits:
+                events.append(
+                    {
+                        "id": commit["sha"][:10],
+                        "type": "PushEvent",
+                        "created_at": commit["commit"]["author"]["date"],
+                        "repo": {"name": repo_name},
+                        "payload": {
+                            "commits": [
+                                {
+                                    "sha": commit["sha"],
+                                    "message": commit["commit"]["message"],
+                                    "author": {
+                                        "name": commit["commit"]["author"]["name"],
+                                        "email": commit["commit"]["author"]["email"],
+                                    },
+                                }
+                            ]
+                        },
+                    }
+                )
+        events.sort(key=lambda event: event["created_at"], reverse=True)
+        return events
+
+
+class MockGitHubServer:
+    """Threaded HTTP server imitating the GitHub REST API.
+
+    Requests are answered from recorded fixtures when one matches, otherwise
+    from the dataset. In record mode unmatched requests are forwarded to the
+    real API and saved as fixtures for later replays. Every response can be
+    delayed, replaced by an injected error, and carries rate-limit headers
+    from a simulated budget; 304s for matching ETags are free, as on GitHub.
+    """
+
+    def __init__(
+        self,
+        dataset: Optional[MockDataset] = None,
+        fixtures_dir: Optional[str] = None,
+        record: bool = False,
+        upstream: str = "https://api.github.com",
+        latency_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Optional[List[int]] = None,
+        rate_limit: int = 5000,
+        rate_limit_window: int = 3600,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ):
+        self.dataset = dataset
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else None
+        self.record = record
+        self.upstream = upstream.rstrip("/")
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses or [500, 502, 503]
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset_counters()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as the client's API base."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self) -> None:
+        """Reset request counters and restore the full rate-limit budget."""
+        with self.lock:
+            self.request_count = 0
+            self.not_modified_count = 0
+            self.error_count = 0
+            self.used = 0
+            self.reset_at = int(time.time()) + self.rate_limit_window
+
+    def start(self) -> "MockGitHubServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @staticmethod
+    def fixture_key(path: str, params: Dict[str, List[str]]) -> str:
+        """Build the fixture key of a request: its path and sorted query."""
+        query = sorted(
+            (name, value)
+            for name, values in params.items()
+            if name not in IGNORED_PARAMS
+            for value in values
+        )
+        return path + ("?" + urlencode(query) if query else "")
+
+    def _fixture_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return self.fixtures_dir / f"{digest}.json"
+
+    def _load_fixture(self, key: str) -> Optional[Tuple[int, Dict[str, str], Any]]:
+        """Get a recorded (status, headers, body) for a request key."""
+        if self.fixtures_dir is None:
+            return None
+        path = self._fixture_path(key)
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            fixture = json.load(f)
+        return fixture["status"], fixture.get("headers", {}), fixture["body"]
+
+    def _record_fixture(self, key: str) -> Tuple[int, Dict[str, str], Any]:
+        """Forward a request to the real API and save the response as a fixture."""
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        token = os.getenv("GITHUB_TOKEN")
+        if token:
+            headers["Authorization"] = f"token {token}"
+
+        response = requests.get(self.upstream + key, headers=headers, timeout=30)
+        kept_headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() in ("link", "content-type")
+        }
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._fixture_path(key), "w") as f:
+            json.dump(
+                {
+                    "request": key,
+                    "status": response.status_code,
+                    "headers": kept_headers,
+                    "body": body,
+                },
+                f,
+                indent=2,
+            )
+        return response.status_code, kept_headers, body
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """Answer one request."""
+        parsed = urlparse(handler.path)
+        params = parse_qs(parsed.query)
+
+        if self.latency_ms:
+            # Up to 50% jitter around the configured latency
+            time.sleep(self.latency_ms * self.random.uniform(0.5, 1.5) / 1000)
+
+        # Rate-limit status is free on GitHub, so it bypasses the budget
+        counted = parsed.path != "/rate_limit"
+        with self.lock:
+            self.request_count += 1
+            if time.time() >= self.reset_at:
+                self.used = 0
+                self.reset_at = int(time.time()) + self.rate_limit_window
+            exhausted = counted and self.used >= self.rate_limit
+            inject = counted and not exhausted and self.random.random() < self.error_rate
+            error_status = self.random.choice(self.error_statuses) if inject else None
+            if counted and not exhausted:
+                self.used += 1
+
+        if exhausted:
+            self._send(handler, 403, {"message": "API rate limit exceeded"}, {"Retry-After": "1"})
+            return
+
+        if error_status is not None:
+            with self.lock:
+                self.error_count += 1
+            if error_status == 403:
+                body = {"message": "You have exceeded a secondary rate limit."}
+                self._send(handler, 403, body, {"Retry-After": "1"})
+            else:
+                self._send(handler, error_status, {"message": "Injected server error"})
+            return
+
+        key = self.fixture_key(parsed.path, params)
+        fixture = self._load_fixture(key)
+        if fixture is None and self.record and self.fixtures_dir is not None:
+            fixture = self._record_fixture(key)
+        if fixture is None:
+            fixture = self._from_dataset(parsed.path, params, handler)
+
+        status, headers, body = fixture
+        self._send(handler, status, body, headers)
+
+    def _from_dataset(
+        self, path: str, params: Dict[str, List[str]], handler: BaseHTTPRequestHandler
+    ) -> Tuple[int, Dict[str, str], Any]:
+        """Answer a request from the generated dataset."""
+        dataset = self.dataset
+        if dataset is None:
+            return 404, {}, {"message": "Not Found"}
+
+        def param(name: str, default: str = "") -> str:
+            return params.get(name, [default])[0]
+
+        if path == "/user":
+            return 200, {}, {"login": dataset.owner}
+
+        if path == "/rate_limit":
+            with self.lock:
+                remaining = max(0, self.rate_limit - self.used)
+                reset_at = self.reset_at
+            core = {"limit": self.rate_limit, "remaining": remaining, "reset": reset_at}
+            search = {"limit": 30, "remaining": 30, "reset": int(time.time()) + 60}
+            return 200, {}, {"resources": {"core": core, "search": search}, "rate": core}
+
+        if path in ("/user/repos", f"/users/{dataset.owner}/repos"):
+            return self._page(dataset.repos, params, handler)
+
+        if path == f"/users/{dataset.owner}/events":
+            # The events API serves at most 300 events
+            return self._page(dataset.events()[:300], params, handler)
+
+        if path == "/search/commits":
+            since = re.search(r"committer-date:>=(\S+)", param("q"))
+            items = [
+                dict(commit, repository={"full_name": repo_name})
+                for repo_name, commits in dataset.commits.items()
+                for commit in commits
+                if not since or commit["commit"]["committer"]["date"][:10] >= since.group(1)
+            ]
+            items.sort(key=lambda item: item["commit"]["committer"]["date"], reverse=True)
+            status, headers, page_items = self._page(items[:1000], params, handler)
+            return status, headers, {"total_count": len(items), "items": page_items}
+
+        match = re.fullmatch(r"/repos/([^/]+/[^/]+)/commits(?:/([0-9a-f]+))?", path)
+        if match:
+            repo_name, sha = match.groups()
+            if repo_name not in dataset.commits:
+                return 404, {}, {"message": "Not Found"}
+            if sha:
+                detail = dataset.detail(repo_name, sha)
+                if detail is None:
+                    return 422, {}, {"message": "No commit found for SHA"}
+                return 200, {}, detail
+
+            commits = dataset.commits[repo_name]
+            since = param("since")
+            if since:
+                since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
+                commits = [
+                    commit
+                    for commit in commits
+                    if datetime.fromisoformat(
+                        commit["commit"]["author"]["date"].replace("Z", "+00:00")
+                    )
+                    >= since_dt
+                ]
+            author = param("author").lower()
+            if author:
+                commits = [
+                    commit
+                    for commit in commits
+                    if author
+                    in (
+                        commit["author"]["login"].lower(),
+                        commit["commit"]["author"]["email"].lower(),
+                    )
+                ]
+            return self._page(commits, params, handler)
+
+        return 404, {}, {"message": "Not Found"}
+
+    @staticmethod
+    def _page(
+        items: List[Any], params: Dict[str, List[str]], handler: BaseHTTPRequestHandler
+    ) -> Tuple[int, Dict[str, str], List[Any]]:
+        """Slice a list like GitHub pagination, with a Link header."""
+        per_page = min(100, int(params.get("per_page", ["30"])[0]))
+        page = max(1, int(params.get("page", ["1"])[0]))
+        last_page = max(1, -(-len(items) // per_page))
+
+        headers = {}
+        if page < last_page:
+            parsed = urlparse(handler.path)
+            base = f"http://{handler.headers.get('Host', '')}{parsed.path}"
+            query = {name: values[0] for name, values in params.items()}
+            next_url = f"{base}?{urlencode(dict(query, page=page + 1))}"
+            last_url = f"{base}?{urlencode(dict(query, page=last_page))}"
+            headers["Link"] = f'<{next_url}>; rel="next", <{last_url}>; rel="last"'
+
+        return 200, headers, items[(page - 1) * per_page : page * per_page]
+
+    def _send(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        body: Any,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Write a JSON response with ETag and rate-limit headers."""
+        data = json.dumps(body).encode("utf-8")
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        not_modified = status == 200 and handler.headers.get("If-None-Match") == etag
+
+        with self.lock:
+            if not_modified:
+                self.not_modified_count += 1
+                # Conditional hits are not charged against the budget
+                self.used = max(0, self.used - 1)
+            remaining = max(0, self.rate_limit - self.used)
+            reset_at = self.reset_at
+        rate_headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Used": str(self.rate_limit - remaining),
+        }
+
+        if not_modified:
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            for name, value in rate_headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            return
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        if status == 200:
+            handler.send_header("ETag", etag)
+        for name, value in dict(rate_headers, **(headers or {})).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Serve a local mock of the GitHub API for offline fetches and benchmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--fixtures", help="Directory of recorded responses to replay")
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Forward requests without a fixture to api.github.com and save them",
+    )
+    parser.add_argument("--owner", default="mock-user", help="Dataset user (default: mock-user)")
+    parser.add_argument("--repos", type=int, default=5, help="Dataset repositories (default: 5)")
+    parser.add_argument(
+        "--commits-per-repo",
+        type=int,
+        default=20,
+        help="Dataset commits per repository (default: 20)",
+    )
+    parser.add_argument(
+        "--files-per-commit", type=int, default=3, help="Dataset files per commit (default: 3)"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Mean added latency per request"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error"
+    )
+    parser.add_argument(
+        "--error-statuses",
+        default="500,502,503",
+        help="Comma-separated statuses for injected errors; 403 is a secondary rate limit",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=5000,
+        help="Requests per rate-limit window (default: 5000)",
+    )
+
+    args = parser.parse_args()
+
+    if args.record and not args.fixtures:
+        print("✗ --record needs --fixtures to save responses into")
+        sys.exit(1)
+
+    server = MockGitHubServer(
+        dataset=MockDataset(
+            owner=args.owner,
+            repos=args.repos,
+            commits_per_repo=args.commits_per_repo,
+            files_per_commit=args.files_per_commit,
+        ),
+        fixtures_dir=args.fixtures,
+        record=args.record,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        error_statuses=[int(status) for status in args.error_statuses.split(",")],
+        rate_limit=args.rate_limit,
+        port=args.port,
+    )
+    print(f"✓ Mock GitHub API listening on {server.url}")
+    print(f'  Set fetch.api_base_url: "{server.url}" and github.username: "{args.owner}"')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n  Served {server.request_count} requests")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ Runs the complete blog update workflow: fetch commits -> generate post -> build
 """
 
 import argparse
-import json
 import os
 import subprocess
 import sys
@@ -14,6 +13,8 @@ from typing import Optional, Tuple
 
 import yaml
 
+from roboblog.commit_stream import CommitStreamReader, find_commits_file
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -37,11 +38,13 @@ class WorkflowOrchestrator:
         dry_run: bool = False,
         skip_build: bool = False,
         example_mode: bool = False,
+        force: bool = False,
     ):
         self.config_path = Path(config_path)
         self.dry_run = dry_run
         self.skip_build = skip_build
         self.example_mode = example_mode
+        self.force = force
         self.scripts_dir = Path("scripts")
         self.work_dir = Path()
         self.default_build_path = Path("jekyll/_site")
@@ -100,17 +103,16 @@ class WorkflowOrchestrator:
             return False, "", str(e)
 
     def check_commits_found(self, commits_json_path: Path) -> Tuple[bool, int]:
-        """Check if commits were found in the JSON file."""
+        """Check if commits were found, reading only the output's manifest."""
         if not commits_json_path.exists():
             return False, 0
 
         try:
-            with open(commits_json_path, "r") as f:
-                data = json.load(f)
-                total_commits = data.get("total_commits", 0)
-                return total_commits > 0, total_commits
+            manifest = CommitStreamReader(str(commits_json_path)).read_manifest()
+            total_commits = manifest.get("total_commits", 0)
+            return total_commits > 0, total_commits
         except Exception as e:
-            self.print_error(f"Failed to read commits JSON: {e}")
+            self.print_error(f"Failed to read commits output: {e}")
             return False, 0
 
     def load_config(self) -> dict:
@@ -134,6 +136,8 @@ class WorkflowOrchestrator:
             command.append("--dry-run")
         if self.example_mode:
             command.append("--example")
+        if self.force:
+            command.append("--force")
 
         success, stdout, stderr = self.run_command(
             command, "Running fetch_commits.py", capture_output=True
@@ -156,7 +160,7 @@ class WorkflowOrchestrator:
         """Step 2: Check if commits were found."""
         self.print_step(2, 4, "Checking for new commits")
 
-        commits_json = Path("data/commits.json")
+        commits_json = Path(find_commits_file())
 
         if self.dry_run:
             self.print_info("DRY RUN: Skipping commit check")
@@ -183,11 +187,13 @@ class WorkflowOrchestrator:
             "--config",
             str(self.config_path),
             "--input",
-            "data/commits.json",
+            find_commits_file(),
         ]
 
         if self.dry_run:
             command.append("--preview")
+        if self.force:
+            command.append("--force")
 
         success, stdout, stderr = self.run_command(
             command, "Running generate_post.py", capture_output=True
@@ -382,6 +388,18 @@ class WorkflowOrchestrator:
                 self.print_info("No commits found, but no-update posts are enabled")
                 commit_count = 0
 
+            min_commits = config.get("automation", {}).get("min_commits", 0)
+            if has_commits and commit_count < min_commits and not self.force:
+                self.print_info(
+                    f"Only {commit_count} commits (min_commits: {min_commits}), "
+                    f"waiting for more before posting"
+                )
+                print()
+                print("=" * 60)
+                self.print_success("Workflow complete (too few commits)")
+                print("=" * 60)
+                return 0
+
             # Step 3: Generate post
             if not self.step_generate_post():
                 self.print_error("Failed to generate blog post")
@@ -449,6 +467,9 @@ Examples:
 
   # Use example data (no GitHub API calls)
   %(prog)s --example
+
+  # Post even with fewer than min_commits commits
+  %(prog)s --force
         """,
     )
 
@@ -472,6 +493,11 @@ Examples:
         action="store_true",
         help="Use example commit data instead of fetching from GitHub",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Generate a post even below automation.min_commits",
+    )
 
     args = parser.parse_args()
 
@@ -480,6 +506,7 @@ Examples:
         dry_run=args.dry_run,
         skip_build=args.skip_build,
         example_mode=args.example,
+        force=args.force,
     )
 
     exit_code = orchestrator.run()
@@ -0,0 +1,189 @@
+"""
+Scaling Benchmark
+Times the fetch-output → prompt → post path on synthetic datasets of growing size.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from roboblog.commit_stream import OUTPUT_FORMATS
+from roboblog.fetch_commits import CommitProcessor
+from roboblog.generate_post import CommitDataLoader, JekyllPostGenerator, PostWriter
+from roboblog.synthetic_data import SyntheticCommitGenerator
+
+
+class ScalingBenchmark:
+    """Measures wall time and peak Python heap of each pipeline stage.
+
+    Stages run in pipeline order on one generated file: writing the fetch
+    output, loading it for generation, loading it as example data, formatting
+    the prompt and writing the post (the LLM call is replaced by the prompt
+    itself, so only repository code is measured). Peak memory comes from
+    tracemalloc, reset before each stage, so it is the stage's own high-water
+    mark above what earlier stages left allocated.
+    """
+
+    def __init__(
+        self,
+        work_dir: str,
+        repos: int = 10,
+        files_per_commit: int = 4,
+        message_length: int = 120,
+        output_format: str = "ndjson",
+    ):
+        self.work_dir = Path(work_dir)
+        self.repos = repos
+        self.files_per_commit = files_per_commit
+        self.message_length = message_length
+        self.output_format = output_format
+
+    def _stage(self, name: str, fn: Callable[[], Any], results: Dict[str, Any]) -> Any:
+        """Run one stage, recording its time and peak memory."""
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        results["stages"][name] = {
+            "seconds": round(elapsed, 3),
+            "peak_mb": round(max(0, peak - base) / (1024 * 1024), 2),
+        }
+        return value
+
+    def run(self, total_commits: int) -> Dict[str, Any]:
+        """Run every stage on a dataset of about `total_commits` commits."""
+        generator = SyntheticCommitGenerator(
+            repos=self.repos,
+            commits_per_repo=max(1, total_commits // self.repos),
+            files_per_commit=self.files_per_commit,
+            message_length=self.message_length,
+        )
+        path = self.work_dir / f"commits-{generator.total_commits}.{self.output_format}"
+        results: Dict[str, Any] = {"commits": generator.total_commits, "stages": {}}
+
+        tracemalloc.start()
+        try:
+            self._stage(
+                "write",
+                lambda: generator.write(str(path), output_format=self.output_format),
+                results,
+            )
+            results["file_mb"] = round(path.stat().st_size / (1024 * 1024), 2)
+
+            loader = CommitDataLoader(data_path=str(path))
+            data = self._stage("load", loader.load, results)
+
+            processor = CommitProcessor(
+                since=datetime.now(timezone.utc) - timedelta(days=generator.days),
+                repo_filters=[],
+                exclude_repos=[],
+            )
+            self._stage(
+                "example_load",
+                lambda: sum(1 for _ in processor.load_example_commits(str(path))),
+                results,
+            )
+
+            prompt = self._stage("format", lambda: loader.format_for_prompt(data), results)
+            data = None  # Release the loaded data before the post stage
+            results["prompt_chars"] = len(prompt)
+
+            def write_post() -> Path:
+                post_generator = JekyllPostGenerator(blog_config={}, author="benchmark")
+                content = post_generator.generate(
+                    {"headline": "Scaling benchmark", "summary": prompt}
+                )
+                writer = PostWriter(posts_dir=str(self.work_dir / "_posts"))
+                return writer.write(post_generator.get_filename(content), content)
+
+            self._stage("post", write_post, results)
+        finally:
+            tracemalloc.stop()
+            path.unlink(missing_ok=True)
+
+        return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print one row per dataset size with each stage's time and peak memory."""
+    stages = list(results[0]["stages"]) if results else []
+    header = f"  {'Commits':>8} {'File MB':>8}" + "".join(
+        f" {name + ' s/MB':>18}" for name in stages
+    )
+    print(header)
+    for result in results:
+        row = f"  {result['commits']:>8} {result['file_mb']:>8.1f}"
+        for name in stages:
+            stage = result["stages"][name]
+            row += f" {stage['seconds']:>9.3f}/{stage['peak_mb']:<8.1f}"
+        print(row)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the fetch-output → prompt → post path on synthetic data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="Comma-separated total commit counts (default: 1000,10000,100000)",
+    )
+    parser.add_argument("--repos", type=int, default=10, help="Repositories (default: 10)")
+    parser.add_argument(
+        "--files-per-commit", type=int, default=4, help="Mean files per commit (default: 4)"
+    )
+    parser.add_argument(
+        "--message-length", type=int, default=120, help="Approximate message length (default: 120)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Fetch output format to benchmark (default: json)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError:
+        print(f"✗ Invalid --sizes: {args.sizes}")
+        sys.exit(1)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="roboblog-scaling-") as work_dir:
+        benchmark = ScalingBenchmark(
+            work_dir=work_dir,
+            repos=args.repos,
+            files_per_commit=args.files_per_commit,
+            message_length=args.message_length,
+            output_format=args.format,
+        )
+        for size in sizes:
+            results.append(benchmark.run(size))
+            if not args.json:
+                print(f"  ✓ {results[-1]['commits']} commits done")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"\nFormat: {args.format}, {args.repos} repositories")
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
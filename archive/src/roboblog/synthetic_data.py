@@ -0,0 +1,213 @@
+"""
+Synthetic Commit Data
+Generates large, realistic commit datasets in the fetcher's output schema.
+"""
+
+import argparse
+import hashlib
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from roboblog.commit_stream import OUTPUT_FORMATS, CommitStreamWriter
+
+COMMIT_TYPES = ["feat", "fix", "refactor", "docs", "test", "chore", "perf", "style"]
+
+WORDS = (
+    "add remove update handle support improve cache parser request response "
+    "config client server token retry timeout error message layout button "
+    "query index schema migration endpoint session render template build "
+    "deploy worker queue stream buffer metric logging validation user page"
+).split()
+
+DIRECTORIES = ["src", "src/components", "src/services", "lib", "tests", "docs", "scripts"]
+EXTENSIONS = [".py", ".ts", ".tsx", ".js", ".go", ".md", ".yml", ".css"]
+
+# Relative frequency of each file status in real commit details
+FILE_STATUSES = ["modified"] * 14 + ["added"] * 4 + ["removed", "renamed"]
+
+
+class SyntheticCommitGenerator:
+    """Deterministic generator of commit records shaped like fetch output.
+
+    Records match CommitProcessor._process_commit: message, date, author,
+    repository, URL, files and stats. Commits are spread over the last `days`
+    days, newest first within each repository, and line counts follow a
+    heavy-tailed distribution so a few commits dominate the totals as they do
+    in real histories. The same seed always yields the same dataset.
+    """
+
+    def __init__(
+        self,
+        repos: int = 10,
+        commits_per_repo: int = 100,
+        files_per_commit: int = 4,
+        message_length: int = 120,
+        days: int = 7,
+        owner: str = "synthetic-user",
+        seed: int = 0,
+    ):
+        self.repos = max(1, repos)
+        self.commits_per_repo = max(0, commits_per_repo)
+        self.files_per_commit = max(0, files_per_commit)
+        self.message_length = max(10, message_length)
+        self.days = max(1, days)
+        self.owner = owner
+        self.seed = seed
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    @property
+    def total_commits(self) -> int:
+        """Get the number of records the generator yields."""
+        return self.repos * self.commits_per_repo
+
+    def repo_names(self) -> List[str]:
+        """Get the generated repository names."""
+        return [f"{self.owner}/project-{r:04d}" for r in range(self.repos)]
+
+    def _message(self, rng: random.Random) -> str:
+        """Build a conventional-commit message of about message_length characters."""
+        subject = f"{rng.choice(COMMIT_TYPES)}: {' '.join(rng.choices(WORDS, k=rng.randint(3, 7)))}"
+        subject = subject[: self.message_length]
+        if len(subject) + 2 >= self.message_length:
+            return subject
+
+        body: List[str] = []
+        size = 0
+        while size < self.message_length - len(subject) - 2:
+            word = rng.choice(WORDS)
+            body.append(word)
+            size += len(word) + 1
+        return f"{subject}\n\n{' '.join(body).capitalize()}."
+
+    def _files(self, rng: random.Random) -> List[Dict[str, Any]]:
+        """Build file changes with heavy-tailed line counts."""
+        if not self.files_per_commit:
+            return []
+
+        files = []
+        count = max(1, round(rng.expovariate(1 / self.files_per_commit)))
+        for _ in range(count):
+            status = rng.choice(FILE_STATUSES)
+            size = int(rng.paretovariate(1.2) * 5)
+            additions = 0 if status == "removed" else size
+            deletions = size if status == "removed" else int(size * rng.random())
+            name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}{rng.choice(EXTENSIONS)}"
+            files.append(
+                {
+                    "filename": f"{rng.choice(DIRECTORIES)}/{name}",
+                    "status": status,
+                    "additions": additions,
+                    "deletions": deletions,
+                    "changes": additions + deletions,
+                }
+            )
+        return files
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield commit records repository by repository, newest first."""
+        span = timedelta(days=self.days)
+        for r, repo_name in enumerate(self.repo_names()):
+            rng = random.Random(f"{self.seed}/{repo_name}")
+            for c in range(self.commits_per_repo):
+                sha = hashlib.sha1(f"{self.seed}/{repo_name}/{c}".encode()).hexdigest()
+                date = self.now - span * (c + rng.random()) / max(1, self.commits_per_repo)
+                files = self._files(rng)
+                additions = sum(f["additions"] for f in files)
+                deletions = sum(f["deletions"] for f in files)
+                author = rng.choice(["Alice Developer", "Bob Builder", "Carol Coder"])
+                yield {
+                    "sha": sha,
+                    "message": self._message(rng),
+                    "date": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "author": author,
+                    "author_email": f"{author.split()[0].lower()}@example.com",
+                    "repository": repo_name,
+                    "url": f"https://github.com/{repo_name}/commit/{sha}",
+                    "files": files,
+                    "stats": {
+                        "additions": additions,
+                        "deletions": deletions,
+                        "total": additions + deletions,
+                    },
+                }
+
+    def write(
+        self, path: str, output_format: str = "ndjson", compress: bool = False
+    ) -> Dict[str, Any]:
+        """Write the dataset with CommitStreamWriter, as the fetcher would.
+
+        Returns:
+            The output manifest
+        """
+        writer = CommitStreamWriter(
+            path=path,
+            since=self.now - timedelta(days=self.days),
+            output_format=output_format,
+            compress=compress,
+        )
+        try:
+            for record in self.iter_records():
+                writer.write(record)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.close(fetched_at=self.now)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic commit dataset in the fetcher's output format",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--output",
+        default="data/synthetic_commits.json",
+        help="Output file path (default: data/synthetic_commits.json)",
+    )
+    parser.add_argument("--repos", type=int, default=10, help="Repositories (default: 10)")
+    parser.add_argument(
+        "--commits-per-repo", type=int, default=100, help="Commits per repository (default: 100)"
+    )
+    parser.add_argument(
+        "--files-per-commit", type=int, default=4, help="Mean files per commit (default: 4)"
+    )
+    parser.add_argument(
+        "--message-length", type=int, default=120, help="Approximate message length (default: 120)"
+    )
+    parser.add_argument("--days", type=int, default=7, help="Days the commits span (default: 7)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Output format; json matches data/example_commits.json (default: json)",
+    )
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress NDJSON output")
+
+    args = parser.parse_args(argv)
+
+    generator = SyntheticCommitGenerator(
+        repos=args.repos,
+        commits_per_repo=args.commits_per_repo,
+        files_per_commit=args.files_per_commit,
+        message_length=args.message_length,
+        days=args.days,
+        seed=args.seed,
+    )
+    try:
+        manifest = generator.write(args.output, output_format=args.format, compress=args.gzip)
+    except (OSError, ValueError) as e:
+        print(f"✗ Generation failed: {e}")
+        sys.exit(1)
+
+    print(
+        f"✓ Wrote {manifest['total_commits']} commits across "
+        f"{len(manifest['repositories'])} repositories to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Shared fixtures: a mock GitHub API and clients pointed at it."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from roboblog.fetch_commits import GitHubAPIClient, RetryPolicy
+from roboblog.mock_github import MockDataset, MockGitHubServer
+
+
+@pytest.fixture
+def mock_github():
+    """A mock GitHub API serving 3 repositories of 5 commits each."""
+    server = MockGitHubServer(
+        dataset=MockDataset(repos=3, commits_per_repo=5, files_per_commit=2)
+    ).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def api_client(mock_github):
+    """A client for the mock GitHub API that retries without waiting."""
+    return GitHubAPIClient(
+        token="test-token",
+        base_url=mock_github.url,
+        retry_policy=RetryPolicy(max_retries=2, backoff_base=0.0),
+    )
+
+
+@pytest.fixture
+def since():
+    """A fetch window covering the whole mock dataset."""
+    return datetime.now(timezone.utc) - timedelta(days=60)
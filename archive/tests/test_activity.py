@@ -0,0 +1,81 @@
+from roboblog.activity import (
+    ActivityAggregator,
+    commit_significance,
+    listing_significance,
+    message_significance,
+    row_significance,
+)
+from roboblog.commit_table import CommitTable
+from roboblog.synthetic_data import SyntheticCommitGenerator
+
+
+def make_records(repos=3, commits_per_repo=10):
+    return list(
+        SyntheticCommitGenerator(repos=repos, commits_per_repo=commits_per_repo).iter_records()
+    )
+
+
+def test_messages_score_by_type_body_and_merges():
+    assert message_significance("feat: add x") > message_significance("chore: bump x")
+    assert message_significance("fix: x\n\nWhy it broke") > message_significance("fix: x")
+    assert message_significance("feat(api): add x") == message_significance("feat: add x")
+    assert message_significance("Merge branch 'main'") < message_significance("update x")
+    assert message_significance("feat: x", merge=True) < message_significance("feat: x")
+
+
+def test_rows_score_like_their_records():
+    records = make_records()
+    table = CommitTable.from_records(records)
+
+    assert [row_significance(table, row) for row in range(len(table))] == [
+        commit_significance(record) for record in table.iter_records()
+    ]
+
+
+def test_listings_score_without_stats():
+    listing = {"sha": "a" * 40, "commit": {"message": "feat: add x"}, "parents": [{}]}
+    merge = dict(listing, parents=[{}, {}])
+
+    assert listing_significance(listing) == listing_significance({"message": "feat: add x"})
+    assert listing_significance(merge) < listing_significance(listing)
+
+
+def test_aggregates_keep_only_the_most_significant_commits():
+    records = make_records()
+    aggregates = ActivityAggregator(top_commits=5).aggregate(records)
+
+    significant = aggregates["significant_commits"]
+    threshold = min(commit_significance(record) for record in significant)
+    assert len(significant) == 5
+    assert sum(commit_significance(record) > threshold for record in records) < 5
+    assert [record["date"] for record in significant] == sorted(
+        (record["date"] for record in significant), reverse=True
+    )
+    assert aggregates["total_commits"] == 30
+    assert aggregates["additions"] == sum(r["stats"]["additions"] for r in records)
+
+
+def test_render_lists_groups_without_commit_details():
+    aggregator = ActivityAggregator(top_commits=3, top_groups=2)
+    records = make_records(repos=4, commits_per_repo=3)
+
+    text = "\n".join(aggregator.render(aggregator.aggregate(records)))
+
+    for section in ("by repository", "by directory", "by file type", "touched files", "Daily"):
+        assert section in text
+    assert "... 2 more repositories" in text
+    assert records[0]["sha"] not in text
+
+
+def test_undated_commits_are_left_out_of_the_daily_histogram():
+    records = make_records(repos=1, commits_per_repo=3)
+    records[1]["date"] = ""
+    aggregator = ActivityAggregator()
+
+    aggregates = aggregator.aggregate(records)
+    text = "\n".join(aggregator.render(aggregates))
+
+    assert aggregates["undated_commits"] == 1
+    assert sum(day["commits"] for day in aggregates["daily"].values()) == 2
+    assert "1970" not in text
+    assert "(1 commits without a valid date not shown)" in text
@@ -0,0 +1,79 @@
+from roboblog.commit_clusters import CommitClusterer
+
+
+def make_commit(sha, message, files=("README.md",), date="2024-05-01T10:00:00Z", additions=1):
+    return {
+        "sha": sha * 40,
+        "message": message,
+        "date": date,
+        "files": [{"filename": filename} for filename in files],
+        "stats": {"additions": additions, "deletions": 0},
+    }
+
+
+def shas(clusters):
+    return [[commit["sha"][0] for commit in cluster] for cluster in clusters]
+
+
+def test_consecutive_near_duplicates_form_one_run():
+    commits = [
+        make_commit("a", "fix typo"),
+        make_commit("b", "fix typo"),
+        make_commit("c", "Fix typo again"),
+        make_commit("d", "feat: add the streaming writer", files=("src/stream.py",)),
+    ]
+
+    assert shas(CommitClusterer().cluster(commits)) == [["a", "b", "c"], ["d"]]
+
+
+def test_only_neighbours_are_grouped():
+    commits = [
+        make_commit("a", "wip"),
+        make_commit("b", "feat: add the streaming writer", files=("src/stream.py",)),
+        make_commit("c", "wip"),
+    ]
+
+    assert shas(CommitClusterer().cluster(commits)) == [["a"], ["b"], ["c"]]
+
+
+def test_version_bumps_look_alike():
+    commits = [
+        make_commit("a", "bump requests from 2.31.0 to 2.32.0", files=("uv.lock",)),
+        make_commit("b", "bump requests from 2.32.0 to 2.32.3", files=("uv.lock",)),
+    ]
+
+    assert shas(CommitClusterer().cluster(commits)) == [["a", "b"]]
+
+
+def test_subjects_without_words_are_never_merged():
+    commits = [make_commit("a", "1.2.3"), make_commit("b", "1.2.4"), make_commit("c", "")]
+
+    assert shas(CommitClusterer().cluster(commits)) == [["a"], ["b"], ["c"]]
+
+
+def test_the_threshold_controls_how_alike_runs_must_be():
+    commits = [make_commit("a", "fix login redirect"), make_commit("b", "fix login timeout")]
+
+    assert shas(CommitClusterer(threshold=0.9).cluster(commits)) == [["a"], ["b"]]
+    assert shas(CommitClusterer(threshold=0.3).cluster(commits)) == [["a", "b"]]
+
+
+def test_summaries_keep_every_subject():
+    cluster = [
+        make_commit("a", "fix typo", date="2024-05-02T10:00:00Z", additions=2),
+        make_commit("b", "fix typo\n\nIn the intro", files=("README.md", "docs/a.md")),
+        make_commit("c", "Fix typo in README", date="2024-04-30T10:00:00Z"),
+    ]
+
+    summary = CommitClusterer.summarize(cluster)
+
+    assert summary["count"] == 3
+    assert summary["subject"] == "fix typo"
+    assert summary["subjects"] == ["fix typo", "Fix typo in README"]
+    assert summary["distinct_subjects"] == 2
+    assert (summary["first_date"], summary["last_date"]) == (
+        "2024-04-30T10:00:00Z",
+        "2024-05-02T10:00:00Z",
+    )
+    assert summary["files"] == ["README.md", "docs/a.md"]
+    assert summary["additions"] == 4
@@ -0,0 +1,153 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from roboblog.commit_stream import (
+    GZIP_MAGIC,
+    CommitStreamReader,
+    CommitStreamWriter,
+    JSONDocumentScanner,
+    default_output_path,
+    export_json,
+    find_commits_file,
+)
+
+SINCE = datetime(2024, 5, 1, tzinfo=timezone.utc)
+FETCHED_AT = datetime(2024, 5, 8, tzinfo=timezone.utc)
+
+
+def make_record(repository, sha, message="fix: something"):
+    return {
+        "sha": sha,
+        "message": message,
+        "date": "2024-05-02T10:00:00Z",
+        "author": "Dev",
+        "author_email": "dev@example.com",
+        "repository": repository,
+        "url": f"https://github.com/{repository}/commit/{sha}",
+        "files": [{"filename": "a.py", "status": "modified", "additions": 1, "deletions": 0}],
+        "stats": {"additions": 1, "deletions": 0, "total": 1},
+    }
+
+
+RECORDS = [
+    make_record("o/a", "1" * 40, 'feat: quote "this"\n\nWith a body.'),
+    make_record("o/a", "2" * 40),
+    make_record("o/b", "3" * 40, "docs: ünïcode"),
+]
+
+EXPECTED = {
+    "fetched_at": FETCHED_AT.isoformat(),
+    "since": SINCE.isoformat(),
+    "total_commits": 3,
+    "repositories": {"o/a": RECORDS[:2], "o/b": RECORDS[2:]},
+}
+
+
+def write_output(path, output_format="ndjson", compress=False):
+    writer = CommitStreamWriter(str(path), SINCE, output_format=output_format, compress=compress)
+    for record in RECORDS:
+        writer.write(record)
+    return writer.close(fetched_at=FETCHED_AT)
+
+
+@pytest.mark.parametrize(
+    "output_format, compress", [("ndjson", False), ("ndjson", True), ("json", False)]
+)
+def test_output_round_trips_in_every_format(tmp_path, output_format, compress):
+    path = tmp_path / "commits.out"
+
+    manifest = write_output(path, output_format, compress)
+    reader = CommitStreamReader(str(path))
+
+    assert manifest["total_commits"] == 3
+    assert reader.load() == EXPECTED
+    assert list(reader.iter_records()) == RECORDS
+    assert reader.read_manifest()["repositories"] == {"o/a": 2, "o/b": 1}
+    assert os.listdir(tmp_path) == ["commits.out"]
+    assert (path.read_bytes()[:2] == GZIP_MAGIC) == compress
+
+
+def test_ndjson_output_is_a_manifest_then_one_record_per_line(tmp_path):
+    path = tmp_path / "commits.ndjson.gz"
+
+    write_output(path, compress=True)
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0]["type"] == "manifest"
+    assert lines[0]["repositories"] == {"o/a": 2, "o/b": 1}
+    assert lines[1:] == RECORDS
+
+
+def test_legacy_json_files_are_still_read(tmp_path):
+    path = tmp_path / "commits.json"
+    path.write_text(json.dumps(EXPECTED, indent=2))
+    reader = CommitStreamReader(str(path))
+
+    assert reader.load() == EXPECTED
+    assert reader.read_manifest()["repositories"] == {"o/a": 2, "o/b": 1}
+    assert reader.read_manifest()["total_commits"] == 3
+
+
+def test_aborted_output_leaves_no_files(tmp_path):
+    writer = CommitStreamWriter(str(tmp_path / "commits.ndjson"), SINCE)
+    writer.write(RECORDS[0])
+
+    writer.abort()
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_export_json_writes_the_legacy_document(tmp_path):
+    source = tmp_path / "commits.ndjson"
+    write_output(source)
+
+    assert export_json(str(source), str(tmp_path / "export.json")) == 3
+    assert json.loads((tmp_path / "export.json").read_text()) == EXPECTED
+
+
+def test_default_output_is_named_after_its_format(tmp_path):
+    assert default_output_path("ndjson", data_dir="d") == os.path.join("d", "commits.ndjson")
+    assert default_output_path("ndjson", True, "d") == os.path.join("d", "commits.ndjson.gz")
+    assert default_output_path("json", True, "d") == os.path.join("d", "commits.json")
+
+
+def test_readers_find_the_newest_output(tmp_path):
+    data_dir = str(tmp_path)
+    assert find_commits_file(data_dir) == default_output_path(data_dir=data_dir)
+
+    write_output(tmp_path / "commits.json", "json")
+    write_output(tmp_path / "commits.ndjson.gz", compress=True)
+    os.utime(tmp_path / "commits.json", (0, 0))
+
+    assert find_commits_file(data_dir) == str(tmp_path / "commits.ndjson.gz")
+
+
+def test_legacy_documents_stream_across_chunk_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(JSONDocumentScanner, "CHUNK_SIZE", 7)
+    path = tmp_path / "commits.json"
+    document = dict(EXPECTED, notes={"nested": ["[", "{", '"}']})
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False))
+
+    records = list(CommitStreamReader(str(path)).iter_records())
+
+    assert records == RECORDS
+
+
+@pytest.mark.parametrize("output_format", ["ndjson", "json"])
+def test_excluded_repositories_are_left_out(tmp_path, output_format):
+    path = tmp_path / "commits.out"
+    write_output(path, output_format)
+    reader = CommitStreamReader(str(path))
+
+    def exclude(repo_name):
+        return repo_name == "o/a"
+
+    assert [name for name, _ in reader.iter_repositories(exclude)] == ["o/b"]
+    data = reader.load(exclude)
+    assert list(data["repositories"]) == ["o/b"]
+    assert data["total_commits"] == 1
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+
+from roboblog.commit_stream import CommitStreamWriter
+from roboblog.commit_table import MISSING_DATE, CommitTable
+from roboblog.synthetic_data import SyntheticCommitGenerator
+
+
+def make_record(sha, repository, date, author="Alice", files=(), url=None):
+    files = [
+        {
+            "filename": filename,
+            "status": "modified",
+            "additions": additions,
+            "deletions": deletions,
+            "changes": additions + deletions,
+        }
+        for filename, additions, deletions in files
+    ]
+    additions = sum(f["additions"] for f in files)
+    deletions = sum(f["deletions"] for f in files)
+    return {
+        "sha": sha,
+        "message": f"feat: commit {sha[:4]}",
+        "date": date,
+        "author": author,
+        "author_email": f"{author.lower()}@example.com",
+        "repository": repository,
+        "url": url or f"https://github.com/{repository}/commit/{sha}",
+        "files": files,
+        "stats": {"additions": additions, "deletions": deletions, "total": additions + deletions},
+    }
+
+
+RECORDS = [
+    make_record("a" * 40, "o/web", "2024-05-01T10:00:00Z", files=[("src/app/main.py", 10, 2)]),
+    make_record(
+        "b" * 40,
+        "o/api",
+        "2024-05-02T09:00:00Z",
+        author="Bob",
+        files=[("src/app/main.py", 1, 1), ("README", 5, 0), ("docs/guide.MD", 3, 3)],
+    ),
+    make_record("c" * 40, "o/web", "2024-05-02T23:59:59Z", files=[("src/ui/view.ts", 4, 4)]),
+]
+
+
+def test_rows_round_trip_to_records():
+    records = list(SyntheticCommitGenerator(repos=3, commits_per_repo=5).iter_records())
+    records.append(make_record("short", "o/odd", "2024-05-01T00:00:00Z", url="https://x/y"))
+
+    table = CommitTable.from_records(records)
+
+    assert list(table.iter_records()) == records
+
+
+def test_rows_are_grouped_by_repository():
+    table = CommitTable.from_records(RECORDS)
+
+    assert table.repositories == ["o/web", "o/api"]
+    assert [table.sha(row) for row in table.rows_for("o/web")] == ["a" * 40, "c" * 40]
+    assert table.rows_for("o/unknown") == range(0)
+    assert list(table.view("o/web")["additions"]) == [10, 4]
+
+
+def test_tables_load_split_ndjson_repositories(tmp_path):
+    path = tmp_path / "commits.ndjson"
+    writer = CommitStreamWriter(str(path), datetime(2024, 5, 1, tzinfo=timezone.utc))
+    for record in RECORDS:
+        writer.write(record)
+    writer.close()
+
+    table = CommitTable.from_file(str(path))
+
+    assert table.repositories == ["o/web", "o/api"]
+    assert len(table.rows_for("o/web")) == 2
+
+
+def test_aggregates_sum_churn_by_group():
+    table = CommitTable.from_records(RECORDS)
+
+    assert table.churn_by_repo() == {
+        "o/web": {"commits": 2, "additions": 14, "deletions": 6},
+        "o/api": {"commits": 1, "additions": 9, "deletions": 4},
+    }
+    assert table.churn_by_extension() == {
+        ".py": {"files": 2, "additions": 11, "deletions": 3},
+        "README": {"files": 1, "additions": 5, "deletions": 0},
+        ".md": {"files": 1, "additions": 3, "deletions": 3},
+        ".ts": {"files": 1, "additions": 4, "deletions": 4},
+    }
+    assert table.churn_by_directory(depth=1) == {
+        "src/": {"files": 3, "additions": 15, "deletions": 7},
+        "/": {"files": 1, "additions": 5, "deletions": 0},
+        "docs/": {"files": 1, "additions": 3, "deletions": 3},
+    }
+    assert list(table.churn_by_day()) == ["2024-05-01", "2024-05-02"]
+    assert table.churn_by_day()["2024-05-02"]["commits"] == 2
+    assert table.top_files(limit=1) == [
+        {"filename": "src/app/main.py", "commits": 2, "additions": 11, "deletions": 3}
+    ]
+
+
+def test_select_combines_filters():
+    table = CommitTable.from_records(RECORDS)
+    may_2 = datetime(2024, 5, 2, tzinfo=timezone.utc)
+
+    assert list(table.select(since=may_2)) == [1, 2]
+    assert list(table.select(until=may_2)) == [0]
+    assert list(table.select(repos=["o/web"], since=may_2)) == [1]
+    assert list(table.select(authors=["BOB@example.com"])) == [2]
+    assert list(table.select(rows=[0, 2], repos=["o/api"])) == [2]
+    # Naive datetimes are read as UTC
+    assert list(table.select(since=datetime(2024, 5, 2))) == [1, 2]
+    assert table.churn_by_repo(table.select(repos=["o/api"])) == {
+        "o/api": {"commits": 1, "additions": 9, "deletions": 4}
+    }
+
+
+def test_malformed_dates_do_not_stop_the_table():
+    assert CommitTable._parse_date("") == MISSING_DATE
+    assert CommitTable._parse_date("yesterday") == MISSING_DATE
+    assert CommitTable._parse_date("2024-05-01T00:00:00") == CommitTable._parse_date(
+        "2024-05-01T00:00:00Z"
+    )
+
+    undated = make_record("d" * 40, "o/web", "not a date", files=[("a.py", 1, 0)])
+    table = CommitTable.from_records([*RECORDS, undated])
+
+    assert table.record(table.rows_for("o/web")[-1])["date"] == "not a date"
+    assert list(table.churn_by_day()) == ["2024-05-01", "2024-05-02"]
+    assert list(table.select(until=datetime(2024, 5, 2, tzinfo=timezone.utc))) == [0]
+    assert len(table.select()) == 4
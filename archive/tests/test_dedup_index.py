@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+from roboblog.dedup_index import BloomFilter, DedupIndex
+from roboblog.fetch_commits import CommitProcessor
+
+
+def make_record(sha, date=None, message="feat: add a thing", email="dev@example.com"):
+    date = date or datetime.now(timezone.utc)
+    return {
+        "sha": sha,
+        "message": message,
+        "date": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "author_email": email,
+        "repository": "o/a",
+    }
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    keys = [f"sha:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert sum(f"other:{i}" in bloom for i in range(1000)) < 50
+
+
+def test_content_keys_ignore_date_and_line_ending_formats():
+    key = DedupIndex.content_key("Dev@Example.com", "2024-05-01T10:00:00Z", "fix: x\n\nbody")
+
+    assert key == DedupIndex.content_key(
+        "dev@example.com", "2024-05-01T12:00:00+02:00", "fix: x  \r\n\r\nbody\n"
+    )
+    assert key != DedupIndex.content_key("dev@example.com", "2024-05-01T10:00:01Z", "fix: x")
+    assert DedupIndex.content_key("dev@example.com", "", "fix: x") is None
+    assert DedupIndex.content_key("dev@example.com", "yesterday", "fix: x") is None
+
+
+def test_list_level_commits_and_records_share_keys():
+    record = make_record("a" * 40)
+    commit = {
+        "sha": "a" * 40,
+        "commit": {
+            "message": record["message"],
+            "author": {"email": record["author_email"], "date": record["date"]},
+        },
+    }
+
+    assert DedupIndex.keys_for(commit) == DedupIndex.keys_for(record)
+
+
+def test_staged_records_are_only_seen_once_committed(tmp_path):
+    index = DedupIndex(path=str(tmp_path / "dedup.sqlite"))
+    record = make_record("a" * 40)
+
+    index.stage(record)
+    assert not index.seen(record)
+
+    assert index.commit() == 2
+    assert index.seen(record)
+    # A cherry-pick keeps the content but not the SHA
+    assert index.seen(dict(record, sha="b" * 40))
+    index.close()
+
+    reopened = DedupIndex(path=str(tmp_path / "dedup.sqlite"))
+    assert reopened.seen(record)
+    assert reopened.stats()["sha_keys"] == 1
+    reopened.close()
+
+
+def test_prune_forgets_old_commits(tmp_path):
+    index = DedupIndex(path=str(tmp_path / "dedup.sqlite"))
+    old = make_record("a" * 40, datetime.now(timezone.utc) - timedelta(days=100))
+    new = make_record("b" * 40, message="fix: another thing")
+    index.stage(old)
+    index.stage(new)
+    index.commit()
+
+    assert index.prune(older_than_days=30) == 2
+    assert not index.seen(old)
+    assert index.seen(new)
+    assert index.prune() == 2
+    assert not index.seen(new)
+    index.close()
+
+
+def test_published_commits_are_skipped_before_details(mock_github, api_client, since, tmp_path):
+    index = DedupIndex(path=str(tmp_path / "dedup.sqlite"))
+    first = CommitProcessor(since, repo_filters=[], exclude_repos=[], dedup_index=index)
+    assert len(list(first.fetch_commits_direct(api_client, "mock-user"))) == 15
+    index.commit()
+    requests_before = mock_github.request_count
+
+    second = CommitProcessor(since, repo_filters=[], exclude_repos=[], dedup_index=index)
+    records = list(second.fetch_commits_direct(api_client, "mock-user"))
+
+    assert records == []
+    assert second.skipped_published == 15
+    assert mock_github.request_count - requests_before == 1 + 3
+    index.close()
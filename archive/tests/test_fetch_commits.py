@@ -0,0 +1,851 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from roboblog.fetch_commits import (
+    CircuitBreaker,
+    CommitProcessor,
+    CommitStore,
+    ConfigReader,
+    FetchJournal,
+    FetchPlanner,
+    GitHubAPIClient,
+    GitHubAPIError,
+    PatchStripper,
+    RateLimitScheduler,
+    RepoCursorStore,
+    ResponseCache,
+    RetryPolicy,
+    TimestampTracker,
+)
+from roboblog.mock_github import MockDataset, MockGitHubServer
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.yml"
+
+
+def load_config(tmp_path, path=CONFIG_PATH):
+    config = ConfigReader(config_path=str(path), env_path=str(tmp_path / ".env"))
+    config.load()
+    return config
+
+
+def make_response(status_code=200, headers=None, body=b""):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    return response
+
+
+def make_processor(since, **kwargs):
+    return CommitProcessor(since=since, repo_filters=[], exclude_repos=[], **kwargs)
+
+
+def test_fetch_commits_direct_fetches_every_commit_with_details(mock_github, api_client, since):
+    processor = make_processor(since, concurrency=4)
+
+    records = list(processor.fetch_commits_direct(api_client, "mock-user"))
+
+    assert len(records) == 15
+    assert all(len(record["files"]) == 2 for record in records)
+    assert all(record["stats"]["total"] > 0 for record in records)
+    assert processor.detail_counts["fetched"] == 15
+    assert not processor.failed_repos
+
+
+def test_concurrent_fetch_matches_sequential_fetch(mock_github, api_client, since):
+    sequential = list(make_processor(since).fetch_commits_direct(api_client, "mock-user"))
+    concurrent = list(
+        make_processor(since, concurrency=8).fetch_commits_direct(api_client, "mock-user")
+    )
+
+    assert [record["sha"] for record in concurrent] == [record["sha"] for record in sequential]
+
+
+def test_scheduler_spends_spare_budget_at_full_speed():
+    scheduler = RateLimitScheduler(reserve=50, burst=10)
+    scheduler.seed(remaining=1000, reset_at=time.time() + 3600)
+
+    assert scheduler.tokens == 950
+    assert scheduler.wait_seconds() == 0
+
+
+def test_scheduler_does_not_pace_an_unknown_budget():
+    scheduler = RateLimitScheduler(reserve=50, burst=10)
+    start = time.monotonic()
+
+    for _ in range(100):
+        scheduler.acquire()
+
+    assert time.monotonic() - start < 1
+    assert scheduler.requests_made == 100
+
+
+def test_scheduler_stretches_budget_near_the_reserve():
+    scheduler = RateLimitScheduler(reserve=50, burst=10)
+    scheduler.seed(remaining=55, reset_at=time.time() + 100)
+
+    assert scheduler.tokens == 5
+    assert abs(scheduler.rate - 5 / 100) < 0.01
+
+
+def test_scheduler_holds_the_reserve_back_until_reset():
+    scheduler = RateLimitScheduler(reserve=50, burst=10)
+    reset_at = time.time() + 600
+    scheduler.seed(remaining=50, reset_at=reset_at)
+
+    assert scheduler.tokens == 0
+    assert scheduler.paused_until >= reset_at
+    assert scheduler.wait_seconds() > 590
+
+
+def test_scheduler_caps_the_reserve_at_a_tenth_of_the_limit():
+    assert RateLimitScheduler(reserve=50, hourly_limit=60).reserve == 6
+
+
+def test_scheduler_counts_and_refunds_requests():
+    scheduler = RateLimitScheduler(reserve=0, burst=10)
+    scheduler.seed(remaining=100, reset_at=time.time() + 3600)
+
+    scheduler.acquire()
+    assert scheduler.requests_made == 1
+    assert scheduler.remaining == 99
+
+    scheduler.refund()
+    assert scheduler.requests_made == 0
+    assert scheduler.remaining == 100
+
+
+def test_scheduler_pauses_for_retry_after():
+    scheduler = RateLimitScheduler()
+    response = make_response(
+        403,
+        {
+            "Retry-After": "30",
+            "X-RateLimit-Remaining": "4000",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        },
+    )
+
+    assert scheduler.update(response)
+    assert 25 < scheduler.wait_seconds() <= 30
+
+
+def test_scheduler_ignores_successful_responses():
+    scheduler = RateLimitScheduler()
+    response = make_response(
+        200, {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+    )
+
+    assert not scheduler.update(response)
+    assert scheduler.remaining == 4000
+
+
+def test_cache_replays_not_modified_responses(mock_github, tmp_path, since):
+    cache = ResponseCache(path=str(tmp_path / "http_cache.sqlite"))
+    client = GitHubAPIClient(token="test-token", base_url=mock_github.url, cache=cache)
+
+    first = client.get_repo_commits("mock-user/repo-000", since)
+    second = client.get_repo_commits("mock-user/repo-000", since)
+    cache.close()
+
+    assert second == first
+    assert mock_github.not_modified_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    # GitHub does not charge 304s, and neither does the scheduler
+    assert mock_github.used == 1
+    assert client.scheduler.requests_made == 1
+
+
+def test_cache_sends_stored_validators(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "http_cache.sqlite"))
+    response = make_response(
+        200, {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"[]"
+    )
+
+    cache.store("key", response)
+
+    assert cache.conditional_headers("key") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.get_body("key") == b"[]"
+    assert cache.conditional_headers("other") == {}
+
+
+def test_cache_skips_responses_without_validators(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "http_cache.sqlite"))
+
+    cache.store("key", make_response(200, {}, b"[]"))
+
+    assert cache.get_body("key") is None
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "http_cache.sqlite"), max_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.store(key, make_response(200, {"ETag": f'"{key}"'}, b"x" * 100))
+        time.sleep(0.01)
+
+    assert cache.get_body("a") is None
+    assert cache.get_body("c") is not None
+    assert cache.total_bytes == 200
+
+
+def test_cache_keys_separate_tokens():
+    url = "https://api.github.com/user/repos"
+
+    assert ResponseCache.make_key(url, {"page": 1}, "one") != ResponseCache.make_key(
+        url, {"page": 1}, "two"
+    )
+    assert ResponseCache.make_key(url, {"a": 1, "b": 2}, None) == ResponseCache.make_key(
+        url, {"b": 2, "a": 1}, None
+    )
+
+
+def make_record(sha="a" * 40, repository="mock-user/repo-000", date=None, **fields):
+    date = date or datetime.now(timezone.utc).isoformat()
+    return dict(
+        {
+            "sha": sha,
+            "message": "feat: add a thing",
+            "date": date,
+            "author": "Mock User",
+            "author_email": "mock-user@users.noreply.github.com",
+            "repository": repository,
+            "url": "",
+            "files": [],
+            "stats": {"additions": 1, "deletions": 0, "total": 1},
+        },
+        **fields,
+    )
+
+
+def test_commit_store_round_trips_records(tmp_path):
+    store = CommitStore(path=str(tmp_path / "commits.sqlite"))
+    record = make_record()
+
+    store.put(record)
+
+    assert store.get("mock-user/repo-000", "a" * 40) == record
+    assert store.get("mock-user/repo-001", "a" * 40) is None
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_commit_store_lists_shas_inside_a_window(tmp_path):
+    store = CommitStore(path=str(tmp_path / "commits.sqlite"))
+    now = datetime.now(timezone.utc)
+    store.put(make_record(sha="a" * 40, date=now.isoformat()))
+    store.put(make_record(sha="b" * 40, date=(now - timedelta(days=10)).isoformat()))
+    store.put(make_record(sha="c" * 40, repository="mock-user/repo-0001"))
+
+    shas = store.shas_since("mock-user/repo-000", now - timedelta(days=1))
+
+    assert shas == {"a" * 40}
+
+
+def test_commit_store_evicts_old_commits(tmp_path):
+    store = CommitStore(path=str(tmp_path / "commits.sqlite"))
+    old = (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+    store.put(make_record(sha="a" * 40, date=old))
+    store.put(make_record(sha="b" * 40))
+
+    assert store.evict_older_than(365) == 1
+    assert store.get("mock-user/repo-000", "a" * 40) is None
+
+
+def test_stored_commits_need_no_detail_request(mock_github, api_client, since, tmp_path):
+    store = CommitStore(path=str(tmp_path / "commits.sqlite"))
+    first = list(
+        make_processor(since, commit_store=store).fetch_commits_direct(api_client, "mock-user")
+    )
+    requests_before = mock_github.request_count
+
+    processor = make_processor(since, commit_store=store)
+    second = list(processor.fetch_commits_direct(api_client, "mock-user"))
+
+    assert second == first
+    assert processor.detail_counts == {"fetched": 0, "store": 15, "journal": 0}
+    # Only the repository and commit listings were requested again
+    assert mock_github.request_count - requests_before == 4
+
+
+def test_repo_enumeration_stops_at_the_first_stale_repository():
+    # Repository r was last pushed r / 5 days ago, 100 repositories per page
+    server = MockGitHubServer(dataset=MockDataset(repos=150, commits_per_repo=1)).start()
+    try:
+        client = GitHubAPIClient(token="test-token", base_url=server.url)
+        since = datetime.now(timezone.utc) - timedelta(days=5)
+
+        repos = list(client.iter_user_repos("mock-user", since=since))
+    finally:
+        server.stop()
+
+    assert [repo["name"] for repo in repos] == [f"repo-{r:03d}" for r in range(25)]
+    assert server.request_count == 1
+
+
+def test_list_repos_starts_at_the_oldest_failed_cursor(api_client, tmp_path):
+    now = datetime.now(timezone.utc)
+    cursors = RepoCursorStore(file_path=str(tmp_path / "cursors.json"))
+    cursors.mark_failed("mock-user/repo-002", now - timedelta(days=5), now)
+    processor = make_processor(now - timedelta(days=1), repo_cursors=cursors)
+
+    repos = processor.list_repos(api_client, "mock-user")
+
+    # repo-001 and repo-002 were pushed 2 and 4 days ago
+    assert [repo["name"] for repo in repos] == ["repo-000", "repo-001", "repo-002"]
+
+
+def test_cursors_round_trip_and_keep_failed_windows(tmp_path):
+    path = str(tmp_path / "cursors.json")
+    synced_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    cursors = RepoCursorStore(file_path=path)
+    cursors.mark_synced("o/a", synced_at, make_record(sha="a" * 40, repository="o/a"))
+    cursors.mark_synced("o/b", synced_at)
+    cursors.mark_failed("o/b", synced_at, synced_at)
+    cursors.mark_failed("o/c", synced_at - timedelta(days=3), synced_at)
+    cursors.write()
+
+    loaded = RepoCursorStore(file_path=path)
+    loaded.read()
+
+    assert loaded.get_since("o/a") == synced_at
+    assert loaded.cursors["o/a"]["sha"] == "a" * 40
+    # A failed repository keeps its previous cursor
+    assert loaded.get_since("o/b") == synced_at
+    assert loaded.get_oldest_failed() == synced_at - timedelta(days=3)
+    assert loaded.get_since("o/d") is None
+
+
+def test_repositories_failing_every_run_are_given_up(tmp_path):
+    synced_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    since = synced_at - timedelta(days=3)
+    cursors = RepoCursorStore(file_path=str(tmp_path / "cursors.json"), max_failures=3)
+
+    assert not cursors.mark_failed("o/a", since, synced_at)
+    assert not cursors.mark_failed("o/a", since, synced_at)
+    assert cursors.get_oldest_failed() == since
+
+    assert cursors.mark_failed("o/a", since, synced_at)
+    assert cursors.get_oldest_failed() is None
+    assert cursors.get_since("o/a") == synced_at
+    assert "failures" not in cursors.cursors["o/a"]
+
+
+def test_failed_repositories_resume_at_their_oldest_failed_commit(since, tmp_path):
+    cursors = RepoCursorStore(file_path=str(tmp_path / "cursors.json"))
+    processor = make_processor(since, repo_cursors=cursors)
+    failed_commit = since + timedelta(days=10)
+    processor.failed_repos = {"o/partial", "o/unlisted"}
+    processor.failed_since = {"o/partial": failed_commit}
+
+    processor.update_cursors(cursors)
+
+    assert cursors.get_since("o/partial") == failed_commit
+    assert cursors.get_since("o/unlisted") == since
+    assert cursors.get_oldest_failed() == since
+
+
+def test_rate_limited_403s_are_not_unavailable():
+    assert GitHubAPIClient._is_unavailable(make_response(404))
+    assert GitHubAPIClient._is_unavailable(make_response(451))
+    assert GitHubAPIClient._is_unavailable(make_response(403, body=b'{"message": "Forbidden"}'))
+    assert not GitHubAPIClient._is_unavailable(make_response(403, {"Retry-After": "60"}))
+    assert not GitHubAPIClient._is_unavailable(make_response(403, {"X-RateLimit-Remaining": "0"}))
+    assert not GitHubAPIClient._is_unavailable(make_response(502))
+
+
+def test_unavailable_commits_are_skipped_without_failing_the_repo(
+    mock_github, api_client, since, monkeypatch
+):
+    dataset = mock_github.dataset
+    missing_sha = dataset.commits["mock-user/repo-000"][2]["sha"]
+    detail = dataset.detail
+    monkeypatch.setattr(
+        dataset, "detail", lambda repo, sha: None if sha == missing_sha else detail(repo, sha)
+    )
+    processor = make_processor(since)
+
+    records = list(processor.fetch_commits_direct(api_client, "mock-user"))
+
+    assert len(records) == 14
+    assert processor.skipped_unavailable == 1
+    assert not processor.failed_repos
+    assert "mock-user/repo-000" in processor.synced_repos
+
+
+def test_timestamp_tracker_writes_the_given_instant(tmp_path):
+    tracker = TimestampTracker(file_path=str(tmp_path / ".last_build"))
+    started_at = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+    tracker.write(started_at)
+
+    assert tracker.read() == started_at
+
+
+def test_cursors_skip_repositories_without_new_pushes(mock_github, api_client, since, tmp_path):
+    cursors = RepoCursorStore(file_path=str(tmp_path / "cursors.json"))
+    processor = make_processor(since, repo_cursors=cursors)
+    assert len(list(processor.fetch_commits_direct(api_client, "mock-user"))) == 15
+    processor.update_cursors(cursors)
+    assert cursors.get_since("mock-user/repo-000") == processor.started_at
+    requests_before = mock_github.request_count
+
+    processor = make_processor(since, repo_cursors=cursors)
+    records = list(processor.fetch_commits_direct(api_client, "mock-user"))
+
+    assert records == []
+    # Only the repository listing was requested
+    assert mock_github.request_count - requests_before == 1
+
+
+def test_search_finds_the_same_commits_in_one_query(mock_github, api_client, since):
+    direct = list(make_processor(since).fetch_commits_direct(api_client, "mock-user"))
+    requests_before = mock_github.request_count
+
+    processor = make_processor(since)
+    found = list(processor.fetch_commits_search(api_client, "mock-user"))
+
+    assert {record["sha"] for record in found} == {record["sha"] for record in direct}
+    assert api_client.search_scheduler.requests_made == 1
+    # One search plus the detail requests, no repository or commit listings
+    assert mock_github.request_count - requests_before == 1 + 15
+
+
+def test_search_keeps_to_listed_repositories(mock_github, api_client, since):
+    listed = [{"full_name": "mock-user/repo-000"}, {"full_name": "mock-user/quiet"}]
+    processor = make_processor(since)
+
+    records = list(processor.fetch_commits_search(api_client, "mock-user", repos=listed))
+
+    assert {record["repository"] for record in records} == {"mock-user/repo-000"}
+    assert set(processor.synced_repos) == {"mock-user/repo-000", "mock-user/quiet"}
+
+
+def test_shipped_config_keeps_commits_discovery(tmp_path):
+    config = load_config(tmp_path)
+
+    assert config.get_discovery_mode() == "commits"
+    assert "search" in config.get_auto_strategies()
+
+
+def test_planner_estimates_requests_per_strategy():
+    planner = FetchPlanner(datetime.now(timezone.utc) - timedelta(days=7), commits_per_repo=10)
+
+    estimates = planner.estimate(active_repos=3)
+
+    assert estimates["commits"]["requests"] == 3 + 30
+    assert estimates["events"]["requests"] == 1 + 30
+    assert (estimates["search"]["requests"], estimates["search"]["search_requests"]) == (30, 1)
+    assert estimates["git"]["requests"] == 0
+
+
+def test_planner_counts_stored_details_as_free():
+    planner = FetchPlanner(datetime.now(timezone.utc) - timedelta(days=7), commits_per_repo=10)
+
+    assert planner.estimate(active_repos=3, covered_details=25)["commits"]["requests"] == 3 + 5
+    # More stored commits than assumed raise the commit estimate instead
+    covered = planner.estimate(active_repos=3, covered_details=40)
+    assert covered["search"]["requests"] == 0
+    assert covered["events"]["requests"] == 1
+
+
+def test_planner_picks_the_cheapest_strategy_that_fits():
+    planner = FetchPlanner(datetime.now(timezone.utc) - timedelta(days=120))
+    estimates = planner.estimate(active_repos=3)
+
+    assert not estimates["events"]["available"]
+    assert planner.choose(estimates, remaining=1000, allowed=["commits", "search"]) == "search"
+    assert planner.choose(estimates, remaining=1000, allowed=["commits", "events"]) == "commits"
+    # Nothing fits: the cheapest allowed strategy waits for the reset
+    assert planner.choose(estimates, remaining=1, allowed=["commits", "search"]) == "search"
+
+
+def test_processor_counts_details_covered_by_the_store(tmp_path):
+    store = CommitStore(path=str(tmp_path / "commits.sqlite"))
+    store.put(make_record(sha="a" * 40, repository="o/a"))
+    store.put(make_record(sha="b" * 40, repository="o/a"))
+    store.put(make_record(sha="c" * 40, repository="o/skipped"))
+    processor = CommitProcessor(
+        since=datetime.now(timezone.utc) - timedelta(days=1),
+        repo_filters=[],
+        exclude_repos=["skipped"],
+        commit_store=store,
+    )
+    now = datetime.now(timezone.utc).isoformat()
+
+    active = processor.active_repo_names(
+        [{"full_name": "o/a", "pushed_at": now}, {"full_name": "o/skipped", "pushed_at": now}]
+    )
+
+    assert active == ["o/a"]
+    assert processor.count_covered_details(active) == 2
+
+
+def test_single_author_filter_is_sent_to_the_api(since):
+    assert make_processor(since, author_usernames=["Me"]).api_author_filter() == "me"
+    assert make_processor(since, author_emails=["me@example.com"]).api_author_filter() == (
+        "me@example.com"
+    )
+    assert make_processor(since, author_usernames=["me", "other"]).api_author_filter() is None
+
+
+def test_author_filter_skips_foreign_commits_before_details(mock_github, api_client, since):
+    processor = make_processor(since, author_usernames=["someone", "someone-else"])
+
+    records = list(processor.fetch_commits_direct(api_client, "mock-user"))
+
+    assert records == []
+    assert processor.skipped_foreign == 15
+    # The repository listing and one commit list per repository, no details
+    assert mock_github.request_count == 1 + 3
+
+
+def test_author_filter_matches_logins_and_emails(since):
+    processor = make_processor(since, author_usernames=["me"], author_emails=["me@work.com"])
+    by_login = {"author": {"login": "Me"}, "commit": {"author": {"email": "x@y.z"}}}
+    by_email = {"author": None, "commit": {"author": {"email": "ME@work.com"}}}
+    foreign = {"author": {"login": "other"}, "commit": {"author": {"email": "x@y.z"}}}
+
+    assert processor._matches_author(by_login)
+    assert processor._matches_author(by_email)
+    assert processor._matches_author(make_record(author_email="me@work.com"))
+    assert not processor._matches_author(foreign)
+    assert processor.skipped_foreign == 1
+
+
+def test_retry_delay_honours_retry_after_and_caps_jitter():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+
+    assert policy.delay(0, retry_after="7") == 7.0
+    assert all(0 <= policy.delay(1) <= 2.0 for _ in range(50))
+    assert all(0 <= policy.delay(10, retry_after="soon") <= 5.0 for _ in range(50))
+
+
+def test_circuit_opens_after_repeated_failures_and_probes_after_cooldown():
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    breaker.record_failure("o/a")
+    assert breaker.allow("o/a")
+    breaker.record_failure("o/a")
+
+    assert not breaker.allow("o/a")
+    assert breaker.allow("o/b")
+
+    breaker.opened_at["o/a"] -= 60
+    assert breaker.allow("o/a")
+    # A failed probe opens the circuit again at once
+    breaker.record_failure("o/a")
+    assert not breaker.allow("o/a")
+
+
+def test_circuit_closes_after_a_successful_probe():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record_failure("o/a")
+
+    assert breaker.allow("o/a")
+    breaker.record_success("o/a")
+    assert breaker.allow("o/a")
+    assert "o/a" not in breaker.failures
+
+
+def test_client_retries_server_errors_then_opens_the_circuit(since):
+    server = MockGitHubServer(dataset=MockDataset(repos=1), error_rate=1.0).start()
+    try:
+        client = GitHubAPIClient(
+            token="test-token",
+            base_url=server.url,
+            retry_policy=RetryPolicy(max_retries=2, backoff_base=0.0),
+            circuit_breaker=CircuitBreaker(threshold=1),
+        )
+        with pytest.raises(GitHubAPIError, match="500|502|503"):
+            client.get_repo_commits("mock-user/repo-000", since)
+        assert server.request_count == 3
+
+        with pytest.raises(GitHubAPIError, match="too many consecutive failures"):
+            client.get_repo_commits("mock-user/repo-000", since)
+        assert server.request_count == 3
+    finally:
+        server.stop()
+
+
+def test_client_recovers_from_transient_errors(mock_github, since):
+    client = GitHubAPIClient(
+        token="test-token",
+        base_url=mock_github.url,
+        retry_policy=RetryPolicy(max_retries=5, backoff_base=0.0),
+    )
+    mock_github.error_rate = 0.5
+
+    commits = client.get_repo_commits("mock-user/repo-000", since)
+
+    assert len(commits) == 5
+
+
+def test_journal_restores_an_interrupted_run(tmp_path):
+    path = tmp_path / "commits.journal"
+    since = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    journal = FetchJournal(file_path=str(path))
+    journal.start(since, since + timedelta(days=7))
+    journal.record_commit(make_record(sha="a" * 40, repository="o/a"))
+    journal.record_commit(make_record(sha="a" * 40, repository="o/a"))
+    journal.record_repo("o/a")
+    journal.record_commit(make_record(sha="b" * 40, repository="o/b"))
+    journal.close()
+    # The run was killed while writing a line
+    with open(path, "a") as f:
+        f.write('{"type": "commit", "rec')
+
+    resumed = FetchJournal(file_path=str(path))
+
+    assert resumed.load()
+    assert (resumed.since, resumed.started_at) == (since, since + timedelta(days=7))
+    assert resumed.completed_repos == {"o/a"}
+    assert [record["sha"] for record in resumed.records_for("o/a")] == ["a" * 40]
+    assert resumed.get_record("o/b", "b" * 40) is not None
+
+
+def test_journal_without_a_run_line_is_not_resumed(tmp_path):
+    path = tmp_path / "commits.journal"
+    path.write_text("not json\n")
+
+    assert not FetchJournal(file_path=str(path)).load()
+    assert not FetchJournal(file_path=str(tmp_path / "missing.journal")).load()
+
+
+def test_resumed_fetch_skips_journaled_work(mock_github, api_client, since, tmp_path):
+    path = str(tmp_path / "commits.journal")
+    journal = FetchJournal(file_path=path)
+    processor = make_processor(since, journal=journal)
+    journal.start(since, processor.started_at)
+    interrupted = processor.fetch_commits_direct(api_client, "mock-user")
+    first = [next(interrupted) for _ in range(7)]
+    interrupted.close()
+    journal.close()
+
+    journal = FetchJournal(file_path=path)
+    assert journal.load()
+    processor = make_processor(since, journal=journal)
+    journal.start(since, processor.started_at)
+    records = list(processor.fetch_commits_direct(api_client, "mock-user"))
+
+    assert processor.started_at == journal.started_at
+    assert [record["sha"] for record in records[:7]] == [record["sha"] for record in first]
+    assert len(records) == 15
+    assert processor.detail_counts["journal"] == 7
+    assert processor.detail_counts["fetched"] == 8
+
+
+def test_fetch_pipeline_fetches_only_what_is_consumed(mock_github, api_client, since):
+    processor = make_processor(since)
+    repos = processor.list_repos(api_client, "mock-user")
+    requests_before = mock_github.request_count
+
+    records = processor.fetch_commits_direct(api_client, "mock-user", repos)
+    assert mock_github.request_count == requests_before
+
+    next(records)
+    assert mock_github.request_count - requests_before < 1 + 3
+    records.close()
+
+
+def test_bounded_map_keeps_order_and_limits_work_in_flight(since):
+    processor = make_processor(since, concurrency=2)
+    pulled = []
+
+    def items():
+        for item in range(20):
+            pulled.append(item)
+            yield item
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = processor._bounded_map(executor, lambda item: item * 2, items())
+        assert next(results) == (0, 0)
+        assert len(pulled) == 4
+        assert list(results) == [(item, item * 2) for item in range(1, 20)]
+
+
+def test_events_pipeline_yields_records_for_every_push(mock_github, api_client, since):
+    processor = make_processor(since, concurrency=4)
+    events = api_client.get_user_events("mock-user")
+
+    records = list(processor.extract_commits(events, api_client))
+
+    assert len(records) == 15
+    assert len({record["sha"] for record in records}) == 15
+
+
+DETAIL_PAYLOAD = json.dumps(
+    {
+        "sha": "a" * 40,
+        "commit": {"message": 'fix: handle "patch" and \\ in messages'},
+        "files": [
+            {"filename": "patch", "status": "added", "patch": '@@ -0,0 +1 @@\n+say "hi" \\o/\n'},
+            {"filename": "b.bin", "status": "modified", "patch": None},
+            {"filename": "c.py", "status": "removed", "patch": '\\\\"' * 50},
+        ],
+        "stats": {"additions": 1, "deletions": 0, "total": 1},
+    },
+    ensure_ascii=False,
+).encode("utf-8")
+
+
+def strip_patches(chunks):
+    stripper = PatchStripper()
+    for chunk in chunks:
+        stripper.feed(chunk)
+    return stripper
+
+
+def expected_detail():
+    detail = json.loads(DETAIL_PAYLOAD)
+    for file_info in detail["files"]:
+        file_info["patch"] = None
+    return detail
+
+
+def test_patch_stripper_drops_patch_text_at_every_chunk_boundary():
+    for split in range(len(DETAIL_PAYLOAD) + 1):
+        stripper = strip_patches([DETAIL_PAYLOAD[:split], DETAIL_PAYLOAD[split:]])
+
+        assert json.loads(stripper.result()) == expected_detail(), split
+        assert stripper.bytes_received == len(DETAIL_PAYLOAD)
+
+
+def test_patch_stripper_handles_single_byte_chunks():
+    stripper = strip_patches(DETAIL_PAYLOAD[i : i + 1] for i in range(len(DETAIL_PAYLOAD)))
+
+    assert json.loads(stripper.result()) == expected_detail()
+    assert b"say" not in stripper.result()
+
+
+def test_detail_requests_report_the_patch_bytes_dropped(mock_github, api_client):
+    repo_name, commits = next(iter(mock_github.dataset.commits.items()))
+
+    detail = api_client.get_commit_details(repo_name, commits[0]["sha"])
+
+    assert detail["sha"] == commits[0]["sha"]
+    assert [set(file_info) for file_info in detail["files"]] == [
+        {"filename", "status", "additions", "deletions", "changes"}
+    ] * 2
+    stats = api_client.detail_bytes
+    assert 0 < stats["kept"] < stats["received"]
+    assert stats["largest_kept"] < stats["largest_received"]
+
+
+def write_detail_fixtures(server, path, pages):
+    """Record a commit detail split over pages, linked like GitHub does."""
+    for page, files in enumerate(pages, start=1):
+        headers = {}
+        if page < len(pages):
+            next_url = f"{server.url}{path}?page={page + 1}"
+            last_url = f"{server.url}{path}?page={len(pages)}"
+            headers["Link"] = f'<{next_url}>; rel="next", <{last_url}>; rel="last"'
+        key = server.fixture_key(path, {"page": [str(page)]} if page > 1 else {})
+        body = {
+            "sha": "b" * 40,
+            "commit": {"message": "chore: vendor dependencies"},
+            "files": files,
+            "stats": {"additions": 1, "deletions": 0, "total": 1},
+        }
+        server._fixture_path(key).write_text(
+            json.dumps({"request": key, "status": 200, "headers": headers, "body": body})
+        )
+
+
+def make_files(start, count):
+    return [
+        {"filename": f"vendor/{i}.js", "status": "added", "additions": 2, "deletions": 1}
+        for i in range(start, start + count)
+    ]
+
+
+def test_last_page_is_read_from_link_relations():
+    assert GitHubAPIClient._last_page({}) == 1
+    assert GitHubAPIClient._last_page({"next": {"url": "https://x/c?page=2"}}) == 2
+    links = {"next": {"url": "https://x/c?page=2"}, "last": {"url": "https://x/c?page=7"}}
+    assert GitHubAPIClient._last_page(links) == 7
+
+
+def test_detail_fetch_pages_through_truncated_file_lists(tmp_path):
+    fixtures_dir = tmp_path / "fixtures"
+    fixtures_dir.mkdir()
+    server = MockGitHubServer(fixtures_dir=str(fixtures_dir)).start()
+    try:
+        path = "/repos/mock-user/big/commits/" + "b" * 40
+        write_detail_fixtures(server, path, [make_files(0, 3), make_files(3, 3), make_files(6, 2)])
+        client = GitHubAPIClient(token="test-token", base_url=server.url, detail_page_concurrency=2)
+
+        detail = client.get_commit_details("mock-user/big", "b" * 40)
+
+        assert [f["filename"] for f in detail["files"]] == [f"vendor/{i}.js" for i in range(8)]
+        assert detail["stats"] == {"additions": 16, "deletions": 8, "total": 24}
+        assert server.request_count == 3
+    finally:
+        server.stop()
+
+
+def test_detail_fetch_fails_when_a_file_page_is_missing(tmp_path):
+    fixtures_dir = tmp_path / "fixtures"
+    fixtures_dir.mkdir()
+    server = MockGitHubServer(fixtures_dir=str(fixtures_dir)).start()
+    try:
+        path = "/repos/mock-user/big/commits/" + "b" * 40
+        write_detail_fixtures(server, path, [make_files(0, 3), make_files(3, 3)])
+        server._fixture_path(server.fixture_key(path, {"page": ["2"]})).unlink()
+        client = GitHubAPIClient(
+            token="test-token",
+            base_url=server.url,
+            retry_policy=RetryPolicy(max_retries=0, backoff_base=0.0),
+        )
+
+        assert client.get_commit_details("mock-user/big", "b" * 40) is None
+    finally:
+        server.stop()
+
+
+def test_example_commits_are_streamed_without_excluded_repositories(since):
+    processor = CommitProcessor(
+        since=since, repo_filters=[], exclude_repos=["mobile-app", "example-user/devops-tools"]
+    )
+
+    commits = processor.load_example_commits(str(CONFIG_PATH.parent / "data/example_commits.json"))
+
+    assert next(commits)["repository"] == "example-user/web-dashboard"
+    assert {commit["repository"] for commit in commits} == {
+        "example-user/web-dashboard",
+        "example-user/api-backend",
+    }
+
+
+def test_ranking_fetches_details_for_the_kept_commits_only(mock_github, api_client, since):
+    processor = make_processor(since, max_commits=4)
+    repos = processor.list_repos(api_client, "mock-user")
+    requests_before = mock_github.request_count
+
+    records = list(processor.fetch_commits_direct(api_client, "mock-user", repos))
+
+    assert len(records) == 4
+    assert processor.skipped_ranked == 11
+    assert mock_github.request_count - requests_before == 3 + 4
+
+
+def test_repo_weights_favour_a_repository(mock_github, api_client, since):
+    processor = make_processor(since, max_commits=5, repo_weights={"repo-002": 10.0})
+
+    records = list(processor.fetch_commits_direct(api_client, "mock-user"))
+
+    assert {record["repository"] for record in records} == {"mock-user/repo-002"}
+
+
+def test_shipped_config_fetches_every_commit(tmp_path):
+    config = load_config(tmp_path)
+
+    assert config.get_max_commits() == 0
+    assert config.get_repo_weights() == {}
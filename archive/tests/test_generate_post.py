@@ -0,0 +1,166 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from roboblog.generate_post import CommitDataLoader, LLMConfig, window_end
+from roboblog.synthetic_data import SyntheticCommitGenerator
+from roboblog.token_budget import estimate_tokens
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.yml"
+
+
+def test_window_end_reads_the_fetch_time():
+    data = {"fetched_at": "2024-05-01T12:00:00+00:00"}
+
+    assert window_end(data) == datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    assert window_end({}) is None
+
+
+def test_loader_reads_streamed_fetch_output(tmp_path):
+    path = tmp_path / "commits.ndjson.gz"
+    SyntheticCommitGenerator(repos=2, commits_per_repo=3).write(str(path), compress=True)
+
+    data = CommitDataLoader(data_path=str(path)).load()
+
+    assert data["total_commits"] == 6
+    assert [len(commits) for commits in data["repositories"].values()] == [3, 3]
+
+
+def make_data(repos=2, commits_per_repo=10):
+    generator = SyntheticCommitGenerator(repos=repos, commits_per_repo=commits_per_repo)
+    repositories = {}
+    for record in generator.iter_records():
+        repositories.setdefault(record["repository"], []).append(record)
+    return {
+        "fetched_at": generator.now.isoformat(),
+        "since": "2024-01-01T00:00:00+00:00",
+        "total_commits": generator.total_commits,
+        "repositories": repositories,
+    }
+
+
+def test_aggregate_prompts_keep_detail_for_the_top_commits():
+    data = make_data()
+    loader = CommitDataLoader()
+
+    prompt = loader.format_for_prompt(data, mode="aggregate", detail_commits=5)
+
+    assert "## Activity by repository" in prompt
+    assert "## Most significant commits (5 of 20)" in prompt
+    assert prompt.count("### Commit:") == 5
+    aggregates = loader.aggregate(data, 5)
+    assert (
+        loader.format_for_prompt(data, mode="aggregate", detail_commits=5, aggregates=aggregates)
+        == prompt
+    )
+
+
+def test_aggregate_prompts_list_small_windows_in_full():
+    data = make_data()
+
+    prompt = CommitDataLoader().format_for_prompt(data, mode="aggregate", detail_commits=20)
+
+    assert "## Activity by repository" not in prompt
+    assert prompt.count("### Commit:") == 20
+
+
+def test_prompts_within_budget_are_left_alone():
+    data = make_data()
+    loader = CommitDataLoader()
+
+    prompt, tokens, steps = loader.format_within_budget(data, token_budget=100_000)
+
+    assert prompt == loader.format_for_prompt(data)
+    assert tokens == estimate_tokens(prompt)
+    assert steps == []
+
+
+def test_prompts_are_compacted_least_lossy_first():
+    data = make_data(repos=4)
+    loader = CommitDataLoader()
+    subjects = estimate_tokens(loader.format_for_prompt(data, body_chars=0))
+
+    prompt, tokens, steps = loader.format_within_budget(data, token_budget=subjects)
+
+    assert prompt == loader.format_for_prompt(data, body_chars=0)
+    assert tokens == subjects
+    assert steps == ["truncated long message bodies", "kept message subjects only"]
+
+
+def test_tight_budgets_summarize_the_fewest_low_churn_repositories():
+    data = make_data(repos=4)
+    loader = CommitDataLoader()
+
+    prompt, tokens, steps = loader.format_within_budget(data, token_budget=2000)
+
+    assert tokens <= 2000
+    assert steps[2:] == [
+        "collapsed file lists to directories",
+        "summarized 3 low-churn repositories",
+    ]
+    assert prompt.count("(summarized)") == 3
+
+
+def test_budgets_too_small_for_any_summary_truncate_the_text():
+    prompt, tokens, steps = CommitDataLoader().format_within_budget(make_data(), token_budget=20)
+
+    assert tokens <= 20
+    assert steps[-1] == "truncated the remaining text"
+    assert prompt.endswith("[... truncated to fit the input token budget]")
+
+
+def test_shipped_config_details_twenty_commits(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+    config = LLMConfig(config_path=str(CONFIG_PATH), env_path=str(tmp_path / ".env"))
+    config.load()
+
+    assert config.get_detail_commits() == 20
+
+
+def test_similar_commits_are_listed_once_with_every_subject():
+    long_subject = "fix typo in " + "the contributing guide " * 5
+    commits = [
+        {"sha": sha * 40, "message": message, "date": "2024-05-01T10:00:00Z", "files": []}
+        for sha, message in (("a", "fix typo"), ("b", "fix typo in docs"), ("c", long_subject))
+    ]
+    data = {"total_commits": 3, "repositories": {"o/docs": commits}}
+
+    prompt = CommitDataLoader().format_for_prompt(data, similarity_threshold=0.2)
+
+    assert "### Similar commits (3): fix typo" in prompt
+    assert "  - fix typo in docs" in prompt
+    assert "  - " + long_subject[:77] + "..." in prompt
+    assert "### Commit:" not in prompt
+
+
+def test_aggregate_prompts_list_significant_commits_with_their_runs():
+    data = make_data()
+    repo_name = next(iter(data["repositories"]))
+    run = [
+        {
+            "sha": sha * 40,
+            "message": f"feat: rewrite the parser\n\nPart {i} of the rewrite.",
+            "date": "2024-05-01T10:00:00Z",
+            "author": "Dev",
+            "repository": repo_name,
+            "files": [{"filename": "src/parser.py", "additions": 500, "deletions": 400}],
+            "stats": {"additions": 500, "deletions": 400, "total": 900},
+        }
+        for i, sha in enumerate("abc")
+    ]
+    data["repositories"][repo_name][3:3] = run
+    data["total_commits"] += 3
+    loader = CommitDataLoader()
+
+    prompt = loader.format_for_prompt(
+        data, mode="aggregate", detail_commits=5, similarity_threshold=0.6
+    )
+
+    assert "## Activity by repository" in prompt
+    assert prompt.count("### Similar commits (3): feat: rewrite the parser") == 1
+    assert "Commits: aaaaaaa, bbbbbbb, ccccccc\n" in prompt
+    assert prompt.count("### Commit:") == 2
+    assert f"Repository: {repo_name}" in prompt
+    summary, _, _ = loader.format_within_budget(
+        data, 0, mode="aggregate", detail_commits=5, similarity_threshold=0.6
+    )
+    assert summary == prompt
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+import requests
+
+from roboblog.benchmark import FetchBenchmark
+from roboblog.mock_github import MockDataset, MockGitHubServer
+
+
+@pytest.fixture
+def make_server():
+    servers = []
+
+    def make(**kwargs):
+        server = MockGitHubServer(**kwargs).start()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.stop()
+
+
+def test_lists_are_paginated_with_link_headers(mock_github):
+    url = f"{mock_github.url}/repos/mock-user/repo-000/commits"
+
+    first = requests.get(url, params={"per_page": 2})
+    last = requests.get(first.links["last"]["url"])
+
+    assert len(first.json()) == 2
+    assert first.links["next"]["url"].endswith("page=2")
+    assert first.links["last"]["url"].endswith("page=3")
+    assert len(last.json()) == 1
+    assert "next" not in last.links
+
+
+def test_matching_etags_get_free_not_modified_responses(mock_github):
+    url = f"{mock_github.url}/repos/mock-user/repo-000/commits"
+    first = requests.get(url)
+
+    second = requests.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.headers["X-RateLimit-Remaining"] == first.headers["X-RateLimit-Remaining"]
+    assert mock_github.not_modified_count == 1
+    assert requests.get(url).headers["X-RateLimit-Remaining"] == "4998"
+
+
+def test_exhausted_budget_is_refused_until_reset(make_server):
+    server = make_server(dataset=MockDataset(repos=1), rate_limit=2)
+    url = f"{server.url}/repos/mock-user/repo-000/commits"
+
+    statuses = [requests.get(url).status_code for _ in range(3)]
+    rate_limit = requests.get(f"{server.url}/rate_limit")
+
+    assert statuses == [200, 200, 403]
+    assert rate_limit.status_code == 200
+    assert rate_limit.headers["X-RateLimit-Remaining"] == "0"
+    server.reset_counters()
+    assert requests.get(url).status_code == 200
+
+
+def test_injected_errors_use_the_configured_statuses(make_server):
+    server = make_server(dataset=MockDataset(repos=1), error_rate=1.0, error_statuses=[403])
+
+    response = requests.get(f"{server.url}/repos/mock-user/repo-000/commits")
+
+    assert response.status_code == 403
+    assert response.headers["Retry-After"] == "1"
+    assert server.error_count == 1
+
+
+def test_recorded_fixtures_are_replayed(make_server, tmp_path):
+    server = make_server(fixtures_dir=str(tmp_path))
+    key = server.fixture_key("/users/someone/events", {"page": ["1"], "access_token": ["x"]})
+    body = [{"type": "PushEvent", "repo": {"name": "someone/repo"}}]
+    (tmp_path / server._fixture_path(key).name).write_text(
+        json.dumps({"request": key, "status": 200, "headers": {}, "body": body})
+    )
+
+    replayed = requests.get(f"{server.url}/users/someone/events?page=1&access_token=y")
+    missing = requests.get(f"{server.url}/users/someone/events?page=2")
+
+    assert replayed.json() == body
+    assert missing.status_code == 404
+
+
+def test_benchmark_runs_every_strategy_against_the_mock(mock_github):
+    benchmark = FetchBenchmark(mock_github, lookback_days=60, concurrency=4)
+
+    results = benchmark.run_all(["events", "search", "commits"])
+
+    assert [result["commits"] for result in results] == [15, 15, 15]
+    requests_by_strategy = {result["strategy"]: result["requests"] for result in results}
+    assert requests_by_strategy["search"] < requests_by_strategy["commits"]
+    assert all(result["injected_errors"] == 0 for result in results)
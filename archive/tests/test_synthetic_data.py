@@ -0,0 +1,50 @@
+from roboblog.commit_stream import CommitStreamReader
+from roboblog.scaling_benchmark import ScalingBenchmark
+from roboblog.synthetic_data import SyntheticCommitGenerator
+
+
+def test_same_seed_yields_the_same_dataset():
+    first = SyntheticCommitGenerator(repos=3, commits_per_repo=10, seed=7)
+    second = SyntheticCommitGenerator(repos=3, commits_per_repo=10, seed=7)
+    second.now = first.now
+    other = SyntheticCommitGenerator(repos=3, commits_per_repo=10, seed=8)
+    other.now = first.now
+
+    assert list(first.iter_records()) == list(second.iter_records())
+    assert list(first.iter_records()) != list(other.iter_records())
+
+
+def test_records_are_shaped_like_fetch_output():
+    generator = SyntheticCommitGenerator(repos=2, commits_per_repo=25, message_length=200)
+
+    records = list(generator.iter_records())
+
+    assert len(records) == generator.total_commits == 50
+    assert {record["repository"] for record in records} == set(generator.repo_names())
+    for record in records:
+        assert record["stats"]["additions"] == sum(f["additions"] for f in record["files"])
+        assert record["stats"]["deletions"] == sum(f["deletions"] for f in record["files"])
+        assert len(record["message"]) <= 200 + 20
+    dates = [record["date"] for record in records[:25]]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_written_datasets_read_back_as_fetch_output(tmp_path):
+    generator = SyntheticCommitGenerator(repos=3, commits_per_repo=4)
+    path = tmp_path / "commits.ndjson.gz"
+
+    manifest = generator.write(str(path), compress=True)
+    data = CommitStreamReader(str(path)).load()
+
+    assert manifest["total_commits"] == data["total_commits"] == 12
+    assert data["repositories"]["synthetic-user/project-0000"] == list(generator.iter_records())[:4]
+
+
+def test_scaling_benchmark_measures_every_stage(tmp_path):
+    results = ScalingBenchmark(str(tmp_path), repos=2).run(20)
+
+    assert results["commits"] == 20
+    assert list(results["stages"]) == ["write", "load", "example_load", "format", "post"]
+    assert results["prompt_chars"] > 0
+    assert not list(tmp_path.glob("commits-*"))
+    assert len(list((tmp_path / "_posts").iterdir())) == 1
@@ -0,0 +1,23 @@
+from roboblog.token_budget import estimate_cost, estimate_tokens
+
+
+def test_letter_runs_count_a_token_per_four_characters():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("fix") == 1
+    assert estimate_tokens("refactor") == 2
+    assert estimate_tokens("refactoring the parser") == 3 + 1 + 2
+
+
+def test_digits_and_symbols_count_separately():
+    assert estimate_tokens("1234567") == 3
+    assert estimate_tokens("+12 -3") == 4
+    assert estimate_tokens("src/app_main.py") == 7
+
+
+def test_estimates_grow_with_the_text():
+    text = "feat: add streaming output to the commit fetcher\n"
+    assert estimate_tokens(text * 10) == 10 * estimate_tokens(text)
+
+
+def test_cost_is_priced_per_million_tokens():
+    assert estimate_cost(250_000, 2.0) == 0.5